@@ -0,0 +1,350 @@
+# core/builder.py
+import csv
+
+import numpy as np
+from obspy import Inventory, UTCDateTime
+from obspy.core.inventory import Station, Network, Channel, Site
+
+from SRM_core.utils import combine_resp
+
+
+def component_orientation(component):
+    if component.endswith("E"):
+        return 90, 0
+    elif component.endswith("N"):
+        return 0, 0
+    elif component.endswith("Z"):
+        return 0, -90
+    return 0, 0
+
+
+def build_channel(
+    code,
+    location_code,
+    latitude,
+    longitude,
+    elevation,
+    depth,
+    sample_rate,
+    start_date,
+    response,
+):
+    azimuth, dip = component_orientation(code)
+    return Channel(
+        code=code,
+        location_code=location_code,
+        latitude=latitude,
+        longitude=longitude,
+        elevation=elevation,
+        depth=depth,
+        azimuth=azimuth,
+        dip=dip,
+        sample_rate=sample_rate,
+        start_date=UTCDateTime(start_date),
+        response=response,
+    )
+
+
+def build_station_inventory(
+    net_code,
+    sta_code,
+    latitude,
+    longitude,
+    elevation,
+    channels,
+    creation_date,
+    source,
+):
+    station = Station(
+        code=sta_code.upper(),
+        latitude=latitude,
+        longitude=longitude,
+        elevation=elevation,
+        creation_date=UTCDateTime(creation_date),
+        channels=channels,
+    )
+    network = Network(code=net_code.upper(), stations=[station])
+    return Inventory(networks=[network], source=source)
+
+
+def group_archive_streams(rows):
+    # Turns per-stream archive rows into {(net, sta): {(loc, base): [row]}}
+    # so each station can be built from channel groups like the wizard's.
+    stations = {}
+    for row in rows:
+        groups = stations.setdefault((row["network"], row["station"]), {})
+        key = (row["location"], row["channel"][:2])
+        groups.setdefault(key, []).append(row)
+    return stations
+
+
+STATION_TABLE_COLUMNS = (
+    "network",
+    "station",
+    "latitude",
+    "longitude",
+    "elevation",
+    "depth",
+    "location",
+    "channels",
+    "sample_rate",
+    "start_date",
+    "sensor_keys",
+    "datalogger_keys",
+)
+OPTIONAL_TABLE_COLUMNS = ("end_date", "site_name")
+NRL_KEY_SEPARATOR = "|"
+
+
+def _parse_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _parse_time(value):
+    if not value:
+        return np.nan
+    try:
+        return UTCDateTime(value).timestamp
+    except Exception:
+        return np.nan
+
+
+_vector_float = np.frompyfunc(_parse_float, 1, 1)
+_vector_time = np.frompyfunc(_parse_time, 1, 1)
+
+
+def read_station_table(path):
+    # Reads a CSV of one row per channel group into a dict of column arrays
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        header = [h.strip().lower() for h in reader.fieldnames or []]
+        missing = [c for c in STATION_TABLE_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(
+                "Missing column(s) in station table: " + ", ".join(missing)
+            )
+        reader.fieldnames = header
+        rows = list(reader)
+
+    table = {}
+    for column in STATION_TABLE_COLUMNS + OPTIONAL_TABLE_COLUMNS:
+        table[column] = np.array(
+            [(row.get(column) or "").strip() for row in rows], dtype=object
+        )
+    for column in ("network", "station", "location", "channels"):
+        table[column] = np.array(
+            [v.upper() for v in table[column]], dtype=object
+        )
+    for column in ("latitude", "longitude", "elevation", "depth",
+                   "sample_rate"):
+        table[column + "_value"] = _vector_float(table[column]).astype(float)
+    for column in ("start_date", "end_date"):
+        table[column + "_value"] = _vector_time(table[column]).astype(float)
+    # Row numbers as shown in a spreadsheet (header is row 1)
+    table["row"] = np.arange(2, len(rows) + 2)
+    return table
+
+
+def _code_lengths(values):
+    return np.array([len(v) for v in values], dtype=int)
+
+
+def validate_station_table(table):
+    # All checks are evaluated for every row at once; the result lists
+    # (row, column, message) for each failing cell.
+    errors = []
+
+    def flag(mask, column, message):
+        for row in table["row"][mask]:
+            errors.append((int(row), column, message))
+
+    net_len = _code_lengths(table["network"])
+    sta_len = _code_lengths(table["station"])
+    flag((net_len == 0) | (net_len > 2), "network",
+         "Network code must have 1-2 characters.")
+    flag((sta_len == 0) | (sta_len > 5), "station",
+         "Station code must have 1-5 characters.")
+    flag(_code_lengths(table["location"]) > 2, "location",
+         "Location code must have at most 2 characters.")
+
+    channel_lists = [
+        [c.strip() for c in value.split(",") if c.strip()]
+        for value in table["channels"]
+    ]
+    bad_channels = np.array(
+        [not chans or any(len(c) != 3 for c in chans)
+         for chans in channel_lists],
+        dtype=bool,
+    )
+    flag(bad_channels, "channels",
+         "Channels must be a comma-separated list of 3-character codes.")
+
+    lat, lon = table["latitude_value"], table["longitude_value"]
+    with np.errstate(invalid="ignore"):
+        flag(~(np.abs(lat) <= 90), "latitude",
+             "Latitude must be a number between -90 and 90.")
+        flag(~(np.abs(lon) <= 180), "longitude",
+             "Longitude must be a number between -180 and 180.")
+        flag(~np.isfinite(table["elevation_value"]), "elevation",
+             "Elevation must be a valid number.")
+        flag(~(table["depth_value"] >= 0), "depth",
+             "Depth must be a non-negative number.")
+        flag(~(table["sample_rate_value"] > 0), "sample_rate",
+             "Sample rate must be a positive number.")
+
+    start, end = table["start_date_value"], table["end_date_value"]
+    flag(np.isnan(start), "start_date", "Start date is missing or invalid.")
+    has_end = table["end_date"] != ""
+    flag(has_end & np.isnan(end), "end_date", "End date is invalid.")
+    with np.errstate(invalid="ignore"):
+        flag(has_end & (end <= start), "end_date",
+             "End date must be after the start date.")
+
+    for column in ("sensor_keys", "datalogger_keys"):
+        flag(table[column] == "", column, "NRL key path is required.")
+
+    # Rows of one station must agree on its coordinates
+    station_ids = np.array(
+        [f"{n}.{s}" for n, s in zip(table["network"], table["station"])],
+        dtype=object,
+    )
+    if len(station_ids):
+        _, first, inverse = np.unique(
+            station_ids.astype(str), return_index=True, return_inverse=True
+        )
+        for column in ("latitude", "longitude", "elevation"):
+            values = table[column + "_value"]
+            reference = values[first][inverse]
+            with np.errstate(invalid="ignore"):
+                differs = ~np.isclose(values, reference, equal_nan=True)
+            flag(differs, column,
+                 "Differs from the first row of the same station.")
+
+        # The same channel epoch must not be defined twice. Start dates are
+        # compared parsed, so differently written equal dates match; rows
+        # without a valid one are flagged above already.
+        keys = []
+        rows = []
+        for i, chans in enumerate(channel_lists):
+            if np.isnan(start[i]):
+                continue
+            for chan in chans:
+                keys.append(
+                    f"{station_ids[i]}.{table['location'][i]}.{chan}"
+                    f"@{start[i]!r}"
+                )
+                rows.append(i)
+        if keys:
+            _, inverse, counts = np.unique(
+                np.array(keys), return_inverse=True, return_counts=True
+            )
+            duplicated = np.zeros(len(station_ids), dtype=bool)
+            duplicated[np.array(rows)[counts[inverse] > 1]] = True
+            flag(duplicated, "channels",
+                 "Channel epoch is defined more than once.")
+
+    errors.sort()
+    return errors
+
+
+def _instrument_key(sensor_keys, datalogger_keys):
+    return (
+        tuple(k.strip() for k in sensor_keys.split(NRL_KEY_SEPARATOR)),
+        tuple(k.strip() for k in datalogger_keys.split(NRL_KEY_SEPARATOR)),
+    )
+
+
+def table_instrument_keys(table):
+    return sorted(
+        {
+            _instrument_key(sensor, logger)
+            for sensor, logger in zip(
+                table["sensor_keys"], table["datalogger_keys"]
+            )
+        }
+    )
+
+
+def build_inventory_from_table(table, nrl, source="SRM batch builder"):
+    # Every distinct sensor/datalogger combination is resolved through the
+    # NRL and combine_resp once and the Response object is shared by all
+    # channels that use it.
+    responses = {}
+    for sensor_keys, logger_keys in table_instrument_keys(table):
+        responses[(sensor_keys, logger_keys)] = combine_resp(
+            nrl.get_sensor_response(list(sensor_keys)),
+            nrl.get_datalogger_response(list(logger_keys)),
+        )
+
+    networks = {}
+    stations = {}
+    for i in range(len(table["row"])):
+        net_code = table["network"][i]
+        sta_code = table["station"][i]
+        start = UTCDateTime(table["start_date_value"][i])
+        end = (
+            UTCDateTime(table["end_date_value"][i])
+            if table["end_date"][i]
+            else None
+        )
+        lat = table["latitude_value"][i]
+        lon = table["longitude_value"][i]
+        ele = table["elevation_value"][i]
+
+        if net_code not in networks:
+            networks[net_code] = Network(code=net_code, stations=[])
+        station = stations.get((net_code, sta_code))
+        if station is None:
+            station = Station(
+                code=sta_code,
+                latitude=lat,
+                longitude=lon,
+                elevation=ele,
+                creation_date=start,
+                start_date=start,
+                end_date=end,
+                channels=[],
+            )
+            if table["site_name"][i]:
+                station.site = Site(name=table["site_name"][i])
+            stations[(net_code, sta_code)] = station
+            networks[net_code].stations.append(station)
+        else:
+            if start < station.start_date:
+                station.start_date = station.creation_date = start
+            # The station ends with its last channel; an open one keeps it
+            # open
+            if station.end_date is not None and (
+                end is None or end > station.end_date
+            ):
+                station.end_date = end
+
+        response = responses[
+            _instrument_key(
+                table["sensor_keys"][i], table["datalogger_keys"][i]
+            )
+        ]
+        for chan_code in table["channels"][i].split(","):
+            if not chan_code.strip():
+                continue
+            channel = build_channel(
+                chan_code.strip(),
+                table["location"][i],
+                lat,
+                lon,
+                ele,
+                table["depth_value"][i],
+                table["sample_rate_value"][i],
+                start,
+                response,
+            )
+            channel.end_date = end
+            station.channels.append(channel)
+
+    return Inventory(
+        networks=[networks[code] for code in sorted(networks)],
+        source=source,
+    )
@@ -0,0 +1,138 @@
+# core/bulk.py
+import numpy as np
+from obspy import UTCDateTime
+
+FIELDS = {
+    "channel": (
+        "latitude",
+        "longitude",
+        "elevation",
+        "depth",
+        "azimuth",
+        "dip",
+        "sample_rate",
+        "start_date",
+        "end_date",
+    ),
+    "station": (
+        "latitude",
+        "longitude",
+        "elevation",
+        "start_date",
+        "end_date",
+    ),
+}
+TIME_FIELDS = ("start_date", "end_date")
+OPERATIONS = ("set", "add offset", "copy from station")
+LIMITS = {
+    "latitude": (-90.0, 90.0),
+    "longitude": (-180.0, 180.0),
+    "azimuth": (0.0, 360.0),
+    "dip": (-90.0, 90.0),
+}
+NS_PER_DAY = 86400 * 10 ** 9
+
+
+def _column(objects, field):
+    # Values as one array plus a mask of the missing ones; dates are
+    # integer nanoseconds so offsets keep full precision
+    values = [getattr(obj, field) for obj in objects]
+    missing = np.array([v is None for v in values], dtype=bool)
+    if field in TIME_FIELDS:
+        column = np.array(
+            [0 if v is None else v.ns for v in values], dtype=np.int64
+        )
+    else:
+        column = np.array(
+            [np.nan if v is None else float(v) for v in values],
+            dtype=np.float64,
+        )
+    return column, missing
+
+
+def _parse(field, text):
+    text = text.strip()
+    if not text:
+        return None
+    if field in TIME_FIELDS:
+        return UTCDateTime(text).ns
+    return float(text)
+
+
+def plan_bulk_edit(targets, field, operation, value=""):
+    # targets: [(object, its station)]. Computes every new value in one pass
+    # and validates all of them; nothing is written here.
+    objects = [obj for obj, _ in targets]
+    old, old_missing = _column(objects, field)
+    errors = np.full(len(objects), None, dtype=object)
+
+    if operation == "set":
+        parsed = _parse(field, value)
+        if parsed is None and field != "end_date":
+            raise ValueError(f"A value for {field} is required.")
+        missing = np.full(len(objects), parsed is None)
+        new = np.full_like(old, 0 if parsed is None else parsed)
+    elif operation == "add offset":
+        offset = float(value)
+        if field in TIME_FIELDS:
+            new = old + np.int64(round(offset * NS_PER_DAY))
+        else:
+            new = old + offset
+            if field == "azimuth":
+                new = np.mod(new, 360.0)
+        missing = old_missing
+        errors[old_missing] = f"{field} is not set, nothing to offset."
+    elif operation == "copy from station":
+        if field not in FIELDS["station"]:
+            raise ValueError(f"Stations have no {field}.")
+        stations = [sta for _, sta in targets]
+        if None in stations:
+            raise ValueError("Only channels can copy from their station.")
+        new, missing = _column(stations, field)
+    else:
+        raise ValueError(f"Unknown operation {operation}.")
+
+    present = ~missing
+    if field in LIMITS:
+        low, high = LIMITS[field]
+        bad = present & ((new < low) | (new > high))
+        errors[bad] = f"{field} must be between {low:g} and {high:g}."
+    if field == "sample_rate":
+        errors[present & (new <= 0)] = "Sample rate must be positive."
+    if field in TIME_FIELDS:
+        other_field = "end_date" if field == "start_date" else "start_date"
+        other, other_missing = _column(objects, other_field)
+        both = present & ~other_missing
+        bad = both & (new >= other if field == "start_date" else new <= other)
+        errors[bad] = "End date must be after the start date."
+
+    if field in TIME_FIELDS:
+        values = [
+            None if m else UTCDateTime(ns=int(v))
+            for v, m in zip(new.tolist(), missing.tolist())
+        ]
+    else:
+        values = [
+            None if m else v for v, m in zip(new.tolist(), missing.tolist())
+        ]
+    return {
+        "objects": objects,
+        "field": field,
+        "old": [getattr(obj, field) for obj in objects],
+        "new": values,
+        "errors": [(i, e) for i, e in enumerate(errors) if e is not None],
+    }
+
+
+def apply_values(objects, field, values):
+    # All or nothing: a value rejected by ObsPy restores the earlier ones
+    old = [getattr(obj, field) for obj in objects]
+    done = 0
+    try:
+        for obj, value in zip(objects, values):
+            setattr(obj, field, value)
+            done += 1
+    except Exception:
+        for obj, value in zip(objects[:done], old):
+            setattr(obj, field, value)
+        raise
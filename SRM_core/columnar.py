@@ -0,0 +1,198 @@
+# core/columnar.py
+import fnmatch
+import operator
+import re
+
+import numpy as np
+from obspy import UTCDateTime
+
+CODE_COLUMNS = ("network", "station", "location", "channel")
+NUMBER_COLUMNS = (
+    "latitude",
+    "longitude",
+    "elevation",
+    "depth",
+    "azimuth",
+    "dip",
+    "sample_rate",
+)
+TIME_COLUMNS = ("start", "end")
+COLUMNS = CODE_COLUMNS + NUMBER_COLUMNS + TIME_COLUMNS + ("sensitivity",)
+
+# Channel attribute written by an edit of the column; the others are
+# read-only in the table
+ATTRIBUTES = {
+    "location": "location_code",
+    "channel": "code",
+    "start": "start_date",
+    "end": "end_date",
+}
+ATTRIBUTES.update((name, name) for name in NUMBER_COLUMNS)
+
+COMPARISONS = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<": operator.lt,
+    ">": operator.gt,
+    "=": operator.eq,
+}
+CONDITION = re.compile(r"^(\w+)(<=|>=|<|>|=)(.+)$")
+
+
+def _number(value):
+    return np.nan if value is None else float(value)
+
+
+def _time(value):
+    return np.nan if value is None else value.timestamp
+
+
+def _sensitivity(chan):
+    response = chan.response
+    if response is None or response.instrument_sensitivity is None:
+        return np.nan
+    return _number(response.instrument_sensitivity.value)
+
+
+def channel_row(net, sta, chan):
+    return (
+        (net.code, sta.code, chan.location_code or "", chan.code)
+        + tuple(_number(getattr(chan, name)) for name in NUMBER_COLUMNS)
+        + (_time(chan.start_date), _time(chan.end_date), _sensitivity(chan))
+    )
+
+
+class ChannelTable:
+    # Channel metadata of all loaded files as one NumPy structured array,
+    # one row per channel epoch. Sorting and filtering work on whole
+    # columns; edits go to the Channel object first and then refresh its
+    # row.
+    def __init__(self, loaded_files):
+        rows = []
+        self.channels = []
+        self.parents = []
+        self.files = []
+        for filepath, inventory in loaded_files.items():
+            for net in inventory.networks:
+                for sta in net.stations:
+                    for chan in sta.channels:
+                        rows.append(channel_row(net, sta, chan))
+                        self.channels.append(chan)
+                        self.parents.append((net, sta))
+                        self.files.append(filepath)
+        widths = [
+            max([len(row[i]) for row in rows], default=0) + 1
+            for i in range(len(CODE_COLUMNS))
+        ]
+        dtype = [
+            (name, f"U{width}") for name, width in zip(CODE_COLUMNS, widths)
+        ]
+        dtype += [(name, "f8") for name in COLUMNS[len(CODE_COLUMNS):]]
+        self.data = np.array(rows, dtype=dtype)
+        self.rows = {id(chan): i for i, chan in enumerate(self.channels)}
+        self._update_ids()
+
+    def __len__(self):
+        return len(self.data)
+
+    def _update_ids(self):
+        data = self.data
+        dots = np.full(len(data), ".", dtype="U1")
+        ids = data["network"]
+        for name in CODE_COLUMNS[1:]:
+            ids = np.char.add(np.char.add(ids, dots), data[name])
+        self.ids = np.char.lower(ids)
+
+    def refresh(self, chan):
+        # Re-reads one channel after it was edited elsewhere
+        row = self.rows.get(id(chan))
+        if row is None:
+            return None
+        values = channel_row(*self.parents[row], chan)
+        codes_changed = any(
+            self.data[row][name] != value
+            for name, value in zip(CODE_COLUMNS, values)
+        )
+        self._fit(values)
+        try:
+            self.data[row] = values
+        except ValueError:
+            return None
+        if codes_changed:
+            self._update_ids()
+        return row
+
+    def _fit(self, values):
+        # NumPy would cut codes longer than their column; those columns
+        # are rebuilt wider first
+        widths = {
+            name: len(value) + 1
+            for name, value in zip(CODE_COLUMNS, values)
+            if len(value) >= self.data.dtype[name].itemsize // 4
+        }
+        if widths:
+            self.data = self.data.astype(
+                [
+                    (name, f"U{widths[name]}" if name in widths else dt)
+                    for name, (dt, _) in self.data.dtype.fields.items()
+                ]
+            )
+
+    def text(self, row, column):
+        value = self.data[column][row]
+        if column in CODE_COLUMNS:
+            return str(value)
+        if np.isnan(value):
+            return ""
+        if column in TIME_COLUMNS:
+            return UTCDateTime(value).strftime("%Y-%m-%dT%H:%M:%S")
+        return str(float(value))
+
+    def set_text(self, row, column, text):
+        # Raises ValueError for read-only columns and rejected values
+        attribute = ATTRIBUTES.get(column)
+        if attribute is None:
+            raise ValueError(f"{column} cannot be edited here.")
+        text = text.strip()
+        chan = self.channels[row]
+        if column in TIME_COLUMNS:
+            value = UTCDateTime(text) if text else None
+        elif column in NUMBER_COLUMNS:
+            value = float(text) if text else None
+        else:
+            value = text
+        setattr(chan, attribute, value)
+        self.refresh(chan)
+        return chan
+
+    def _mask(self, term):
+        match = CONDITION.match(term)
+        if match and match.group(1) in COLUMNS[len(CODE_COLUMNS):]:
+            column, op, value = match.groups()
+            if column in TIME_COLUMNS:
+                value = UTCDateTime(value).timestamp
+            return COMPARISONS[op](self.data[column], float(value))
+        if any(c in term for c in "*?["):
+            pattern = re.compile(fnmatch.translate(term))
+            return np.fromiter(
+                (pattern.match(i) is not None for i in self.ids),
+                dtype=bool,
+                count=len(self.ids),
+            )
+        return np.char.find(self.ids, term) >= 0
+
+    def select(self, text=""):
+        # Rows matching all whitespace separated terms. A term is a part of
+        # the SEED id, a wildcard pattern for it, or a condition such as
+        # sample_rate>=100 or start<2020-01-01.
+        mask = np.ones(len(self.data), dtype=bool)
+        for term in text.lower().split():
+            mask &= self._mask(term)
+        return np.flatnonzero(mask)
+
+    def sort(self, rows, column, descending=False):
+        # Stable, so sorting by one column after another nests the orders
+        order = np.argsort(self.data[column][rows], kind="stable")
+        if descending:
+            order = order[::-1]
+        return rows[order]
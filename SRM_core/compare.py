@@ -0,0 +1,72 @@
+# core/compare.py
+import numpy as np
+
+from SRM_core.diff import index_response
+
+# One grid for all compared responses, denser than the response tab so
+# that ratios around sharp features are resolved; it is decimated again
+# for display
+GRID = (-2, 2, 8192)
+
+
+def shared_grid():
+    return np.logspace(*GRID)
+
+
+def evaluate_responses(responses, freq):
+    # (len(responses), len(freq)) complex array. Identical responses are
+    # evaluated once; rows that could not be evaluated are NaN and their
+    # error is returned as {row: message}.
+    cache, rows, first = {}, [], {}
+    for i, resp in enumerate(responses):
+        key = index_response(resp, cache)["hash"]
+        rows.append(first.setdefault(key, i))
+    values = {}
+    errors = {}
+    for i in set(rows):
+        try:
+            values[i] = responses[i].get_evalresp_response_for_frequencies(
+                freq, output="DEF"
+            )
+        except Exception as e:
+            errors[i] = str(e)
+    h = np.full((len(responses), len(freq)), np.nan, dtype=complex)
+    for row, i in enumerate(rows):
+        if i in values:
+            h[row] = values[i]
+    return h, {row: errors[i] for row, i in enumerate(rows) if i in errors}
+
+
+def compare(h, reference):
+    # Amplitudes, phases, amplitude ratios to the reference row and phase
+    # differences to it, wrapped to (-180, 180], for all rows at once
+    amp = np.abs(h)
+    phase = np.angle(h, deg=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = amp / amp[reference]
+    difference = np.angle(h * np.conj(h[reference]), deg=True)
+    return amp, phase, ratio, difference
+
+
+def decimate(x, y, points):
+    # Rows of y sampled at x, reduced to about points samples each by
+    # keeping the minimum and maximum of every bucket, in their order, so
+    # that peaks and notches survive. Returns (n, k) arrays of x and y.
+    y = np.atleast_2d(y)
+    n, m = y.shape
+    buckets = max(points // 2, 1)
+    if m <= points:
+        return np.broadcast_to(x, y.shape), y
+    size = -(-m // buckets)
+    padded = np.pad(y, ((0, 0), (0, buckets * size - m)), mode="edge")
+    padded = padded.reshape(n, buckets, size)
+    # NaN rows stay NaN, whichever samples are picked
+    filled = np.where(np.isnan(padded), np.inf, padded)
+    low = np.argmin(filled, axis=2)
+    high = np.argmax(np.where(np.isinf(filled), -np.inf, filled), axis=2)
+    offsets = np.arange(buckets) * size
+    first = offsets + np.minimum(low, high)
+    second = offsets + np.maximum(low, high)
+    index = np.stack([first, second], axis=2).reshape(n, -1)
+    index = np.minimum(index, m - 1)
+    return x[index], np.take_along_axis(y, index, axis=1)
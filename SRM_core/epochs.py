@@ -0,0 +1,238 @@
+# core/epochs.py
+import bisect
+
+from SRM_core.search import entry_label
+
+OPEN_END = float("inf")
+KINDS = ("network", "station", "channel")
+
+
+def epoch_interval(obj):
+    # Epochs are half open, [start, end), with missing dates unbounded
+    start = obj.start_date.timestamp if obj.start_date else -OPEN_END
+    end = obj.end_date.timestamp if obj.end_date else OPEN_END
+    # An end before the start (reported by the epoch rule) is empty
+    return start, max(start, end)
+
+
+def overlapping_pairs(objects, key):
+    # Pairs of objects with the same key(obj) whose epochs overlap
+    groups = {}
+    for obj in objects:
+        groups.setdefault(key(obj), []).append((epoch_interval(obj), obj))
+    pairs = []
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        group.sort(key=lambda item: item[0])
+        (_, latest_end), latest = group[0]
+        for (start, end), obj in group[1:]:
+            if start < latest_end:
+                pairs.append((latest, obj))
+            if end > latest_end:
+                latest_end, latest = end, obj
+    return pairs
+
+
+def _center(items):
+    points = sorted(
+        p for start, end, _ in items for p in (start, end)
+        if abs(p) != OPEN_END
+    )
+    return points[len(points) // 2] if points else 0.0
+
+
+class _Node:
+    # Holds the intervals containing its center, sorted by start and by end
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center):
+        self.center = center
+        self.by_start = []
+        self.by_end = []
+        self.left = None
+        self.right = None
+
+
+class EpochIndex:
+    # Centered interval tree over the network, station and channel epochs
+    # of all loaded files. Whole files are indexed by rebuilding a balanced
+    # tree on the next query; single edits are inserted and removed in
+    # place until they outnumber the indexed epochs.
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.entries = {}
+        self.by_file = {}
+        self.root = None
+        self.nodes = {}
+        self.stale = False
+        self.edits = 0
+
+    def add_inventory(self, filepath, inventory):
+        self.remove_inventory(filepath)
+        ids = self.by_file.setdefault(filepath, set())
+        for net in inventory.networks:
+            self._add(filepath, (net,), ids)
+            for sta in net.stations:
+                self._add(filepath, (net, sta), ids)
+                for chan in sta.channels:
+                    self._add(filepath, (net, sta, chan), ids)
+        self.stale = True
+
+    def remove_inventory(self, filepath):
+        for entry_id in self.by_file.pop(filepath, ()):
+            del self.entries[entry_id]
+        self.stale = True
+
+    def update(self, obj):
+        # Labels of everything below a renamed network or station change
+        entry = self.entries.get(id(obj))
+        if entry is None:
+            return
+        filepath, path = entry["file"], entry["path"]
+        ids = self.by_file.setdefault(filepath, set())
+        paths = [path]
+        if len(path) == 1:
+            for sta in obj.stations:
+                paths.append(path + (sta,))
+                paths.extend(path + (sta, chan) for chan in sta.channels)
+        elif len(path) == 2:
+            paths.extend(path + (chan,) for chan in obj.channels)
+        for sub_path in paths:
+            entry_id = id(sub_path[-1])
+            old = self.entries.get(entry_id)
+            new = self._add(filepath, sub_path, ids)
+            if self.stale:
+                continue
+            if old is not None:
+                self._tree_remove(entry_id, old["start"], old["end"])
+            self._tree_insert((new["start"], new["end"], entry_id))
+            self.edits += 1
+        if self.edits > max(1000, len(self.entries)):
+            self.stale = True
+
+    def _add(self, filepath, path, ids):
+        start, end = epoch_interval(path[-1])
+        entry = self.entries[id(path[-1])] = {
+            "file": filepath,
+            "path": path,
+            "label": entry_label(path),
+            "kind": KINDS[len(path) - 1],
+            "start": start,
+            "end": end,
+        }
+        ids.add(id(path[-1]))
+        return entry
+
+    def _rebuild(self):
+        self.nodes = {}
+        self.edits = 0
+        self.root = self._build(
+            [(e["start"], e["end"], i) for i, e in self.entries.items()]
+        )
+        self.stale = False
+
+    def _build(self, items):
+        if not items:
+            return None
+        node = _Node(_center(items))
+        left, right = [], []
+        for item in items:
+            if item[1] < node.center:
+                left.append(item)
+            elif item[0] > node.center:
+                right.append(item)
+            else:
+                node.by_start.append((item[0], item[2]))
+                node.by_end.append((item[1], item[2]))
+                self.nodes[item[2]] = node
+        node.by_start.sort()
+        node.by_end.sort()
+        node.left = self._build(left)
+        node.right = self._build(right)
+        return node
+
+    def _tree_insert(self, item):
+        start, end, entry_id = item
+        if self.root is None:
+            self.root = _Node(_center([item]))
+        node = self.root
+        while not start <= node.center <= end:
+            side = "left" if end < node.center else "right"
+            child = getattr(node, side)
+            if child is None:
+                child = _Node(_center([item]))
+                setattr(node, side, child)
+            node = child
+        bisect.insort(node.by_start, (start, entry_id))
+        bisect.insort(node.by_end, (end, entry_id))
+        self.nodes[entry_id] = node
+
+    def _tree_remove(self, entry_id, start, end):
+        node = self.nodes.pop(entry_id, None)
+        if node is None:
+            return
+        # Emptied nodes stay in the tree until the next rebuild
+        for values, value in (
+            (node.by_start, (start, entry_id)),
+            (node.by_end, (end, entry_id)),
+        ):
+            i = bisect.bisect_left(values, value)
+            if i < len(values) and values[i] == value:
+                del values[i]
+
+    def overlapping_ids(self, start, end):
+        # Ids of the objects whose epoch overlaps [start, end]; a point in
+        # time is the range with start == end
+        if self.stale:
+            self._rebuild()
+        ids = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end < node.center:
+                for value, entry_id in node.by_start:
+                    if value > end:
+                        break
+                    ids.append(entry_id)
+                stack.append(node.left)
+            elif start > node.center:
+                for value, entry_id in reversed(node.by_end):
+                    if value <= start:
+                        break
+                    ids.append(entry_id)
+                stack.append(node.right)
+            else:
+                ids.extend(
+                    entry_id
+                    for value, entry_id in node.by_end
+                    if value > start
+                )
+                stack.append(node.left)
+                stack.append(node.right)
+        return ids
+
+    def overlapping(self, start, end, kinds=None):
+        entries = [self.entries[i] for i in self.overlapping_ids(start, end)]
+        if kinds is not None:
+            entries = [e for e in entries if e["kind"] in kinds]
+        return sorted(entries, key=lambda e: (e["label"], e["start"]))
+
+    def active_at(self, time, kinds=None):
+        return self.overlapping(time, time, kinds)
+
+    def time_span(self):
+        # First and last finite epoch boundary, or None without any
+        points = [
+            p
+            for e in self.entries.values()
+            for p in (e["start"], e["end"])
+            if abs(p) != OPEN_END
+        ]
+        if not points:
+            return None
+        return min(points), max(points)
@@ -0,0 +1,93 @@
+# core/inventory_io.py
+import gzip
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from obspy import read_inventory
+
+# Inventory file types, with the ObsPy format they usually hold
+INVENTORY_SUFFIXES = {
+    ".xml": "STATIONXML",
+    ".dataless": "SEED",
+    ".dless": "SEED",
+}
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+
+def split_suffix(path):
+    # "a.xml.gz" -> (".xml", ".gz"), "a.xml" -> (".xml", "")
+    stem, suffix = os.path.splitext(path.lower())
+    if suffix in COMPRESSED_SUFFIXES:
+        return os.path.splitext(stem)[1], suffix
+    return suffix, ""
+
+
+def is_inventory_file(path):
+    return split_suffix(path)[0] in INVENTORY_SUFFIXES
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "Reading and writing .zst files needs the zstandard package "
+            "(pip install zstandard)."
+        ) from None
+    return zstandard
+
+
+def open_file(path, mode="rb", compression=None):
+    # Binary file object for path, compressed or not by its suffix. Data is
+    # (de)compressed while it is read or written, nothing goes to temp files.
+    if compression is None:
+        compression = split_suffix(path)[1]
+    if compression == ".gz":
+        # Level 6 is close to level 9 in size for XML and much faster
+        return gzip.open(path, mode, compresslevel=6)
+    if compression == ".zst":
+        zstandard = _zstandard()
+        f = open(path, mode)
+        if "r" in mode:
+            return zstandard.ZstdDecompressor().stream_reader(f)
+        return zstandard.ZstdCompressor(level=10).stream_writer(f)
+    return open(path, mode)
+
+
+def sniff_format(head):
+    # ObsPy format of a file starting with head. StationXML is saved to
+    # any inventory path, dataless SEED ones included.
+    if head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"<"):
+        return "STATIONXML"
+    return "SEED"
+
+
+def read_inventory_file(path):
+    if not split_suffix(path)[1]:
+        return read_inventory(path)
+    # Compressed streams cannot seek back, which format detection and the
+    # SEED parser do, so the file is decompressed into memory once
+    with open_file(path) as f:
+        data = io.BytesIO(f.read())
+    return read_inventory(data, format=sniff_format(data.getvalue()[:64]))
+
+
+def read_inventory_files(paths, max_workers=None, progress=None,
+                         reader=read_inventory_file):
+    # Reads (and decompresses) the files in worker threads. Returns
+    # {path: reader(path)}, inventories by default, in the order of paths
+    # plus a list of (path, error).
+    inventories, errors = {}, []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(reader, p): p for p in paths}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                inventories[futures[future]] = future.result()
+            except Exception as e:
+                errors.append((futures[future], e))
+            if progress is not None and progress(done, len(paths)) is False:
+                for pending in futures:
+                    pending.cancel()
+                break
+    return {p: inventories[p] for p in paths if p in inventories}, errors
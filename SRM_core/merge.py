@@ -0,0 +1,228 @@
+# core/merge.py
+import copy
+
+from obspy import Inventory
+
+from SRM_core.diff import index_response, object_digest
+from SRM_core.epochs import epoch_interval, overlapping_pairs
+
+RESOLUTIONS = ("keep existing", "use incoming", "keep both")
+# Differ whenever the merged stations hold different channels
+COUNT_FIELDS = ("total_number_of_channels", "selected_number_of_channels")
+
+
+def _copy_without(obj, children, memo):
+    # Copies a network or station but not the list of its children
+    saved = getattr(obj, children)
+    setattr(obj, children, [])
+    try:
+        return copy.deepcopy(obj, memo)
+    finally:
+        setattr(obj, children, saved)
+
+
+def _widen_epoch(target, source):
+    if source.start_date and (
+        not target.start_date or source.start_date < target.start_date
+    ):
+        target.start_date = source.start_date
+    if target.end_date and (
+        not source.end_date or source.end_date > target.end_date
+    ):
+        target.end_date = source.end_date
+
+
+def _station_digest(sta):
+    counts = [getattr(sta, name) for name in COUNT_FIELDS]
+    for name in COUNT_FIELDS:
+        setattr(sta, name, None)
+    try:
+        return object_digest(sta)
+    finally:
+        for name, value in zip(COUNT_FIELDS, counts):
+            setattr(sta, name, value)
+
+
+def _overlapping(accepted, start, end):
+    return [e for e in accepted if e["start"] < end and start < e["end"]]
+
+
+def plan_merge(sources):
+    # sources: [(label, Inventory)]. Networks are merged by code. A station
+    # epoch is merged with an accepted epoch of the same code only if both
+    # are identical; one that overlaps accepted epochs otherwise is a
+    # conflict, and one that overlaps none is kept as an epoch of its own.
+    # Channel epochs of a station are looked up in a hash index of
+    # identical epochs and compared against its accepted epochs of the same
+    # location/channel code in the same way. Conflicts are resolved before
+    # build_merged_inventory() is called.
+    memo = {}
+    response_cache = {}
+    networks = {}
+    stations = {}
+    identical = set()
+    conflicts = []
+    duplicates = 0
+    total = 0
+
+    for label, inventory in sources:
+        for net in inventory.networks:
+            if net.code not in networks:
+                networks[net.code] = _copy_without(net, "stations", memo)
+            else:
+                _widen_epoch(networks[net.code], net)
+            for sta in net.stations:
+                sta_key = (net.code, sta.code)
+                start, end = epoch_interval(sta)
+                digest = _station_digest(sta)
+                accepted = stations.setdefault(sta_key, [])
+                overlapping = _overlapping(accepted, start, end)
+                record = next(
+                    (
+                        r
+                        for r in overlapping
+                        if (r["start"], r["end"], r["digest"])
+                        == (start, end, digest)
+                    ),
+                    None,
+                )
+                if record is None:
+                    record = {
+                        "station": _copy_without(sta, "channels", memo),
+                        "source": label,
+                        "start": start,
+                        "end": end,
+                        "digest": digest,
+                        "epochs": {},
+                    }
+                    if overlapping:
+                        conflicts.append(
+                            {
+                                "id": ".".join(sta_key),
+                                "key": sta_key,
+                                "incoming": record,
+                                "existing": overlapping,
+                                "resolution": RESOLUTIONS[0],
+                            }
+                        )
+                    else:
+                        accepted.append(record)
+                for chan in sta.channels:
+                    total += 1
+                    response_hash = (
+                        index_response(chan.response, response_cache)["hash"]
+                        if chan.response is not None
+                        else None
+                    )
+                    start, end = epoch_interval(chan)
+                    key = (chan.location_code, chan.code)
+                    content = (id(record),) + key + (
+                        start, end, object_digest(chan), response_hash
+                    )
+                    if content in identical:
+                        duplicates += 1
+                        continue
+                    identical.add(content)
+                    entry = {
+                        "channel": chan,
+                        "source": label,
+                        "start": start,
+                        "end": end,
+                    }
+                    chan_epochs = record["epochs"].setdefault(key, [])
+                    overlapping = _overlapping(chan_epochs, start, end)
+                    if overlapping:
+                        conflicts.append(
+                            {
+                                "id": ".".join(sta_key + key),
+                                "key": key,
+                                "station": record,
+                                "incoming": entry,
+                                "existing": overlapping,
+                                "resolution": RESOLUTIONS[0],
+                            }
+                        )
+                    else:
+                        chan_epochs.append(entry)
+
+    return {
+        "networks": networks,
+        "stations": stations,
+        "conflicts": conflicts,
+        "duplicates": duplicates,
+        "total": total,
+        "memo": memo,
+    }
+
+
+def _resolve(accepted, conflict):
+    if conflict["resolution"] == "use incoming":
+        existing = {id(e) for e in conflict["existing"]}
+        accepted[:] = [e for e in accepted if id(e) not in existing]
+        accepted.append(conflict["incoming"])
+    elif conflict["resolution"] == "keep both":
+        accepted.append(conflict["incoming"])
+
+
+def merged_overlaps(inventory):
+    # Labels of the station and channel epochs of the merged inventory that
+    # overlap another epoch with the same codes
+    overlaps = []
+    for net in inventory.networks:
+        for first, _ in overlapping_pairs(net.stations, lambda s: s.code):
+            overlaps.append(f"{net.code}.{first.code}")
+        for sta in net.stations:
+            for first, _ in overlapping_pairs(
+                sta.channels, lambda c: (c.location_code, c.code)
+            ):
+                overlaps.append(
+                    f"{net.code}.{sta.code}.{first.location_code}."
+                    f"{first.code}"
+                )
+    return overlaps
+
+
+def build_merged_inventory(plan, source="SRM merge"):
+    # Returns the merged inventory and merged_overlaps() of it, which
+    # conflicts resolved with "keep both" leave behind
+    stations = {
+        key: list(records) for key, records in plan["stations"].items()
+    }
+    epochs = {}
+    for conflict in plan["conflicts"]:
+        if "station" not in conflict:
+            _resolve(stations[conflict["key"]], conflict)
+    for records in stations.values():
+        for record in records:
+            epochs[id(record)] = {
+                key: list(entries)
+                for key, entries in record["epochs"].items()
+            }
+    for conflict in plan["conflicts"]:
+        chan_epochs = epochs.get(id(conflict.get("station")))
+        # Channels of a station epoch that was not kept go with it
+        if chan_epochs is not None:
+            _resolve(chan_epochs[conflict["key"]], conflict)
+
+    memo = plan["memo"]
+    for net in plan["networks"].values():
+        net.stations = []
+    for (net_code, _), records in sorted(stations.items()):
+        for record in sorted(records, key=lambda r: r["start"]):
+            sta = record["station"]
+            sta.channels = []
+            plan["networks"][net_code].stations.append(sta)
+            chan_epochs = epochs[id(record)]
+            for key in sorted(chan_epochs):
+                entries = sorted(chan_epochs[key], key=lambda e: e["start"])
+                # Responses shared in the sources stay shared through the
+                # memo
+                sta.channels.extend(
+                    copy.deepcopy(entry["channel"], memo) for entry in entries
+                )
+
+    inventory = Inventory(
+        networks=[plan["networks"][c] for c in sorted(plan["networks"])],
+        source=source,
+    )
+    return inventory, merged_overlaps(inventory)
@@ -0,0 +1,406 @@
+# core/mseed.py
+import calendar
+import mmap
+import os
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+from obspy import UTCDateTime
+
+FIXED_HEADER_SIZE = 48
+QUALITY_CODES = b"DRQM"
+MSEED_EXTENSIONS = (".mseed", ".msd", ".miniseed")
+
+
+def _year_start(years):
+    years = np.asarray(years)
+    unique = np.unique(years)
+    starts = np.array(
+        [calendar.timegm((int(y), 1, 1, 0, 0, 0)) for y in unique],
+        dtype=np.float64,
+    )
+    return starts[np.searchsorted(unique, years)]
+
+
+def _sample_rate(factor, multiplier):
+    factor = np.asarray(factor, dtype=np.float64)
+    multiplier = np.asarray(multiplier, dtype=np.float64)
+    multiplier = np.where(multiplier == 0, 1.0, multiplier)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.select(
+            [
+                factor == 0,
+                (factor > 0) & (multiplier > 0),
+                (factor > 0) & (multiplier < 0),
+                (factor < 0) & (multiplier > 0),
+            ],
+            [
+                0.0,
+                factor * multiplier,
+                -factor / multiplier,
+                -multiplier / factor,
+            ],
+            1.0 / (factor * multiplier),
+        )
+    return rate
+
+
+def _scalar_sample_rate(factor, multiplier):
+    if factor == 0:
+        return 0.0
+    if multiplier == 0:
+        multiplier = 1
+    if factor > 0 and multiplier > 0:
+        return float(factor * multiplier)
+    if factor > 0 and multiplier < 0:
+        return -float(factor) / multiplier
+    if factor < 0 and multiplier > 0:
+        return -float(multiplier) / factor
+    return 1.0 / (factor * multiplier)
+
+
+def _byte_order(buf):
+    for order in (">", "<"):
+        if 1900 <= struct.unpack_from(order + "H", buf, 20)[0] <= 2100:
+            return order
+    return None
+
+
+def _header_dtype(order, itemsize):
+    return np.dtype(
+        {
+            "names": [
+                "quality", "codes", "year", "doy", "hour", "minute",
+                "second", "tenth_ms", "nsamples", "factor", "multiplier",
+                "activity", "nblockettes", "time_correction",
+                "first_blockette",
+            ],
+            "formats": [
+                "u1", "S12", order + "u2", order + "u2", "u1", "u1", "u1",
+                order + "u2", order + "u2", order + "i2", order + "i2",
+                "u1", "u1", order + "i4", order + "u2",
+            ],
+            "offsets": [
+                6, 8, 20, 22, 24, 25, 26, 28, 30, 32, 34, 36, 39, 40, 46,
+            ],
+            "itemsize": itemsize,
+        }
+    )
+
+
+def _start_times(h):
+    start = (
+        _year_start(h["year"])
+        + (h["doy"].astype(np.float64) - 1) * 86400
+        + h["hour"] * 3600.0
+        + h["minute"] * 60.0
+        + h["second"]
+        + h["tenth_ms"] / 10000.0
+    )
+    apply_correction = (h["activity"] & 0x02) == 0
+    return start + np.where(
+        apply_correction, h["time_correction"] / 10000.0, 0.0
+    )
+
+
+def _blockette_layout(buf, order, offset=0):
+    nblockettes = buf[offset + 39]
+    next_blockette = struct.unpack_from(order + "H", buf, offset + 46)[0]
+    layout = []
+    for _ in range(nblockettes):
+        pos = offset + next_blockette
+        if next_blockette < FIXED_HEADER_SIZE or pos + 8 > len(buf):
+            break
+        btype, following = struct.unpack_from(order + "HH", buf, pos)
+        layout.append((next_blockette, btype))
+        if not following:
+            break
+        next_blockette = following
+    return layout
+
+
+def _blockette_view(buf, order, offset, record_length, count):
+    return np.frombuffer(
+        buf,
+        dtype=np.dtype(
+            {
+                "names": ["type", "next", "b4", "b5", "b6", "f4"],
+                "formats": [
+                    order + "u2", order + "u2", "u1", "i1", "u1",
+                    order + "f4",
+                ],
+                "offsets": [
+                    offset, offset + 2, offset + 4, offset + 5, offset + 6,
+                    offset + 4,
+                ],
+                "itemsize": record_length,
+            }
+        ),
+        count=count,
+    )
+
+
+def _scan_fixed_length(buf, order):
+    # Fast path for the usual case of one record length and one blockette
+    # layout per file: every header field is read for all records at once
+    # through strided views of the mapped file.
+    layout = _blockette_layout(buf, order)
+    types = dict((btype, offset) for offset, btype in layout)
+    if 1000 not in types or types[1000] + 8 > len(buf):
+        return None
+    record_length = 2 ** buf[types[1000] + 6]
+    if record_length < FIXED_HEADER_SIZE or len(buf) % record_length:
+        return None
+    count = len(buf) // record_length
+
+    h = np.frombuffer(
+        buf, dtype=_header_dtype(order, record_length), count=count
+    )
+    valid = (
+        np.isin(h["quality"], np.frombuffer(QUALITY_CODES, dtype="u1"))
+        & (h["nblockettes"] == buf[39])
+        & (h["first_blockette"] == layout[0][0])
+        & (h["year"] >= 1900)
+        & (h["year"] <= 2100)
+    )
+    blockettes = {}
+    for offset, btype in layout:
+        if offset + 12 > record_length:
+            return None
+        view = _blockette_view(buf, order, offset, record_length, count)
+        valid &= view["type"] == btype
+        blockettes[btype] = view
+    if not valid.all():
+        return None
+    if (blockettes[1000]["b6"] != buf[types[1000] + 6]).any():
+        return None
+
+    start = _start_times(h)
+    if 1001 in blockettes:
+        start = start + blockettes[1001]["b5"] / 1e6
+    if 100 in blockettes:
+        rate = blockettes[100]["f4"].astype(np.float64)
+    else:
+        rate = _sample_rate(h["factor"], h["multiplier"])
+    return h["codes"], start, h["nsamples"].astype(np.int64), rate
+
+
+def _scan_record_by_record(buf, order):
+    # Slow path for files mixing record lengths or blockette layouts
+    codes, starts, nsamples, rates = [], [], [], []
+    year_starts = {}
+    offset = 0
+    while offset < len(buf):
+        if offset + FIXED_HEADER_SIZE > len(buf):
+            return None
+        if buf[offset + 6] not in QUALITY_CODES:
+            return None
+        (
+            year, doy, hour, minute, second, _, tenth_ms,
+            npts, factor, multiplier, activity, _, _, _,
+            time_correction,
+        ) = struct.unpack_from(order + "HHBBBBHHhhBBBBi", buf, offset + 20)
+        if year not in year_starts:
+            year_starts[year] = calendar.timegm((year, 1, 1, 0, 0, 0))
+        start = (
+            year_starts[year] + (doy - 1) * 86400
+            + hour * 3600 + minute * 60 + second + tenth_ms / 10000.0
+        )
+        if not activity & 0x02:
+            start += time_correction / 10000.0
+        rate = _scalar_sample_rate(factor, multiplier)
+        record_length = None
+        for pos, btype in _blockette_layout(buf, order, offset):
+            pos += offset
+            if btype == 1000:
+                record_length = 2 ** buf[pos + 6]
+            elif btype == 100:
+                rate = struct.unpack_from(order + "f", buf, pos + 4)[0]
+            elif btype == 1001:
+                start += struct.unpack_from("b", buf, pos + 5)[0] / 1e6
+        if not record_length:
+            return None
+        codes.append(bytes(buf[offset + 8:offset + 20]))
+        starts.append(start)
+        nsamples.append(npts)
+        rates.append(rate)
+        offset += record_length
+    return (
+        np.array(codes, dtype="S12"),
+        np.array(starts, dtype=np.float64),
+        np.array(nsamples, dtype=np.int64),
+        np.array(rates, dtype=np.float64),
+    )
+
+
+def _scan_with_obspy(path):
+    from obspy import read
+
+    codes, starts, nsamples, rates = [], [], [], []
+    for tr in read(path, headonly=True):
+        s = tr.stats
+        codes.append(
+            f"{s.station:<5}{s.location:<2}{s.channel:<3}{s.network:<2}"
+            .encode("ascii")
+        )
+        starts.append(s.starttime.timestamp)
+        nsamples.append(s.npts)
+        rates.append(float(s.sampling_rate))
+    return (
+        np.array(codes, dtype="S12"),
+        np.array(starts, dtype=np.float64),
+        np.array(nsamples, dtype=np.int64),
+        np.array(rates, dtype=np.float64),
+    )
+
+
+def _summarize(codes, starts, nsamples, rates):
+    summaries = []
+    if not len(codes):
+        return summaries
+    order = np.lexsort((starts, codes))
+    codes, starts = codes[order], starts[order]
+    nsamples, rates = nsamples[order], rates[order]
+    boundaries = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+
+    for idx in np.split(np.arange(len(codes)), boundaries):
+        start, rate, npts = starts[idx], rates[idx], nsamples[idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            period = np.where(rate > 0, 1.0 / rate, 0.0)
+        end = np.maximum.accumulate(start + np.maximum(npts - 1, 0) * period)
+        delta = start[1:] - end[:-1] - period[1:]
+        tolerance = 0.5 * period[1:]
+        timed = rate[1:] > 0
+        # Records of overlapping traces interleave once sorted, so each run
+        # of overlapping records counts as one overlap
+        overlapping = np.concatenate(([False], timed & (delta < -tolerance)))
+        code = codes[idx[0]].decode("ascii", "replace").ljust(12)
+        summaries.append(
+            {
+                "network": code[10:12].strip(),
+                "station": code[0:5].strip(),
+                "location": code[5:7].strip(),
+                "channel": code[7:10].strip(),
+                "sample_rate": float(rate[0]),
+                "starttime": UTCDateTime(start[0]),
+                "endtime": UTCDateTime(end[-1]),
+                "records": len(idx),
+                "samples": int(npts.sum()),
+                "gaps": int(np.count_nonzero(timed & (delta > tolerance))),
+                "overlaps": int(
+                    np.count_nonzero(overlapping[1:] & ~overlapping[:-1])
+                ),
+            }
+        )
+    return sorted(
+        summaries,
+        key=lambda s: (
+            s["network"], s["station"], s["location"], s["channel"]
+        ),
+    )
+
+
+def scan_mseed(path):
+    # Reads only fixed record headers and blockettes 1000/100/1001 without
+    # decoding any samples and returns one summary dict per stream. Files
+    # the header scanner cannot walk (e.g. miniSEED 3) fall back to ObsPy's
+    # header-only reader.
+    with open(path, "rb") as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return []
+        try:
+            records = None
+            order = (
+                _byte_order(buf) if len(buf) >= FIXED_HEADER_SIZE else None
+            )
+            if order:
+                records = _scan_fixed_length(buf, order)
+                if records is None:
+                    records = _scan_record_by_record(buf, order)
+            if records is not None:
+                records = tuple(np.array(a) for a in records)
+        finally:
+            buf.close()
+    if records is None:
+        records = _scan_with_obspy(path)
+    return _summarize(*records)
+
+
+SDS_FILENAME = re.compile(
+    r"^(?P<net>[^.]*)\.(?P<sta>[^.]*)\.(?P<loc>[^.]*)\.(?P<cha>[^.]*)\."
+    r"(?P<type>[A-Z])\.(?P<year>\d{4})\.(?P<doy>\d{3})$"
+)
+
+
+def _archive_files(root):
+    # SDS day files of one stream only need their first and last file read to
+    # learn the stream's span; anything else is scanned completely.
+    sds_files = {}
+    other_files = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            match = SDS_FILENAME.match(name)
+            if match:
+                key = match.group("net", "sta", "loc", "cha")
+                day = (int(match.group("year")), int(match.group("doy")))
+                sds_files.setdefault(key, []).append((day, path))
+            elif name.lower().endswith(MSEED_EXTENSIONS):
+                other_files.append(path)
+
+    paths = set(other_files)
+    for files in sds_files.values():
+        files.sort()
+        paths.add(files[0][1])
+        paths.add(files[-1][1])
+    return sorted(paths)
+
+
+def _merge_stream_rows(summaries):
+    rows = {}
+    for summary in summaries:
+        key = (
+            summary["network"], summary["station"],
+            summary["location"], summary["channel"],
+        )
+        row = rows.get(key)
+        if row is None:
+            rows[key] = {
+                "network": summary["network"],
+                "station": summary["station"],
+                "location": summary["location"],
+                "channel": summary["channel"],
+                "sample_rate": summary["sample_rate"],
+                "starttime": summary["starttime"],
+                "endtime": summary["endtime"],
+            }
+            continue
+        if summary["endtime"] > row["endtime"]:
+            row["endtime"] = summary["endtime"]
+            row["sample_rate"] = summary["sample_rate"]
+        row["starttime"] = min(row["starttime"], summary["starttime"])
+    return [rows[key] for key in sorted(rows)]
+
+
+def scan_mseed_archive(root, max_workers=None, progress=None):
+    # Header-only scan of an SDS tree or any directory of MiniSEED files.
+    # Returns one row per stream with its sample rate and first/last time,
+    # plus a list of (path, error) for files that could not be read.
+    paths = _archive_files(root)
+    summaries, errors = [], []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(scan_mseed, path): path for path in paths}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                summaries.extend(future.result())
+            except Exception as e:
+                errors.append((futures[future], e))
+            if progress is not None and progress(done, len(paths)) is False:
+                for pending in futures:
+                    pending.cancel()
+                break
+    return _merge_stream_rows(summaries), errors
@@ -0,0 +1,184 @@
+# core/plot_export.py
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from SRM_core.diff import index_response
+
+FORMATS = ("png", "svg")
+# Below this many distinct responses a process pool costs more than it saves
+PARALLEL_THRESHOLD = 4
+PLOT_FREQUENCIES = (-2, 2, 1000)
+
+
+def draw_response(ax_amp, ax_phase, response):
+    # The amplitude and phase plot shown by the response tab
+    try:
+        freq = np.logspace(*PLOT_FREQUENCIES)
+        h = response.get_evalresp_response_for_frequencies(
+            freq, output="DEF"
+        )
+
+        amp = np.abs(h)
+        phase = np.angle(h, deg=True)
+
+        ax_amp.plot(freq, amp, color="royalblue", label="Amplitude")
+        ax_amp.set_title("Amplitude Response")
+        ax_amp.set_ylabel("Amplitude")
+        ax_amp.set_xscale("log")
+        ax_amp.set_yscale("log")
+        ax_amp.legend()
+
+        ax_phase.plot(freq, phase, color="seagreen", label="Phase")
+        ax_phase.set_title("Phase Response")
+        ax_phase.set_xlabel("Frequency [Hz]")
+        ax_phase.set_ylabel("Phase [°]")
+        ax_phase.set_xscale("log")
+        ax_phase.legend()
+        return None
+    except Exception as e:
+        ax_amp.text(0.5, 0.5, f"Error plotting: {e}", ha="center")
+        ax_phase.text(0.5, 0.5, f"Error plotting: {e}", ha="center")
+        return str(e)
+
+
+def render_response(response, path):
+    # Runs in a worker process; the Agg canvas needs no display. Returns
+    # the error message if the response could not be evaluated.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 6), dpi=100)
+    FigureCanvasAgg(fig)
+    ax_amp = fig.add_subplot(211)
+    ax_phase = fig.add_subplot(212, sharex=ax_amp)
+    error = draw_response(ax_amp, ax_phase, response)
+    fig.tight_layout()
+    fig.savefig(path)
+    return error
+
+
+def fingerprint(response, cache):
+    # Equal responses have equal fingerprints, whichever objects hold them
+    return index_response(response, cache)["hash"].hex()
+
+
+def _summary(response):
+    sens = response.instrument_sensitivity
+    if sens is None:
+        return None, None, None
+    return sens.value, sens.frequency, sens.input_units
+
+
+def export_plots(channels, folder, fmt="png", max_workers=None,
+                 progress=None):
+    # channels: (filepath, seed_id, channel) as from iter_channels. Every
+    # distinct response is plotted once into folder, in worker processes
+    # when there are several; index.html lists all channels with their
+    # plot. progress(done, total) may return False to stop. Returns the
+    # index path, the number of plots written and a list of
+    # (fingerprint, error).
+    os.makedirs(folder, exist_ok=True)
+    cache, plots, rows = {}, {}, []
+    for filepath, seed_id, chan in channels:
+        key = None
+        if chan.response is not None:
+            key = fingerprint(chan.response, cache)
+            plots.setdefault(key, chan.response)
+        rows.append((filepath, seed_id, chan, key))
+
+    def target(key):
+        return os.path.join(folder, f"response_{key[:16]}.{fmt}")
+
+    rendered, errors = set(), []
+
+    def collect(key, error):
+        rendered.add(key)
+        if error is not None:
+            errors.append((key, error))
+
+    total = len(plots)
+    if total >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(render_response, resp, target(key)): key
+                for key, resp in plots.items()
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                key = futures[future]
+                try:
+                    collect(key, future.result())
+                except Exception as e:
+                    collect(key, str(e))
+                if progress is not None and progress(done, total) is False:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+    else:
+        for done, (key, resp) in enumerate(plots.items(), start=1):
+            try:
+                collect(key, render_response(resp, target(key)))
+            except Exception as e:
+                collect(key, str(e))
+            if progress is not None and progress(done, total) is False:
+                break
+
+    index = os.path.join(folder, "index.html")
+    with open(index, "w", encoding="utf-8") as f:
+        failed = {key for key, _ in errors}
+        f.write(_index_html(rows, target, rendered, failed, folder))
+    return index, len(rendered), errors
+
+
+def _cell(value):
+    return f"<td>{html.escape('' if value is None else str(value))}</td>"
+
+
+def _index_html(rows, target, rendered, failed, folder):
+    cells = (
+        "File", "Channel", "Start", "End", "Sensitivity", "Frequency [Hz]",
+        "Input Units", "Stages", "Plot",
+    )
+    lines = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset=\"utf-8\">",
+        "<title>Response Plots</title>",
+        "<style>table{border-collapse:collapse}"
+        "td,th{border:1px solid #ccc;padding:2px 6px}"
+        "tr.failed{background:#fdd}</style>",
+        "</head><body>",
+        "<h1>Response Plots</h1>",
+        f"<p>{len(rows)} channels, "
+        f"{len({r[3] for r in rows if r[3]})} distinct responses</p>",
+        "<table>",
+        "<tr>" + "".join(f"<th>{c}</th>" for c in cells) + "</tr>",
+    ]
+    for filepath, seed_id, chan, key in rows:
+        if key is None:
+            value = frequency = units = None
+            stages = 0
+            plot = "no response"
+        else:
+            value, frequency, units = _summary(chan.response)
+            stages = len(chan.response.response_stages)
+        if key is not None and key not in rendered:
+            plot = "not exported"
+        elif key is not None:
+            name = os.path.relpath(target(key), folder)
+            plot = f"<a href=\"{html.escape(name)}\">{key[:12]}</a>"
+            if key in failed:
+                plot += " (failed)"
+        values = (
+            os.path.basename(filepath), seed_id, chan.start_date,
+            chan.end_date, value, frequency, units, stages,
+        )
+        row_class = " class=\"failed\"" if key in failed else ""
+        lines.append(
+            f"<tr{row_class}>"
+            + "".join(_cell(v) for v in values)
+            + f"<td>{plot}</td></tr>"
+        )
+    lines += ["</table>", "</body></html>", ""]
+    return "\n".join(lines)
@@ -0,0 +1,243 @@
+# core/project.py
+import copy
+import fnmatch
+import hashlib
+import json
+import os
+import pickle
+import re
+
+from obspy import Inventory, UTCDateTime
+
+from SRM_core.inventory_io import read_inventory_files
+from SRM_core.stationxml import write_stationxml
+
+EXTENSION = ".srmproj"
+MANIFEST = "manifest.json"
+NETWORK_SHARD = "network.xml"
+
+
+def is_project(path):
+    return path.endswith(EXTENSION)
+
+
+def digest(obj):
+    # Cheap fingerprint of an ObsPy object; about ten times faster than
+    # writing it as StationXML
+    return hashlib.sha1(
+        pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    ).hexdigest()
+
+
+def _shell(network):
+    shell = copy.copy(network)
+    shell.stations = []
+    return shell
+
+
+def _name(code, start, used):
+    # File name for a network folder or station shard, unique in used
+    base = re.sub(r"[^A-Za-z0-9_-]", "_", code or "_")
+    if start is not None:
+        base += "_" + start.strftime("%Y%m%d")
+    name, number = base, 1
+    while name in used:
+        number += 1
+        name = f"{base}_{number}"
+    used.add(name)
+    return name
+
+
+class ShardedProject:
+    # A directory with one small StationXML file per station, one per
+    # network holding the network without its stations, and a manifest
+    # keeping their order and a digest of each. Stations can be loaded
+    # selectively, and saving writes only the shards whose digest changed.
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        # id() of loaded networks and stations -> their manifest entries,
+        # and the id() of every loaded entry
+        self.entries = {}
+        self.loaded = set()
+
+    @classmethod
+    def create(cls, path, inventory):
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, MANIFEST)):
+            raise FileExistsError(f"{path} already holds a project.")
+        manifest = {
+            "format": 1,
+            "inventory": {
+                "source": inventory.source,
+                "sender": inventory.sender,
+                "module": inventory.module,
+                "module_uri": inventory.module_uri,
+                "created": str(inventory.created),
+            },
+            "networks": [],
+        }
+        with open(os.path.join(path, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        project = cls(path)
+        project.save(inventory)
+        return project
+
+    def _inventory(self, networks):
+        header = self.manifest["inventory"]
+        inventory = Inventory(networks=networks, source=header["source"])
+        inventory.sender = header["sender"]
+        inventory.module = header["module"]
+        inventory.module_uri = header["module_uri"]
+        inventory.created = UTCDateTime(header["created"])
+        return inventory
+
+    def station_count(self):
+        return sum(len(n["stations"]) for n in self.manifest["networks"])
+
+    def load(self, pattern="*", max_workers=None, progress=None):
+        # Reads the network shards and the station shards whose NET.STA
+        # matches the wildcard pattern
+        pattern = pattern.upper()
+        wanted = []
+        for net in self.manifest["networks"]:
+            stations = [
+                sta
+                for sta in net["stations"]
+                if fnmatch.fnmatchcase(
+                    f"{net['code']}.{sta['code']}".upper(), pattern
+                )
+            ]
+            if stations or fnmatch.fnmatchcase(net["code"].upper(), pattern):
+                wanted.append((net, stations))
+        paths = [
+            os.path.join(self.path, net["folder"], shard)
+            for net, stations in wanted
+            for shard in [NETWORK_SHARD] + [s["shard"] for s in stations]
+        ]
+        read, errors = read_inventory_files(paths, max_workers, progress)
+        if errors:
+            path, e = errors[0]
+            raise ValueError(f"Failed to read {path}: {e}")
+
+        self.entries = {}
+        self.loaded = set()
+        networks = []
+        for net, stations in wanted:
+            folder = os.path.join(self.path, net["folder"])
+            # Digests are taken again as read, so that the next save only
+            # writes what was edited after loading
+            network = read[os.path.join(folder, NETWORK_SHARD)][0]
+            net["digest"] = digest(network)
+            self._track(network, net)
+            for sta in stations:
+                station = read[os.path.join(folder, sta["shard"])][0][0]
+                sta["digest"] = digest(station)
+                network.stations.append(station)
+                self._track(station, sta)
+            networks.append(network)
+        return self._inventory(networks)
+
+    def save(self, inventory):
+        # Writes the shards of new and changed networks and stations and
+        # deletes those of loaded ones that were removed. Networks and
+        # stations that were not loaded are kept as they are. Returns the
+        # number of shards written.
+        written = 0
+        saved = []
+        folders = {n["folder"] for n in self.manifest["networks"]}
+        for network in inventory.networks:
+            net = self.entries.get(id(network))
+            if net is None:
+                net = {
+                    "code": network.code,
+                    "folder": _name(network.code, network.start_date, folders),
+                    "digest": None,
+                    "stations": [],
+                }
+                os.makedirs(os.path.join(self.path, net["folder"]))
+                self._track(network, net)
+            folder = os.path.join(self.path, net["folder"])
+            shell = _shell(network)
+            net["code"] = network.code
+            if self._changed(shell, net):
+                write_stationxml(
+                    self._inventory([shell]),
+                    os.path.join(folder, NETWORK_SHARD),
+                    level="network",
+                )
+                written += 1
+
+            shards = {os.path.splitext(s["shard"])[0] for s in net["stations"]}
+            shards.add(os.path.splitext(NETWORK_SHARD)[0])
+            stations = []
+            for station in network.stations:
+                sta = self.entries.get(id(station))
+                if sta is None:
+                    shard = _name(station.code, station.start_date, shards)
+                    sta = {"shard": shard + ".xml", "digest": None}
+                    self._track(station, sta)
+                sta["code"] = station.code
+                stations.append(sta)
+                if self._changed(station, sta):
+                    shell.stations = [station]
+                    write_stationxml(
+                        self._inventory([shell]),
+                        os.path.join(folder, sta["shard"]),
+                    )
+                    shell.stations = []
+                    written += 1
+            net["stations"] = self._keep(net, stations)
+            saved.append(net)
+
+        kept = []
+        saved_ids = {id(net) for net in saved}
+        for net in self.manifest["networks"]:
+            if id(net) in saved_ids:
+                continue
+            if id(net) in self.loaded:
+                net["stations"] = self._keep(net, [])
+                if not net["stations"]:
+                    folder = os.path.join(self.path, net["folder"])
+                    os.remove(os.path.join(folder, NETWORK_SHARD))
+                    if not os.listdir(folder):
+                        os.rmdir(folder)
+                    continue
+            kept.append(net)
+        self.manifest["networks"] = kept + saved
+        self._write_manifest()
+        return written
+
+    def _track(self, obj, entry):
+        self.entries[id(obj)] = entry
+        self.loaded.add(id(entry))
+
+    def _changed(self, obj, entry):
+        new = digest(obj)
+        if new == entry["digest"]:
+            return False
+        entry["digest"] = new
+        return True
+
+    def _keep(self, net, stations):
+        # Stations of net that were not loaded, then the saved ones; shards
+        # of loaded stations that are no longer there are deleted
+        current = {id(sta) for sta in stations}
+        unloaded = []
+        for sta in net["stations"]:
+            if id(sta) not in self.loaded:
+                unloaded.append(sta)
+            elif id(sta) not in current:
+                os.remove(os.path.join(self.path, net["folder"], sta["shard"]))
+        return unloaded + stations
+
+    def _write_manifest(self):
+        path = os.path.join(self.path, MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def export(self, path, progress=None):
+        # One StationXML file with every network and station of the project
+        write_stationxml(self.load(progress=progress), path)
@@ -0,0 +1,177 @@
+# core/residency.py
+import os
+import pickle
+import tempfile
+import time
+
+from SRM_core.inventory_io import read_inventory_file
+
+# ObsPy objects take about nine times the size of their pickle in memory
+OBJECT_OVERHEAD = 9
+# Stations packed to measure a resident inventory
+MEASURED_STATIONS = 64
+
+
+def pack(inventory):
+    return pickle.dumps(inventory, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def estimate_size(data):
+    # Resident bytes of the inventory that was packed into data
+    return len(data) * OBJECT_OVERHEAD
+
+
+def measure(inventory, sample=MEASURED_STATIONS):
+    # estimate_size() of the inventory from an even sample of its stations,
+    # scaled by their share of all stations and channels
+    stations = [sta for net in inventory.networks for sta in net.stations]
+    if len(stations) <= sample:
+        return estimate_size(pack(inventory))
+    step = len(stations) / sample
+    picked = [stations[int(i * step)] for i in range(sample)]
+
+    def weight(items):
+        return sum(len(sta.channels) + 1 for sta in items)
+
+    return estimate_size(pack(picked)) * weight(stations) // weight(picked)
+
+
+class LoadedFiles(dict):
+    # path -> inventory of the loaded files. A file can be hibernated: its
+    # inventory is pickled to a cache file and dropped, and read back, from
+    # the cache or else from the file itself, the next time the file is
+    # accessed; on_wake(path, inventory) is called then. Accessing one file
+    # marks it as used, iterating over all of them does not. Cache files
+    # are pickles written by this process only.
+    def __init__(self):
+        super().__init__()
+        self.on_wake = None
+        # Estimated bytes of resident inventories that were measured, and
+        # the time of the last access of every file
+        self.sizes = {}
+        self.used = {}
+        # Hibernated path -> its cache file, or None to read the file
+        self.cache = {}
+        self._cache_dir = None
+
+    def __setitem__(self, path, inventory):
+        self._drop(path)
+        self.sizes.pop(path, None)
+        self.used[path] = time.monotonic()
+        super().__setitem__(path, inventory)
+
+    def __getitem__(self, path):
+        inventory = self._resident(path)
+        self.used[path] = time.monotonic()
+        return inventory
+
+    def __delitem__(self, path):
+        self._drop(path)
+        self.sizes.pop(path, None)
+        self.used.pop(path, None)
+        super().__delitem__(path)
+
+    def get(self, path, default=None):
+        return self[path] if path in self else default
+
+    def pop(self, path, *default):
+        if path not in self:
+            return super().pop(path, *default)
+        inventory = self._resident(path)
+        del self[path]
+        return inventory
+
+    def values(self):
+        return [self._resident(path) for path in self]
+
+    def items(self):
+        return [(path, self._resident(path)) for path in self]
+
+    def clear(self):
+        for path in list(self.cache):
+            self._drop(path)
+        self.sizes.clear()
+        self.used.clear()
+        super().clear()
+
+    def peek(self, path):
+        # The inventory if it is resident, else None; nothing is read
+        return super().get(path)
+
+    def resident(self):
+        return [
+            (path, inventory)
+            for path, inventory in super().items()
+            if inventory is not None
+        ]
+
+    def is_hibernated(self, path):
+        return path in self.cache
+
+    def rename(self, old, new):
+        # Keeps the order of the files and the state of hibernated ones
+        entries = list(super().items())
+        super().clear()
+        for path, inventory in entries:
+            super().__setitem__(new if path == old else path, inventory)
+        for state in (self.sizes, self.used, self.cache):
+            if old in state:
+                state[new] = state.pop(old)
+
+    def least_recently_used(self):
+        return sorted(
+            (path for path, _ in self.resident()),
+            key=lambda path: self.used.get(path, 0),
+        )
+
+    def hibernate(self, path, data):
+        # data: pack() of the inventory of path, as it is now
+        if self._cache_dir is None:
+            self._cache_dir = tempfile.TemporaryDirectory(prefix="srm-")
+        fd, cache_file = tempfile.mkstemp(
+            suffix=".pickle", dir=self._cache_dir.name
+        )
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.cache[path] = cache_file
+        self.sizes.pop(path, None)
+        super().__setitem__(path, None)
+
+    def invalidate(self, path):
+        # The file of a hibernated path changed; it is read again on waking
+        if path in self.cache:
+            self._drop(path)
+            self.cache[path] = None
+
+    def _resident(self, path):
+        inventory = super().__getitem__(path)
+        if inventory is None and path in self.cache:
+            inventory = self._wake(path)
+        return inventory
+
+    def _wake(self, path):
+        cache_file = self.cache[path]
+        inventory = None
+        if cache_file is not None:
+            try:
+                with open(cache_file, "rb") as f:
+                    data = f.read()
+                inventory = pickle.loads(data)
+                self.sizes[path] = estimate_size(data)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                inventory = None
+        if inventory is None:
+            inventory = read_inventory_file(path)
+        self._drop(path)
+        super().__setitem__(path, inventory)
+        if self.on_wake is not None:
+            self.on_wake(path, inventory)
+        return inventory
+
+    def _drop(self, path):
+        cache_file = self.cache.pop(path, None)
+        if cache_file is not None:
+            try:
+                os.remove(cache_file)
+            except OSError:
+                pass
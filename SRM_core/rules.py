@@ -0,0 +1,438 @@
+# core/rules.py
+import math
+from collections import Counter, namedtuple
+
+from SRM_core.epochs import overlapping_pairs
+from SRM_core.validation import (
+    DEFAULT_TOLERANCE,
+    stage_gain_products,
+    _check_units,
+    _check_decimation,
+)
+
+# level: the kind of object a rule is evaluated for
+# reads: the objects of its context the result depends on; editing any of
+#        them (or a stage/sensitivity of a read response) re-runs the rule.
+#        "stations" and "channels" stand for all children of the network or
+#        station.
+# fields: the attributes it reads, so edits of other fields can skip it;
+#         None for rules that have to run on every edit
+Rule = namedtuple("Rule", "name level reads check fields", defaults=(None,))
+EPOCH = ("start_date", "end_date")
+
+LEVELS = ("network", "station", "channel")
+CHILDREN = {"stations": "network", "channels": "station"}
+MAX_CHANNEL_OFFSET_KM = 1.0
+
+
+def _network_code(ctx, tolerance):
+    code = ctx["network"].code or ""
+    if not 1 <= len(code) <= 2:
+        return [("error", "Network code must have 1-2 characters.")]
+    return []
+
+
+def _station_code(ctx, tolerance):
+    code = ctx["station"].code or ""
+    if not 1 <= len(code) <= 5:
+        return [("error", "Station code must have 1-5 characters.")]
+    return []
+
+
+def _channel_offset(ctx, tolerance):
+    chan, sta = ctx["channel"], ctx["station"]
+    if None in (chan.latitude, chan.longitude, sta.latitude, sta.longitude):
+        return [("error", "Coordinates are missing.")]
+    dlat = math.radians(chan.latitude - sta.latitude)
+    dlon = math.radians(chan.longitude - sta.longitude) * math.cos(
+        math.radians(sta.latitude)
+    )
+    distance = 6371.0 * math.hypot(dlat, dlon)
+    if distance > MAX_CHANNEL_OFFSET_KM:
+        return [
+            (
+                "warning",
+                f"Channel is {distance:.1f} km away from its station.",
+            )
+        ]
+    return []
+
+
+def _epoch(obj):
+    if obj.start_date and obj.end_date and obj.end_date <= obj.start_date:
+        return [("error", "End date must be after the start date.")]
+    return []
+
+
+def _station_epoch(ctx, tolerance):
+    return _epoch(ctx["station"])
+
+
+def _format_start(obj):
+    return str(obj.start_date.date) if obj.start_date else "the beginning"
+
+
+def _overlapping(children, key, label):
+    return [
+        (
+            "error",
+            f"{label(a)} epochs starting {_format_start(a)} and "
+            f"{_format_start(b)} overlap.",
+        )
+        for a, b in overlapping_pairs(children, key)
+    ]
+
+
+def _station_overlap(ctx, tolerance):
+    return _overlapping(
+        ctx["network"].stations,
+        lambda sta: sta.code,
+        lambda sta: f"Station {sta.code}",
+    )
+
+
+def _channel_overlap(ctx, tolerance):
+    return _overlapping(
+        ctx["station"].channels,
+        lambda chan: (chan.location_code, chan.code),
+        lambda chan: f"Channel {chan.location_code}.{chan.code}",
+    )
+
+
+def _channel_codes(ctx, tolerance):
+    chan = ctx["channel"]
+    issues = []
+    if len(chan.code or "") != 3:
+        issues.append(("error", "Channel code must have 3 characters."))
+    if len(chan.location_code or "") > 2:
+        issues.append(
+            ("error", "Location code must have at most 2 characters.")
+        )
+    return issues
+
+
+def _sample_rate(ctx, tolerance):
+    if not ctx["channel"].sample_rate or ctx["channel"].sample_rate < 0:
+        return [("warning", "Sample rate is missing.")]
+    return []
+
+
+def _channel_epoch(ctx, tolerance):
+    chan, sta = ctx["channel"], ctx["station"]
+    issues = _epoch(chan)
+    if sta.start_date and chan.start_date and chan.start_date < sta.start_date:
+        issues.append(("warning", "Channel starts before its station."))
+    if sta.end_date and (not chan.end_date or chan.end_date > sta.end_date):
+        issues.append(("warning", "Channel ends after its station."))
+    return issues
+
+
+def _response_present(ctx, tolerance):
+    if ctx["response"] is None:
+        return [("error", "Channel has no response.")]
+    return []
+
+
+def _sensitivity(ctx, tolerance):
+    resp = ctx["response"]
+    sens = resp.instrument_sensitivity
+    if sens is None or sens.value is None:
+        return [("error", "Instrument sensitivity is missing.")]
+    product = stage_gain_products([resp])[0]
+    if math.isnan(product):
+        return [("error", "At least one stage has no gain.")]
+    if not math.isclose(sens.value, product, rel_tol=tolerance):
+        return [
+            (
+                "error",
+                f"Sensitivity {sens.value:g} does not match the product "
+                f"of stage gains {product:g}.",
+            )
+        ]
+    return []
+
+
+def _unit_chain(ctx, tolerance):
+    return [
+        (i["severity"], i["message"]) for i in _check_units(ctx["response"])
+    ]
+
+
+def _decimation(ctx, tolerance):
+    issues, _ = _check_decimation(ctx["response"])
+    return [(i["severity"], i["message"]) for i in issues]
+
+
+def _decimated_rate(ctx, tolerance):
+    chan = ctx["channel"]
+    _, rate = _check_decimation(ctx["response"])
+    if (
+        rate is not None
+        and chan.sample_rate
+        and not math.isclose(rate, chan.sample_rate, rel_tol=1e-6)
+    ):
+        return [
+            (
+                "warning",
+                f"Response decimates to {rate:g} Hz but the channel "
+                f"samples at {chan.sample_rate:g} Hz.",
+            )
+        ]
+    return []
+
+
+RULES = (
+    Rule("network code", "network", ("network",), _network_code, ("code",)),
+    Rule(
+        "epoch overlap",
+        "network",
+        ("stations",),
+        _station_overlap,
+        ("code",) + EPOCH,
+    ),
+    Rule("station code", "station", ("station",), _station_code, ("code",)),
+    Rule("epoch", "station", ("station",), _station_epoch, EPOCH),
+    Rule(
+        "epoch overlap",
+        "station",
+        ("channels",),
+        _channel_overlap,
+        ("code", "location_code") + EPOCH,
+    ),
+    Rule(
+        "codes",
+        "channel",
+        ("channel",),
+        _channel_codes,
+        ("code", "location_code"),
+    ),
+    Rule(
+        "location",
+        "channel",
+        ("channel", "station"),
+        _channel_offset,
+        ("latitude", "longitude"),
+    ),
+    Rule(
+        "sample rate", "channel", ("channel",), _sample_rate, ("sample_rate",)
+    ),
+    Rule("epoch", "channel", ("channel", "station"), _channel_epoch, EPOCH),
+    Rule(
+        "response", "channel", ("channel",), _response_present, ("response",)
+    ),
+    # Response rules read the channel only to notice a replaced response
+    Rule(
+        "sensitivity", "response", ("response",), _sensitivity, ("response",)
+    ),
+    Rule("unit chain", "response", ("response",), _unit_chain, ("response",)),
+    Rule("decimation", "response", ("response",), _decimation, ("response",)),
+    Rule(
+        "decimated rate",
+        "response",
+        ("channel", "response"),
+        _decimated_rate,
+        ("sample_rate", "response"),
+    ),
+)
+
+
+class RuleEngine:
+    # Results are kept per (rule, subject). Every evaluation records the ids
+    # of the objects it read, so an edit only re-runs the rules depending on
+    # the edited object instead of the whole inventory. Response rules run on
+    # the channel's current response; results of rules that only read the
+    # response are shared between all channels using it.
+    def __init__(self, rules=RULES, tolerance=DEFAULT_TOLERANCE):
+        self.rules = rules
+        self.tolerance = tolerance
+        self.subjects = {}
+        self.results = {}
+        self.dependencies = {}
+        self.dependents = {}
+        self.counts = Counter()
+        self._response_cache = {}
+
+    def clear(self):
+        self.subjects.clear()
+        self.results.clear()
+        self.dependencies.clear()
+        self.dependents.clear()
+        self.counts.clear()
+        self._response_cache.clear()
+
+    def add_inventory(self, filepath, inventory):
+        # Returns the keys of all evaluations that were removed or added
+        keys = self.remove_inventory(filepath)
+        for net in inventory.networks:
+            keys.extend(self._register(filepath, (net,)))
+            for sta in net.stations:
+                keys.extend(self._register(filepath, (net, sta)))
+                for chan in sta.channels:
+                    keys.extend(self._register(filepath, (net, sta, chan)))
+        for key in keys:
+            if key[1] in self.subjects:
+                self._evaluate(key)
+        return keys
+
+    def remove_inventory(self, filepath):
+        removed = []
+        for subject_id, (path_file, path) in list(self.subjects.items()):
+            if path_file != filepath:
+                continue
+            response = getattr(path[-1], "response", None)
+            if response is not None:
+                # The cache would keep the responses alive
+                for rule in self.rules:
+                    self._response_cache.pop((rule, id(response)), None)
+            for rule in self.rules:
+                key = (rule, subject_id)
+                if key in self.results:
+                    self._store(key, [])
+                    self._set_dependencies(key, set())
+                    del self.results[key]
+                    removed.append(key)
+            del self.subjects[subject_id]
+        self.counts.pop(filepath, None)
+        return removed
+
+    def _register(self, filepath, path):
+        level = LEVELS[len(path) - 1]
+        self.subjects[id(path[-1])] = (filepath, path)
+        return [
+            (rule, id(path[-1]))
+            for rule in self.rules
+            if rule.level == level
+            or (level == "channel" and rule.level == "response")
+        ]
+
+    def files_of(self, *objects):
+        # The files holding the objects, or the subjects reading them
+        files = set()
+        for obj in objects:
+            if id(obj) in self.subjects:
+                files.add(self.subjects[id(obj)][0])
+            for _, subject_id in self.dependents.get(id(obj), ()):
+                files.add(self.subjects[subject_id][0])
+        return files
+
+    def touch(self, *objects, fields=None):
+        # Re-runs the rules that read any of the objects, each rule once,
+        # and returns the keys whose issues changed. With fields, only rules
+        # reading one of those attributes run.
+        keys = set()
+        for obj in objects:
+            keys.update(self.dependents.get(id(obj), ()))
+        if fields is not None:
+            fields = set(fields)
+            keys = {
+                key
+                for key in keys
+                if key[0].fields is None or fields.intersection(key[0].fields)
+            }
+        for key in keys:
+            if key[0].level == "response":
+                _, path = self.subjects[key[1]]
+                self._response_cache.pop(
+                    (key[0], id(path[-1].response)), None
+                )
+        changed = []
+        for key in keys:
+            old = self.results.get(key, [])
+            if self._evaluate(key) != old:
+                changed.append(key)
+        return changed
+
+    def _evaluate(self, key):
+        rule, subject_id = key
+        filepath, path = self.subjects[subject_id]
+        ctx = dict(zip(LEVELS, path))
+        ctx["response"] = (
+            ctx["channel"].response if "channel" in ctx else None
+        )
+
+        if rule.level == "response" and ctx["response"] is None:
+            issues = []
+        elif rule.level == "response" and rule.reads == ("response",):
+            cache_key = (rule, id(ctx["response"]))
+            cached = self._response_cache.get(cache_key)
+            if cached is None or cached[0] is not ctx["response"]:
+                cached = (
+                    ctx["response"],
+                    self._run(rule, ctx),
+                )
+                self._response_cache[cache_key] = cached
+            issues = cached[1]
+        else:
+            issues = self._run(rule, ctx)
+
+        dependencies = set()
+        for level in rule.reads:
+            if level in CHILDREN:
+                parent = ctx[CHILDREN[level]]
+                dependencies.update(id(c) for c in getattr(parent, level))
+                continue
+            obj = ctx.get(level)
+            if obj is None:
+                continue
+            dependencies.add(id(obj))
+            if level == "response":
+                dependencies.update(id(s) for s in obj.response_stages)
+                if obj.instrument_sensitivity is not None:
+                    dependencies.add(id(obj.instrument_sensitivity))
+        # A channel whose response is replaced has to be re-evaluated too
+        if rule.level == "response":
+            dependencies.add(id(ctx["channel"]))
+        self._set_dependencies(key, dependencies)
+        self._store(key, issues)
+        return issues
+
+    def _run(self, rule, ctx):
+        try:
+            return rule.check(ctx, self.tolerance)
+        except Exception as e:
+            return [("error", f"Check failed: {e}")]
+
+    def _set_dependencies(self, key, dependencies):
+        old = self.dependencies.get(key, set())
+        for obj_id in old - dependencies:
+            keys = self.dependents.get(obj_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.dependents[obj_id]
+        for obj_id in dependencies - old:
+            self.dependents.setdefault(obj_id, set()).add(key)
+        if dependencies:
+            self.dependencies[key] = dependencies
+        else:
+            self.dependencies.pop(key, None)
+
+    def _store(self, key, issues):
+        diff = len(issues) - len(self.results.get(key, []))
+        self.results[key] = issues
+        if diff:
+            filepath, path = self.subjects[key[1]]
+            self.counts[filepath] += diff
+            for obj in path:
+                self.counts[id(obj)] += diff
+
+    def issues_for(self, key):
+        rule, _ = key
+        _, path = self.subjects[key[1]]
+        label = ".".join(
+            [path[0].code]
+            + [obj.code for obj in path[1:2]]
+            + [f"{obj.location_code}.{obj.code}" for obj in path[2:]]
+        )
+        return [
+            {
+                "label": label,
+                "rule": rule.name,
+                "severity": severity,
+                "message": message,
+            }
+            for severity, message in self.results.get(key, [])
+        ]
+
+    def problem_keys(self):
+        return [key for key, issues in self.results.items() if issues]
@@ -0,0 +1,267 @@
+# core/search.py
+import fnmatch
+import heapq
+import re
+
+WORD = re.compile(r"[\w\-]+")
+WILDCARDS = "*?["
+# Attributes the tokens are built from
+INDEXED_FIELDS = frozenset(
+    (
+        "code",
+        "location_code",
+        "description",
+        "site",
+        "sensor",
+        "data_logger",
+        "pre_amplifier",
+    )
+)
+
+
+def _words(*texts):
+    words = set()
+    for text in texts:
+        if text:
+            words.update(WORD.findall(str(text).lower()))
+    return words
+
+
+def _equipment_words(equipment):
+    if equipment is None:
+        return set()
+    return _words(
+        equipment.type,
+        equipment.description,
+        equipment.manufacturer,
+        equipment.vendor,
+        equipment.model,
+        equipment.serial_number,
+    )
+
+
+def entry_label(path):
+    net = path[0]
+    if len(path) == 1:
+        return net.code
+    sta = path[1]
+    if len(path) == 2:
+        return f"{net.code}.{sta.code}"
+    chan = path[2]
+    return f"{net.code}.{sta.code}.{chan.location_code}.{chan.code}"
+
+
+def _site_words(station):
+    site = station.site
+    if site is None:
+        return set()
+    return _words(
+        site.name, site.description, site.town, site.county, site.region,
+        site.country,
+    )
+
+
+def entry_tokens(path):
+    obj = path[-1]
+    label = entry_label(path)
+    tokens = {label.lower(), (obj.code or "").lower()}
+    # The codes of the parents too, so "fur hhz" finds GR.FUR..HHZ
+    tokens.update((parent.code or "").lower() for parent in path[:-1])
+    tokens |= _words(obj.description)
+    # Channels inherit their station's site so "bavaria hhz" finds them
+    if len(path) >= 2:
+        tokens |= _site_words(path[1])
+    if len(path) == 3:
+        tokens.add(f"{obj.location_code}.{obj.code}".lower())
+        if obj.location_code:
+            tokens.add(obj.location_code.lower())
+        tokens |= _equipment_words(obj.sensor)
+        tokens |= _equipment_words(obj.data_logger)
+        tokens |= _equipment_words(obj.pre_amplifier)
+    tokens.discard("")
+    return tokens
+
+
+class SearchIndex:
+    # Networks, stations and channels of all loaded files, indexed by the
+    # lower-cased words and codes describing them. Distinct tokens live in a
+    # character trie for prefix lookups; wildcard patterns use the literal
+    # part before the first wildcard to narrow the candidates.
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.entries = {}
+        self.postings = {}
+        self.trie = {}
+        self.by_file = {}
+
+    def add_inventory(self, filepath, inventory):
+        self.remove_inventory(filepath)
+        ids = self.by_file.setdefault(filepath, set())
+        for net in inventory.networks:
+            self._add(filepath, (net,), ids)
+            for sta in net.stations:
+                self._add(filepath, (net, sta), ids)
+                for chan in sta.channels:
+                    self._add(filepath, (net, sta, chan), ids)
+
+    def remove_inventory(self, filepath):
+        for entry_id in self.by_file.pop(filepath, ()):
+            self._remove(entry_id)
+
+    def retain(self, filepaths):
+        # Drops the entries of every other file
+        filepaths = set(filepaths)
+        if not filepaths:
+            self.clear()
+        for filepath in set(self.by_file) - filepaths:
+            self.remove_inventory(filepath)
+
+    def hibernate(self, filepath):
+        # The objects of the file are dropped, its entries stay searchable
+        # under keys no object id can take and without a path
+        ids = self.by_file.get(filepath, set())
+        dormant = set()
+        for n, entry_id in enumerate(list(ids)):
+            key = f"{filepath}#{n}"
+            entry = self.entries.pop(entry_id)
+            self.entries[key] = dict(entry, path=None)
+            for token in entry["tokens"]:
+                postings = self.postings[token]
+                postings.discard(entry_id)
+                postings.add(key)
+            dormant.add(key)
+        self.by_file[filepath] = dormant
+
+    def update(self, obj):
+        # Codes propagate into the labels of everything below an object
+        entry = self.entries.get(id(obj))
+        if entry is None:
+            return
+        filepath, path = entry["file"], entry["path"]
+        ids = self.by_file.setdefault(filepath, set())
+        paths = [path]
+        if len(path) == 1:
+            for sta in obj.stations:
+                paths.append(path + (sta,))
+                paths.extend(path + (sta, chan) for chan in sta.channels)
+        elif len(path) == 2:
+            paths.extend(path + (chan,) for chan in obj.channels)
+        for sub_path in paths:
+            entry = self.entries.get(id(sub_path[-1]))
+            # Most edits touch fields that are not indexed
+            if (
+                entry is not None
+                and entry["path"] == sub_path
+                and entry["tokens"] == entry_tokens(sub_path)
+            ):
+                continue
+            self._remove(id(sub_path[-1]))
+            self._add(filepath, sub_path, ids)
+
+    def _add(self, filepath, path, ids):
+        entry_id = id(path[-1])
+        tokens = entry_tokens(path)
+        self.entries[entry_id] = {
+            "file": filepath,
+            "path": path,
+            "label": entry_label(path),
+            "kind": ("network", "station", "channel")[len(path) - 1],
+            "tokens": tokens,
+        }
+        ids.add(entry_id)
+        for token in tokens:
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = set()
+                self._insert(token)
+            postings.add(entry_id)
+
+    def _remove(self, entry_id):
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return
+        self.by_file.get(entry["file"], set()).discard(entry_id)
+        for token in entry["tokens"]:
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.discard(entry_id)
+                # Trie nodes are left in place; empty tokens are skipped
+                if not postings:
+                    del self.postings[token]
+
+    def _insert(self, token):
+        node = self.trie
+        for char in token:
+            node = node.setdefault(char, {})
+        node[""] = token
+
+    def prefix_tokens(self, prefix, limit=None):
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        tokens = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            token = node.get("")
+            if token is not None and token in self.postings:
+                tokens.append(token)
+                if limit is not None and len(tokens) >= limit:
+                    break
+            stack.extend(child for key, child in node.items() if key)
+        return tokens
+
+    def _term_ids(self, term):
+        term = term.lower()
+        cut = min(
+            (term.index(c) for c in WILDCARDS if c in term), default=None
+        )
+        if cut is None:
+            tokens = self.prefix_tokens(term)
+        else:
+            pattern = re.compile(fnmatch.translate(term))
+            # Without a literal prefix a flat scan beats walking the trie
+            candidates = (
+                self.prefix_tokens(term[:cut]) if cut else self.postings
+            )
+            tokens = [t for t in candidates if pattern.match(t)]
+        ids = set()
+        for token in tokens:
+            ids |= self.postings[token]
+        return ids
+
+    def search(self, query, kinds=None, limit=None):
+        # Whitespace separated terms must all match; a term matches tokens
+        # it is a prefix of or, with * ? [ ], tokens matching the pattern
+        ids = None
+        for term in query.split():
+            term_ids = self._term_ids(term)
+            ids = term_ids if ids is None else ids & term_ids
+            if not ids:
+                return []
+        if ids is None:
+            return []
+        entries = (self.entries[i] for i in ids)
+        if kinds is not None:
+            entries = (e for e in entries if e["kind"] in kinds)
+
+        def order(entry):
+            return entry["label"], entry["file"]
+
+        if limit is not None:
+            return heapq.nsmallest(limit, entries, key=order)
+        return sorted(entries, key=order)
+
+    def complete(self, text, kinds=None, limit=50):
+        seen = []
+        # Entries of several epochs or files share a label
+        for entry in self.search(text, kinds=kinds, limit=limit * 4):
+            if entry["label"] not in seen:
+                seen.append(entry["label"])
+                if len(seen) >= limit:
+                    break
+        return seen
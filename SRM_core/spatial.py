@@ -0,0 +1,292 @@
+# core/spatial.py
+import numpy as np
+
+from SRM_core.search import entry_label
+
+EARTH_RADIUS_KM = 6371.0
+KINDS = ("station", "channel")
+COLOCATED_KM = 0.01
+
+
+def unit_vectors(lat, lon):
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.stack(
+        (cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=-1
+    )
+
+
+def chord(km):
+    # Straight-line distance on the unit sphere for a great-circle distance
+    return 2.0 * np.sin(np.minimum(km / EARTH_RADIUS_KM, np.pi) / 2.0)
+
+
+def great_circle_km(lat1, lon1, lat2, lon2):
+    # Haversine; works on scalars and arrays
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2.0) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    )
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class SpatialIndex:
+    # KD-tree over the unit-sphere positions of every station and channel of
+    # the loaded files. Edited coordinates are checked by brute force next to
+    # the tree until there are enough of them to make a rebuild worthwhile.
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.entries = {}
+        self.by_file = {}
+        self.tree = None
+        self.ids = []
+        self.lat = self.lon = np.empty(0)
+        self.dirty = set()
+
+    def add_inventory(self, filepath, inventory):
+        self.remove_inventory(filepath)
+        ids = self.by_file.setdefault(filepath, set())
+        for net in inventory.networks:
+            for sta in net.stations:
+                self._add(filepath, (net, sta), ids)
+                for chan in sta.channels:
+                    self._add(filepath, (net, sta, chan), ids)
+        self.tree = None
+
+    def remove_inventory(self, filepath):
+        for entry_id in self.by_file.pop(filepath, ()):
+            del self.entries[entry_id]
+        self.tree = None
+
+    def retain(self, filepaths):
+        # Like SearchIndex.retain()
+        filepaths = set(filepaths)
+        if not filepaths:
+            self.clear()
+        for filepath in set(self.by_file) - filepaths:
+            self.remove_inventory(filepath)
+
+    def hibernate(self, filepath):
+        # Like SearchIndex.hibernate()
+        ids = self.by_file.get(filepath, set())
+        dormant = set()
+        for n, entry_id in enumerate(list(ids)):
+            key = f"{filepath}#{n}"
+            self.entries[key] = dict(self.entries.pop(entry_id), path=None)
+            self.dirty.discard(entry_id)
+            dormant.add(key)
+        self.by_file[filepath] = dormant
+        self.tree = None
+
+    def update(self, obj):
+        entry = self.entries.get(id(obj))
+        if entry is None:
+            return
+        paths = [entry["path"]]
+        if len(entry["path"]) == 2:
+            paths.extend(entry["path"] + (chan,) for chan in obj.channels)
+        ids = self.by_file.setdefault(entry["file"], set())
+        for path in paths:
+            self._add(entry["file"], path, ids)
+            self.dirty.add(id(path[-1]))
+        if len(self.dirty) > max(1000, len(self.entries) // 10):
+            self.tree = None
+
+    def _add(self, filepath, path, ids):
+        obj = path[-1]
+        if obj.latitude is None or obj.longitude is None:
+            self.entries.pop(id(obj), None)
+            return
+        self.entries[id(obj)] = {
+            "file": filepath,
+            "path": path,
+            "label": entry_label(path),
+            "kind": KINDS[len(path) - 2],
+            "lat": float(obj.latitude),
+            "lon": float(obj.longitude),
+        }
+        ids.add(id(obj))
+
+    def _build(self):
+        # SciPy is only needed once the map or the locations are queried
+        from scipy.spatial import cKDTree
+
+        self.ids = list(self.entries)
+        self.dirty = set()
+        if not self.ids:
+            self.tree = None
+            return
+        self.lat = np.array([self.entries[i]["lat"] for i in self.ids])
+        self.lon = np.array([self.entries[i]["lon"] for i in self.ids])
+        self.tree = cKDTree(unit_vectors(self.lat, self.lon))
+
+    def _candidates(self, tree_ids):
+        # Entries found in the tree that are still current, plus every
+        # entry edited since the tree was built
+        ids = [
+            self.ids[i]
+            for i in tree_ids
+            if self.ids[i] in self.entries and self.ids[i] not in self.dirty
+        ]
+        return ids + [i for i in self.dirty if i in self.entries]
+
+    def _result(self, ids, kinds, lat=None, lon=None):
+        entries = [self.entries[i] for i in ids]
+        if kinds is not None:
+            entries = [e for e in entries if e["kind"] in kinds]
+        if lat is None:
+            return sorted(entries, key=lambda e: e["label"])
+        distances = great_circle_km(
+            lat,
+            lon,
+            np.array([e["lat"] for e in entries]),
+            np.array([e["lon"] for e in entries]),
+        )
+        order = np.argsort(distances, kind="stable")
+        return [
+            dict(entries[i], distance_km=float(distances[i])) for i in order
+        ]
+
+    def _ready(self):
+        if self.tree is None:
+            self._build()
+        return self.tree is not None
+
+    def within_radius(self, lat, lon, km, kinds=None):
+        if not self._ready():
+            return []
+        tree_ids = self.tree.query_ball_point(
+            unit_vectors(lat, lon), chord(km) + 1e-12
+        )
+        entries = self._result(self._candidates(tree_ids), kinds, lat, lon)
+        return [e for e in entries if e["distance_km"] <= km]
+
+    def nearest(self, lat, lon, count=1, kinds=None):
+        if not self._ready():
+            return []
+        point = unit_vectors(lat, lon)
+        # Some hits may be stale or of other kinds; ask for more until
+        # enough are left
+        k = count + len(self.dirty)
+        while True:
+            k = min(len(self.ids), k * 4)
+            _, tree_ids = self.tree.query(point, k=k)
+            tree_ids = np.atleast_1d(tree_ids)
+            entries = self._result(
+                self._candidates(tree_ids[tree_ids < len(self.ids)]),
+                kinds,
+                lat,
+                lon,
+            )
+            if len(entries) >= count or k == len(self.ids):
+                return entries[:count]
+
+    def within_box(self, south, west, north, east, kinds=None):
+        # A box whose west edge is east of its east edge spans the
+        # antimeridian
+        if not self._ready():
+            return []
+        lat, lon = self.lat, self.lon
+        mask = (lat >= south) & (lat <= north)
+        if west <= east:
+            mask &= (lon >= west) & (lon <= east)
+        else:
+            mask &= (lon >= west) | (lon <= east)
+        ids = [
+            i
+            for i in self._candidates(np.flatnonzero(mask))
+            if south <= self.entries[i]["lat"] <= north
+            and (
+                west <= self.entries[i]["lon"] <= east
+                if west <= east
+                else not east < self.entries[i]["lon"] < west
+            )
+        ]
+        return self._result(ids, kinds)
+
+    def within_polygon(self, points, kinds=None):
+        # points: [(lat, lon)] of a lasso drawn on the map, on any copy of
+        # the world. Longitudes are unwrapped along the lasso, so that one
+        # drawn across the antimeridian stays narrow, and everything is
+        # tested in that frame.
+        from matplotlib.path import Path
+
+        points = np.asarray(points, dtype=float)
+        if len(points) < 3:
+            return []
+        lat = points[:, 0]
+        lon = np.degrees(np.unwrap(np.radians(points[:, 1])))
+        lon -= 360.0 * np.floor((lon[0] + 180.0) / 360.0)
+        west, east = lon.min(), lon.max()
+        if east - west >= 360.0:
+            box_west, box_east = -180.0, 180.0
+        else:
+            box_west = (west + 180.0) % 360.0 - 180.0
+            box_east = box_west + (east - west)
+            if box_east > 180.0:
+                box_east -= 360.0
+        candidates = self.within_box(
+            lat.min(), box_west, lat.max(), box_east, kinds
+        )
+        if not candidates:
+            return []
+        inside = Path(np.column_stack((lat, lon))).contains_points(
+            [
+                (e["lat"], west + (e["lon"] - west) % 360.0)
+                for e in candidates
+            ]
+        )
+        return [e for e, hit in zip(candidates, inside) if hit]
+
+    def colocated_stations(self, km=COLOCATED_KM):
+        # Pairs of stations with different codes closer than km. Channels
+        # mostly sit on their station, so they get no part in this tree.
+        # Hibernated files are left out.
+        stations = [
+            e
+            for e in self.entries.values()
+            if e["kind"] == "station" and e["path"] is not None
+        ]
+        if len(stations) < 2:
+            return []
+        from scipy.spatial import cKDTree
+
+        tree = cKDTree(
+            unit_vectors(
+                [e["lat"] for e in stations], [e["lon"] for e in stations]
+            )
+        )
+        return [
+            (stations[i], stations[j])
+            for i, j in sorted(tree.query_pairs(chord(km)))
+            if stations[i]["label"] != stations[j]["label"]
+        ]
+
+    def distant_channels(self, km):
+        # Channels farther than km from their own station, farthest first
+        channels = [
+            e
+            for e in self.entries.values()
+            if e["kind"] == "channel"
+            and e["path"] is not None
+            and id(e["path"][1]) in self.entries
+        ]
+        if not channels:
+            return []
+        stations = [self.entries[id(e["path"][1])] for e in channels]
+        distances = great_circle_km(
+            np.array([s["lat"] for s in stations]),
+            np.array([s["lon"] for s in stations]),
+            np.array([c["lat"] for c in channels]),
+            np.array([c["lon"] for c in channels]),
+        )
+        order = np.argsort(-distances, kind="stable")
+        return [
+            dict(channels[i], distance_km=float(distances[i]))
+            for i in order
+            if distances[i] > km
+        ]
@@ -0,0 +1,118 @@
+# core/stage_arrays.py
+import re
+
+import numpy as np
+from obspy.core.inventory.response import (
+    CoefficientsTypeResponseStage,
+    FIRResponseStage,
+    ResponseListElement,
+    ResponseListResponseStage,
+)
+
+# Stage type -> [(attribute, label, column names)] of its long lists
+ARRAY_FIELDS = {
+    FIRResponseStage: [("coefficients", "FIR Coefficients", ("Value",))],
+    CoefficientsTypeResponseStage: [
+        ("numerator", "Numerators", ("Value",)),
+        ("denominator", "Denominators", ("Value",)),
+    ],
+    ResponseListResponseStage: [
+        (
+            "response_list_elements",
+            "Response List",
+            ("Frequency [Hz]", "Amplitude", "Phase [°]"),
+        )
+    ],
+}
+RESPONSE_LIST_FIELDS = ("frequency", "amplitude", "phase")
+
+
+def array_fields(stage):
+    return ARRAY_FIELDS.get(type(stage), [])
+
+
+def stage_array(stage, attr):
+    # The values of one list of stage as an (n, columns) float array
+    values = getattr(stage, attr) or []
+    if attr == "response_list_elements":
+        return np.array(
+            [[getattr(e, f) for f in RESPONSE_LIST_FIELDS] for e in values],
+            dtype=float,
+        ).reshape(-1, 3)
+    return np.array(values, dtype=float).reshape(-1, 1)
+
+
+def set_stage_array(stage, attr, values):
+    # Writes values back; entries whose value did not change keep their
+    # object, with any uncertainties and units it has
+    old = getattr(stage, attr) or []
+    if attr == "response_list_elements":
+        new = []
+        for i, row in enumerate(values.tolist()):
+            if i < len(old) and [
+                getattr(old[i], f) for f in RESPONSE_LIST_FIELDS
+            ] == row:
+                new.append(old[i])
+            else:
+                new.append(ResponseListElement(*row))
+    else:
+        new = [
+            old[i] if i < len(old) and old[i] == value else value
+            for i, value in enumerate(values[:, 0].tolist())
+        ]
+    setattr(stage, attr, new)
+
+
+def parse_values(text, columns):
+    # Numbers separated by whitespace, commas or semicolons, one row per
+    # line; "#" starts a comment. A single column may also be given as
+    # rows of several numbers, which are read in order.
+    rows = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        try:
+            row = [float(x) for x in re.split(r"[\s,;]+", line) if x]
+        except ValueError as e:
+            raise ValueError(f"Line {number}: {e}") from None
+        if columns == 1:
+            rows.extend([value] for value in row)
+        elif len(row) != columns:
+            raise ValueError(
+                f"Line {number}: expected {columns} values, got {len(row)}"
+            )
+        else:
+            rows.append(row)
+    return np.array(rows, dtype=float).reshape(-1, columns)
+
+
+def expand_fir(coefficients, symmetry):
+    # All taps of a FIR filter stored with the given StationXML symmetry
+    coefficients = np.asarray(coefficients, dtype=float)
+    if symmetry == "EVEN":
+        return np.concatenate([coefficients, coefficients[::-1]])
+    if symmetry == "ODD":
+        return np.concatenate([coefficients, coefficients[-2::-1]])
+    return coefficients
+
+
+def detect_symmetry(taps, rtol=1e-9):
+    # Symmetry under which taps can be stored, "NONE" if they cannot
+    taps = np.asarray(taps, dtype=float)
+    if len(taps) < 2:
+        return "NONE"
+    scale = np.max(np.abs(taps)) or 1.0
+    if np.all(np.abs(taps - taps[::-1]) <= rtol * scale):
+        return "EVEN" if len(taps) % 2 == 0 else "ODD"
+    return "NONE"
+
+
+def compress_fir(taps, symmetry):
+    # Inverse of expand_fir
+    taps = np.asarray(taps, dtype=float)
+    if symmetry == "EVEN":
+        return taps[:len(taps) // 2]
+    if symmetry == "ODD":
+        return taps[:(len(taps) + 1) // 2]
+    return taps
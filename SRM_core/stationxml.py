@@ -0,0 +1,90 @@
+# core/stationxml.py
+import os
+
+from lxml import etree
+from obspy.io.stationxml.core import (
+    SCHEMA_VERSION,
+    _write_extra,
+    _write_network,
+    _write_station,
+)
+
+from SRM_core.inventory_io import open_file, split_suffix
+
+NAMESPACE = "http://www.fdsn.org/xml/station/1"
+LEVELS = ("network", "station", "channel", "response")
+# Empty element marking where the streamed children go
+MARKER = "SRMStreamMarker"
+
+
+def _network_parts(network, level):
+    # Yields the text of the network up to its first station, each station,
+    # then the rest. Everything is serialized inside a document holding only
+    # this network so namespace declarations come out as in a full write;
+    # each station is cut out of it again and dropped before the next one.
+    root = etree.Element("FDSNStationXML", nsmap={None: NAMESPACE})
+    _write_network(root, network, "network")
+    element = root[0]
+    marker = etree.SubElement(element, MARKER)
+    text = etree.tostring(root, pretty_print=True)
+    element.remove(marker)
+    start = text.index(b"\n") + 1
+    head, tail = text[start:].split(f"    <{MARKER}/>\n".encode(), 1)
+    yield head
+    start += len(head)
+    for station in network.stations:
+        _write_station(element, station, level)
+        text = etree.tostring(root, pretty_print=True)
+        element.remove(element[-1])
+        yield text[start:len(text) - len(tail)]
+    yield tail[:tail.rindex(b"</FDSNStationXML>")]
+
+
+def _network(network):
+    root = etree.Element("FDSNStationXML", nsmap={None: NAMESPACE})
+    _write_network(root, network, "network")
+    text = etree.tostring(root, pretty_print=True)
+    return text[text.index(b"\n") + 1:text.rindex(b"</FDSNStationXML>")]
+
+
+def write_stationxml(inventory, path, level="response"):
+    # Same output as inventory.write(path, format="STATIONXML"), but only one
+    # station at a time is held as an element tree. A .gz or .zst path is
+    # compressed on the fly. Written to a temporary file first so a failed
+    # save leaves the old file in place.
+    if level not in LEVELS:
+        raise ValueError("Requested stationXML write level is unsupported.")
+    root = etree.Element(
+        "FDSNStationXML",
+        attrib={"schemaVersion": SCHEMA_VERSION},
+        nsmap={None: NAMESPACE},
+    )
+    etree.SubElement(root, "Source").text = inventory.source
+    if inventory.sender:
+        etree.SubElement(root, "Sender").text = inventory.sender
+    etree.SubElement(root, "Module").text = inventory.module
+    etree.SubElement(root, "ModuleURI").text = inventory.module_uri
+    etree.SubElement(root, "Created").text = str(inventory.created)
+    etree.SubElement(root, MARKER)
+    _write_extra(root, inventory)
+    text = etree.tostring(
+        root, pretty_print=True, xml_declaration=True, encoding="UTF-8"
+    )
+    head, tail = text.split(f"  <{MARKER}/>\n".encode(), 1)
+
+    tmp_path = path + ".tmp"
+    try:
+        with open_file(tmp_path, "wb", split_suffix(path)[1]) as f:
+            f.write(head)
+            for network in inventory.networks:
+                if level == "network" or not network.stations:
+                    f.write(_network(network))
+                    continue
+                for part in _network_parts(network, level):
+                    f.write(part)
+            f.write(tail)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
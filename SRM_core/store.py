@@ -0,0 +1,335 @@
+# core/store.py
+import hashlib
+import os
+import sqlite3
+import zlib
+
+from lxml import etree
+from obspy import Inventory
+from obspy.io.stationxml.core import (
+    _read_channel,
+    _read_network,
+    _read_response,
+    _read_station,
+    _write_channel,
+    _write_network,
+    _write_response,
+    _write_station,
+)
+
+from SRM_core.inventory_io import read_inventory_file
+from SRM_core.stationxml import NAMESPACE
+
+EXTENSION = ".srmdb"
+# Stored in user_version; stores before version 1 held pickles
+FORMAT_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS networks (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    code TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    stations INTEGER NOT NULL,
+    channels INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stations (
+    id INTEGER PRIMARY KEY,
+    network_id INTEGER NOT NULL REFERENCES networks(id),
+    code TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    latitude REAL,
+    longitude REAL,
+    elevation REAL,
+    channels INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS channels (
+    id INTEGER PRIMARY KEY,
+    station_id INTEGER NOT NULL REFERENCES stations(id),
+    location TEXT,
+    code TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    sample_rate REAL,
+    response TEXT REFERENCES responses(hash),
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stations_network ON stations(network_id);
+CREATE INDEX IF NOT EXISTS channels_station ON channels(station_id);
+"""
+
+
+def _ns(tag):
+    return f"{{{NAMESPACE}}}{tag}"
+
+
+def _pack(write, obj, *level):
+    # The StationXML element of obj alone, compressed; level keeps the
+    # children out
+    root = etree.Element("FDSNStationXML", nsmap={None: NAMESPACE})
+    write(root, obj, *level)
+    return zlib.compress(etree.tostring(root[0]), 1)
+
+
+def _unpack(read, blob, *level):
+    return read(etree.fromstring(zlib.decompress(blob)), _ns, *level)
+
+
+def _date(value):
+    return None if value is None else str(value)
+
+
+class InventoryStore:
+    # Inventories kept in SQLite instead of memory. Networks, stations and
+    # channels are rows with their codes, dates and positions for browsing,
+    # each with its StationXML element (minus children) compressed.
+    # Responses are stored once per distinct content. A file is stored once;
+    # importing it again replaces it.
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        tables = self.db.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'files'"
+        ).fetchone()[0]
+        if tables and version != FORMAT_VERSION:
+            self.db.close()
+            raise ValueError(
+                f"{os.path.basename(path)} was written by another version "
+                "of this program; import the files into a new store."
+            )
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.db.execute(f"PRAGMA user_version = {FORMAT_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def import_file(self, path):
+        path = os.path.abspath(path)
+        return self.import_inventory(path, read_inventory_file(path))
+
+    def import_inventory(self, path, inventory):
+        # One transaction per file; a failure leaves the store unchanged.
+        # Returns whether the file was in the store already.
+        with self.db:
+            old = self.db.execute(
+                "SELECT id FROM files WHERE path = ?", (path,)
+            ).fetchall()
+            for row in old:
+                self._delete_file(row["id"])
+            file_id = self.db.execute(
+                "INSERT INTO files (path, source) VALUES (?, ?)",
+                (path, inventory.source),
+            ).lastrowid
+            for net in inventory.networks:
+                self._import_network(file_id, net)
+        return bool(old)
+
+    def _delete_file(self, file_id):
+        networks = "SELECT id FROM networks WHERE file_id = ?"
+        stations = f"SELECT id FROM stations WHERE network_id IN ({networks})"
+        self.db.execute(
+            f"DELETE FROM channels WHERE station_id IN ({stations})",
+            (file_id,),
+        )
+        self.db.execute(
+            f"DELETE FROM stations WHERE network_id IN ({networks})",
+            (file_id,),
+        )
+        self.db.execute("DELETE FROM networks WHERE file_id = ?", (file_id,))
+        self.db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        self.db.execute(
+            "DELETE FROM responses WHERE hash NOT IN "
+            "(SELECT response FROM channels WHERE response IS NOT NULL)"
+        )
+
+    def _import_network(self, file_id, net):
+        network_id = self.db.execute(
+            "INSERT INTO networks (file_id, code, start_date, end_date, "
+            "stations, channels, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                file_id,
+                net.code,
+                _date(net.start_date),
+                _date(net.end_date),
+                len(net.stations),
+                sum(len(sta.channels) for sta in net.stations),
+                _pack(_write_network, net, "network"),
+            ),
+        ).lastrowid
+        for sta in net.stations:
+            station_id = self.db.execute(
+                "INSERT INTO stations (network_id, code, start_date, "
+                "end_date, latitude, longitude, elevation, channels, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    network_id,
+                    sta.code,
+                    _date(sta.start_date),
+                    _date(sta.end_date),
+                    sta.latitude,
+                    sta.longitude,
+                    sta.elevation,
+                    len(sta.channels),
+                    _pack(_write_station, sta, "station"),
+                ),
+            ).lastrowid
+            rows = []
+            responses = []
+            for chan in sta.channels:
+                response = None
+                if chan.response is not None:
+                    blob = _pack(_write_response, chan.response)
+                    response = hashlib.sha1(blob).hexdigest()
+                    responses.append((response, blob))
+                rows.append(
+                    (
+                        station_id,
+                        chan.location_code,
+                        chan.code,
+                        _date(chan.start_date),
+                        _date(chan.end_date),
+                        chan.sample_rate,
+                        response,
+                        _pack(_write_channel, chan, "channel"),
+                    )
+                )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO responses (hash, data) VALUES (?, ?)",
+                responses,
+            )
+            self.db.executemany(
+                "INSERT INTO channels (station_id, location, code, "
+                "start_date, end_date, sample_rate, response, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def counts(self):
+        row = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(stations), 0), "
+            "COALESCE(SUM(channels), 0) FROM networks"
+        ).fetchone()
+        return tuple(row)
+
+    def networks(self):
+        return self.db.execute(
+            "SELECT networks.id, code, start_date, end_date, stations, "
+            "channels, path FROM networks JOIN files ON files.id = file_id "
+            "ORDER BY code, start_date, networks.id"
+        ).fetchall()
+
+    def stations(self, network_id):
+        return self.db.execute(
+            "SELECT id, code, start_date, end_date, latitude, longitude, "
+            "elevation, channels FROM stations WHERE network_id = ? "
+            "ORDER BY code, start_date, id",
+            (network_id,),
+        ).fetchall()
+
+    def channels(self, station_id):
+        return self.db.execute(
+            "SELECT id, location, code, start_date, end_date, sample_rate "
+            "FROM channels WHERE station_id = ? "
+            "ORDER BY location, code, start_date, id",
+            (station_id,),
+        ).fetchall()
+
+    def inventory(self, selection, source="Seismic Response Manager"):
+        # selection: [(kind, row id)] with kind network, station or channel.
+        # A network or station brings all its children; a channel brings
+        # only itself and the shells of its station and network.
+        networks, stations, channels = set(), set(), set()
+        whole_networks, whole_stations = set(), set()
+        for kind, row_id in selection:
+            if kind == "network":
+                whole_networks.add(row_id)
+            elif kind == "station":
+                whole_stations.add(row_id)
+            else:
+                channels.add(row_id)
+        whole_stations.update(
+            r["id"]
+            for r in self._rows(
+                "SELECT id FROM stations", whole_networks, key="network_id"
+            )
+        )
+        channels.update(
+            r["id"]
+            for r in self._rows(
+                "SELECT id FROM channels", whole_stations, key="station_id"
+            )
+        )
+        stations.update(whole_stations)
+
+        channel_rows = self._rows(
+            "SELECT id, station_id, response, data FROM channels", channels
+        )
+        stations.update(r["station_id"] for r in channel_rows)
+        station_rows = self._rows(
+            "SELECT id, network_id, data FROM stations", stations
+        )
+        networks.update(whole_networks)
+        networks.update(r["network_id"] for r in station_rows)
+        network_rows = self._rows("SELECT id, data FROM networks", networks)
+        responses = {
+            r["hash"]: r["data"]
+            for r in self._rows(
+                "SELECT hash, data FROM responses",
+                {r["response"] for r in channel_rows if r["response"]},
+                key="hash",
+            )
+        }
+
+        by_id = {}
+        inventory = Inventory(networks=[], source=source)
+        for row in network_rows:
+            by_id["network", row["id"]] = net = _unpack(
+                _read_network, row["data"], "network"
+            )
+            inventory.networks.append(net)
+        for row in station_rows:
+            by_id["station", row["id"]] = sta = _unpack(
+                _read_station, row["data"], "station"
+            )
+            by_id["network", row["network_id"]].stations.append(sta)
+        for row in channel_rows:
+            chan = _unpack(_read_channel, row["data"], "channel")
+            if row["response"]:
+                # Every channel gets its own copy, as after reading a file
+                chan.response = _unpack(
+                    _read_response, responses[row["response"]]
+                )
+            by_id["station", row["station_id"]].channels.append(chan)
+        return inventory
+
+    def _rows(self, query, ids, key="id"):
+        # Rows of query for the given ids in id order, fetched in chunks that
+        # stay below SQLite's limit on query parameters
+        ids = sorted(ids)
+        rows = []
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows.extend(
+                self.db.execute(
+                    f"{query} WHERE {key} IN ({','.join('?' * len(chunk))}) "
+                    f"ORDER BY {key}",
+                    chunk,
+                )
+            )
+        return rows
@@ -1,8 +1,13 @@
 # core/parser.py
+from copy import deepcopy
 from obspy import read_inventory
 import os
 import sys
 import re
+from functools import lru_cache
+
+from SRM_core.inventory_io import read_inventory_file
+from SRM_core.stationxml import write_stationxml
 
 
 def parse_response(path):
@@ -55,10 +60,31 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+def is_nrl_root(path):
+    # Cheap layout check so startup does not have to import and parse the
+    # NRL. ObsPy reads the index of every top folder of the layout it finds:
+    # v1 when sensors/index.txt exists, else v2.
+    if os.path.isfile(os.path.join(path, "sensors", "index.txt")):
+        folders = ("sensors", "dataloggers")
+    else:
+        folders = ("sensor", "datalogger", "integrated", "soh")
+    return all(
+        os.path.isfile(os.path.join(path, folder, "index.txt"))
+        for folder in folders
+    )
+
+
+@lru_cache(maxsize=None)
+def get_nrl(root):
+    from obspy.clients.nrl import NRL
+
+    return NRL(root=root)
+
+
 def convert_inventory_to_xml(input_path: str, output_path: str):
     try:
-        inventory = read_inventory(input_path)
-        inventory.write(output_path, format="STATIONXML")
+        inventory = read_inventory_file(input_path)
+        write_stationxml(inventory, output_path)
 
         success_message = (
             f"Successfully converted and saved file to:\n{output_path}"
@@ -76,3 +102,64 @@ def natural_sort_key(s: str):
         for chunk in re.split(r"(\d+)", s)
         if chunk
     ]
+
+
+def collect_channels(objects):
+    # Expands inventories, networks and stations into their channels, keeping
+    # the first occurrence of each channel object.
+    seen = set()
+    channels = []
+    for obj in objects:
+        if hasattr(obj, "networks"):
+            children = [
+                c for n in obj.networks for s in n.stations
+                for c in s.channels
+            ]
+        elif hasattr(obj, "stations"):
+            children = [c for s in obj.stations for c in s.channels]
+        elif hasattr(obj, "channels"):
+            children = list(obj.channels)
+        else:
+            children = [obj]
+        for chan in children:
+            if id(chan) not in seen:
+                seen.add(id(chan))
+                channels.append(chan)
+    return channels
+
+
+def collect_stations(obj):
+    if hasattr(obj, "networks"):
+        return [s for n in obj.networks for s in n.stations]
+    if hasattr(obj, "stations"):
+        return list(obj.stations)
+    return [obj]
+
+
+def apply_response_to_channels(channels, response):
+    # The channels share one copy of the response; detach_response() gives
+    # a channel its own before it is edited. Returns (old, new) responses
+    # so callers can move views that still point at the old ones.
+    new = deepcopy(response)
+    replaced = []
+    for chan in channels:
+        if chan.response is not None:
+            replaced.append((chan.response, new))
+        chan.response = new
+    return replaced
+
+
+def detach_response(channel, inventory):
+    # Copies the response of channel if other channels of inventory share
+    # it, so that editing it changes this channel only. Returns whether it
+    # was copied.
+    response = channel.response
+    if response is None:
+        return False
+    for net in inventory.networks:
+        for sta in net.stations:
+            for chan in sta.channels:
+                if chan.response is response and chan is not channel:
+                    channel.response = deepcopy(response)
+                    return True
+    return False
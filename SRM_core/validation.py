@@ -0,0 +1,293 @@
+# core/validation.py
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_TOLERANCE = 0.01
+# Below this many distinct responses a process pool costs more than it saves
+PARALLEL_THRESHOLD = 200
+CHUNK_SIZE = 100
+
+
+def _units(value):
+    return (value or "").strip().upper()
+
+
+def stage_gain_products(responses):
+    # Product of all stage gains for many responses in one pass; missing
+    # gains make the product NaN.
+    depth = max((len(r.response_stages) for r in responses), default=0)
+    gains = np.ones((len(responses), max(depth, 1)))
+    for i, resp in enumerate(responses):
+        for j, stage in enumerate(resp.response_stages):
+            gain = getattr(stage, "stage_gain", None)
+            gains[i, j] = np.nan if gain is None else gain
+    return np.prod(gains, axis=1)
+
+
+def _issue(check, severity, message, expected=None, actual=None,
+           fixable=False):
+    return {
+        "check": check,
+        "severity": severity,
+        "message": message,
+        "expected": expected,
+        "actual": actual,
+        "fixable": fixable,
+    }
+
+
+def _check_units(resp):
+    issues = []
+    stages = resp.response_stages
+    for prev, stage in zip(stages, stages[1:]):
+        if _units(prev.output_units) != _units(stage.input_units):
+            issues.append(
+                _issue(
+                    "unit chain",
+                    "error",
+                    f"Stage {prev.stage_sequence_number} outputs "
+                    f"{prev.output_units} but stage "
+                    f"{stage.stage_sequence_number} expects "
+                    f"{stage.input_units}.",
+                    prev.output_units,
+                    stage.input_units,
+                )
+            )
+    sens = resp.instrument_sensitivity
+    if sens and stages:
+        if _units(sens.input_units) != _units(stages[0].input_units):
+            issues.append(
+                _issue(
+                    "unit chain",
+                    "warning",
+                    "Sensitivity input units differ from stage 1.",
+                    stages[0].input_units,
+                    sens.input_units,
+                )
+            )
+        if _units(sens.output_units) != _units(stages[-1].output_units):
+            issues.append(
+                _issue(
+                    "unit chain",
+                    "warning",
+                    "Sensitivity output units differ from the last stage.",
+                    stages[-1].output_units,
+                    sens.output_units,
+                )
+            )
+    return issues
+
+
+def _check_decimation(resp):
+    issues = []
+    rate = None
+    for stage in resp.response_stages:
+        input_rate = getattr(stage, "decimation_input_sample_rate", None)
+        factor = getattr(stage, "decimation_factor", None)
+        if input_rate is None:
+            continue
+        if rate is not None and not np.isclose(rate, input_rate):
+            issues.append(
+                _issue(
+                    "decimation",
+                    "error",
+                    f"Stage {stage.stage_sequence_number} input rate does "
+                    "not match the previous stage's output rate.",
+                    rate,
+                    input_rate,
+                )
+            )
+        if not factor:
+            issues.append(
+                _issue(
+                    "decimation",
+                    "error",
+                    f"Stage {stage.stage_sequence_number} has a decimation "
+                    "input rate but no decimation factor.",
+                )
+            )
+            rate = input_rate
+            continue
+        rate = input_rate / factor
+    return issues, rate
+
+
+def _check_response(resp, gain_product, tolerance):
+    issues = []
+    sens = resp.instrument_sensitivity
+    if not resp.response_stages:
+        issues.append(_issue("stages", "warning", "Response has no stages."))
+    if sens is None or sens.value is None:
+        issues.append(
+            _issue(
+                "sensitivity",
+                "error",
+                "Instrument sensitivity is missing.",
+                gain_product,
+                None,
+                fixable=sens is not None and bool(np.isfinite(gain_product)),
+            )
+        )
+    elif np.isnan(gain_product):
+        issues.append(
+            _issue(
+                "stage gain",
+                "error",
+                "At least one stage has no gain.",
+            )
+        )
+    else:
+        if not np.isclose(
+            sens.value, gain_product, rtol=tolerance, atol=0.0
+        ):
+            issues.append(
+                _issue(
+                    "sensitivity",
+                    "error",
+                    "Sensitivity does not match the product of stage gains.",
+                    float(gain_product),
+                    float(sens.value),
+                    fixable=True,
+                )
+            )
+        if sens.frequency:
+            try:
+                h = resp.get_evalresp_response_for_frequencies(
+                    [sens.frequency], output="DEF"
+                )
+                amplitude = float(np.abs(h[0]))
+            except Exception as e:
+                issues.append(
+                    _issue(
+                        "evaluation",
+                        "error",
+                        f"Response could not be evaluated: {e}",
+                    )
+                )
+            else:
+                if not np.isclose(
+                    sens.value, amplitude, rtol=tolerance, atol=0.0
+                ):
+                    issues.append(
+                        _issue(
+                            "sensitivity",
+                            "warning",
+                            "Sensitivity differs from the response "
+                            f"amplitude at {sens.frequency} Hz.",
+                            amplitude,
+                            float(sens.value),
+                            fixable=True,
+                        )
+                    )
+    issues.extend(_check_units(resp))
+    decimation_issues, output_rate = _check_decimation(resp)
+    issues.extend(decimation_issues)
+    return issues, output_rate
+
+
+def _validate_chunk(responses, tolerance):
+    products = stage_gain_products(responses)
+    return [
+        _check_response(resp, product, tolerance)
+        for resp, product in zip(responses, products)
+    ]
+
+
+def iter_channels(loaded_files):
+    for filepath, inv in loaded_files.items():
+        for net in inv.networks:
+            for sta in net.stations:
+                for chan in sta.channels:
+                    seed_id = (
+                        f"{net.code}.{sta.code}."
+                        f"{chan.location_code}.{chan.code}"
+                    )
+                    yield filepath, seed_id, chan
+
+
+def validate_inventories(loaded_files, tolerance=DEFAULT_TOLERANCE,
+                         max_workers=None):
+    # Every distinct Response object is checked once (in worker processes
+    # for large inventories); channel-level checks are applied afterwards.
+    # Each issue refers to its channel object under the "channel" key.
+    channels = list(iter_channels(loaded_files))
+    unique = {}
+    for _, _, chan in channels:
+        if chan.response is not None:
+            unique.setdefault(id(chan.response), chan.response)
+    responses = list(unique.values())
+    chunks = [
+        responses[i:i + CHUNK_SIZE]
+        for i in range(0, len(responses), CHUNK_SIZE)
+    ]
+
+    results = []
+    if len(responses) >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for chunk_result in pool.map(
+                _validate_chunk, chunks, [tolerance] * len(chunks)
+            ):
+                results.extend(chunk_result)
+    else:
+        for chunk in chunks:
+            results.extend(_validate_chunk(chunk, tolerance))
+    by_response = dict(zip(unique.keys(), results))
+
+    report = []
+    for filepath, seed_id, chan in channels:
+        base = {
+            "file": filepath,
+            "seed_id": seed_id,
+            "start": chan.start_date,
+            "channel": chan,
+        }
+        if chan.response is None:
+            report.append(
+                dict(base, **_issue("response", "error",
+                                    "Channel has no response."))
+            )
+            continue
+        issues, output_rate = by_response[id(chan.response)]
+        for issue in issues:
+            report.append(dict(base, **issue))
+        if (
+            output_rate is not None
+            and chan.sample_rate
+            and not np.isclose(output_rate, chan.sample_rate)
+        ):
+            report.append(
+                dict(
+                    base,
+                    **_issue(
+                        "decimation",
+                        "warning",
+                        "Final decimated rate differs from the channel "
+                        "sample rate.",
+                        float(chan.sample_rate),
+                        float(output_rate),
+                    ),
+                )
+            )
+    return report
+
+
+def repair_sensitivity(response):
+    # Recompute the overall sensitivity at its stored frequency, falling
+    # back to the plain product of stage gains.
+    sens = response.instrument_sensitivity
+    frequency = sens.frequency if sens is not None else None
+    try:
+        if frequency:
+            response.recalculate_overall_sensitivity(frequency=frequency)
+        else:
+            response.recalculate_overall_sensitivity()
+        return True
+    except Exception:
+        if sens is None:
+            return False
+        product = stage_gain_products([response])[0]
+        if not np.isfinite(product):
+            return False
+        sens.value = float(product)
+        return True
@@ -0,0 +1,198 @@
+# core/watch.py
+import hashlib
+import os
+
+from SRM_core.diff import (
+    format_epoch,
+    index_inventory,
+    index_station,
+    object_digest,
+)
+from SRM_core.inventory_io import read_inventory_file
+
+
+def file_state(path):
+    # mtime and size tell cheaply that nothing happened; the hash tells a
+    # rewrite with the same content from a real change
+    stat = os.stat(path)
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(block)
+    return {
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "hash": sha1.hexdigest(),
+    }
+
+
+def same_stat(path, state):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return (stat.st_mtime_ns, stat.st_size) == (state["mtime"], state["size"])
+
+
+def snapshot(inventory):
+    # {(network key,): network fields digest, (network key, station key):
+    # station subtree digest} plus the diff index the digests came from
+    index = index_inventory(inventory)
+    digests = {}
+    for net_key, net in index.items():
+        digests[(net_key,)] = net["own"]
+        for sta_key, sta in net["children"].items():
+            digests[(net_key, sta_key)] = sta["hash"]
+    return digests, index
+
+
+def digests_of(index, keys):
+    # The snapshot() digests of just the given keys, for an index_keys()
+    # index; keys missing from it get none
+    cache, digests = {}, {}
+    for key in keys:
+        net = index.get(key[0])
+        if net is None:
+            continue
+        if len(key) == 1:
+            digests[key] = object_digest(net["obj"])
+            continue
+        sta = net["children"].get(key[1])
+        if sta is not None:
+            digests[key] = index_station(sta["obj"], cache)["hash"]
+    return digests
+
+
+def read_loaded(path):
+    # Runs in a worker thread while a file is loaded: its inventory with
+    # the state and digests of the file on disk
+    state = file_state(path)
+    inventory = read_inventory_file(path)
+    return {
+        "state": state,
+        "inventory": inventory,
+        "digests": snapshot(inventory)[0],
+    }
+
+
+def read_baseline(path):
+    # Runs in a worker thread: the state and digests of the file on disk,
+    # which unsaved edits and later changes are told apart from
+    result = read_loaded(path)
+    del result["inventory"]
+    return result
+
+
+def read_changed(path):
+    # Runs in a worker thread: the inventory read here is not shared yet
+    state = file_state(path)
+    inventory = read_inventory_file(path)
+    digests, index = snapshot(inventory)
+    return {
+        "state": state,
+        "inventory": inventory,
+        "digests": digests,
+        "index": index,
+    }
+
+
+def plan_reload(base, memory_index, disk):
+    # base: digests as last read or saved; disk: current digests;
+    # memory_index: index_keys() of the inventory in memory. Returns the
+    # keys changed on disk and those of them also edited in memory in a
+    # different way. Only the keys changed on disk are hashed in memory.
+    external = {
+        k for k in base.keys() | disk.keys() if disk.get(k) != base.get(k)
+    }
+    memory = digests_of(memory_index, external)
+    conflicts = {
+        k
+        for k in external
+        if memory.get(k) != base.get(k) and memory.get(k) != disk.get(k)
+    }
+    return external, conflicts
+
+
+def apply_reload(inventory, memory_index, disk_index, take):
+    # Moves the disk version of the keys in take into inventory, in place;
+    # memory_index may come from index_keys().
+    # Everything else keeps its in-memory object, so open views and indexes
+    # of unchanged stations stay valid. Returns the removed and the added
+    # station objects.
+    removed, added = [], []
+    networks = []
+    order = list(disk_index) + [k for k in memory_index if k not in disk_index]
+    for net_key in order:
+        mem_net = memory_index.get(net_key)
+        disk_net = disk_index.get(net_key)
+        mem_stations = mem_net["children"] if mem_net else {}
+        disk_stations = disk_net["children"] if disk_net else {}
+
+        stations = []
+        sta_order = list(disk_stations) + [
+            k for k in mem_stations if k not in disk_stations
+        ]
+        for sta_key in sta_order:
+            mem_sta = mem_stations.get(sta_key)
+            disk_sta = disk_stations.get(sta_key)
+            if (net_key, sta_key) not in take:
+                if mem_sta is not None:
+                    stations.append(mem_sta["obj"])
+                continue
+            if mem_sta is not None:
+                removed.append(mem_sta["obj"])
+            if disk_sta is not None:
+                stations.append(disk_sta["obj"])
+                added.append(disk_sta["obj"])
+
+        if (net_key,) in take:
+            present = disk_net is not None
+        else:
+            present = mem_net is not None
+        if not present and not stations:
+            continue
+        if mem_net is not None:
+            network = mem_net["obj"]
+            if (net_key,) in take and disk_net is not None:
+                fields = dict(vars(disk_net["obj"]))
+                fields.pop("_stations", None)
+                vars(network).update(fields)
+        else:
+            network = disk_net["obj"]
+        network.stations = stations
+        networks.append(network)
+    inventory.networks = networks
+    return removed, added
+
+
+def response_pairs(removed, added):
+    # (old, new) responses of the channels of the removed stations; new is
+    # the response of the same channel epoch among the added stations, or
+    # None when there is none
+    new = {
+        (sta.code, sta.start_date, chan.location_code, chan.code,
+         chan.start_date): chan.response
+        for sta in added
+        for chan in sta.channels
+    }
+    return [
+        (
+            chan.response,
+            new.get(
+                (sta.code, sta.start_date, chan.location_code, chan.code,
+                 chan.start_date)
+            ),
+        )
+        for sta in removed
+        for chan in sta.channels
+        if chan.response is not None
+    ]
+
+
+def key_label(key):
+    net_key = key[0]
+    if len(key) == 1:
+        return f"network {net_key[0]}"
+    sta_key = key[1]
+    start = format_epoch(sta_key[1])
+    return f"{net_key[0]}.{sta_key[0]}" + (f" ({start})" if start else "")
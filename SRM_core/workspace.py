@@ -0,0 +1,99 @@
+# core/workspace.py
+import json
+import mmap
+import os
+import pickle
+import struct
+import zlib
+
+MAGIC = b"SRMWS1\n"
+HEADER = struct.Struct("<Q")
+EXTENSION = ".srmws"
+
+
+def save_workspace(path, loaded_files, state):
+    # Layout: magic, header length, JSON header, then one compressed pickle
+    # per inventory so each can be restored on its own. The in-memory
+    # inventories are stored, unsaved edits included.
+    blobs = []
+    files = []
+    offset = 0
+    for filepath, inventory in loaded_files.items():
+        blob = zlib.compress(
+            pickle.dumps(inventory, protocol=pickle.HIGHEST_PROTOCOL), 1
+        )
+        try:
+            stat = os.stat(filepath)
+            disk = {"mtime": stat.st_mtime, "size": stat.st_size}
+        except OSError:
+            disk = None
+        files.append(
+            {
+                "path": filepath,
+                "offset": offset,
+                "length": len(blob),
+                "disk": disk,
+            }
+        )
+        blobs.append(blob)
+        offset += len(blob)
+    header = json.dumps({"files": files, "state": state}).encode("utf-8")
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(HEADER.pack(len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class Workspace:
+    # Reads only the header when opened; inventories are unpickled from the
+    # memory-mapped file one at a time by load(). Snapshots are pickles and
+    # must only be opened when they were written by this program.
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+            if self._map[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not an SRM workspace.")
+            start = len(MAGIC)
+            (length,) = HEADER.unpack_from(self._map, start)
+            start += HEADER.size
+            header = json.loads(bytes(self._map[start:start + length]))
+        except Exception:
+            self.close()
+            raise
+        self._data_start = start + length
+        self.files = {f["path"]: f for f in header["files"]}
+        self.state = header["state"]
+
+    def load(self, filepath):
+        entry = self.files[filepath]
+        start = self._data_start + entry["offset"]
+        blob = self._map[start:start + entry["length"]]
+        return pickle.loads(zlib.decompress(blob))
+
+    def changed_on_disk(self):
+        # Files saved or edited by something else after the snapshot
+        changed = []
+        for filepath, entry in self.files.items():
+            try:
+                stat = os.stat(filepath)
+                disk = {"mtime": stat.st_mtime, "size": stat.st_size}
+            except OSError:
+                disk = None
+            if disk != entry["disk"]:
+                changed.append(filepath)
+        return changed
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
@@ -0,0 +1,149 @@
+from PyQt5.QtWidgets import (
+    QDialog,
+    QFormLayout,
+    QLabel,
+    QComboBox,
+    QLineEdit,
+    QDialogButtonBox,
+    QMessageBox,
+    QUndoCommand,
+)
+
+from SRM_core.bulk import FIELDS, OPERATIONS, apply_values, plan_bulk_edit
+
+MAX_LISTED_ERRORS = 20
+
+
+class BulkEditDialog(QDialog):
+    # targets: {"channel": [(chan, station)], "station": [(sta, None)]}
+    def __init__(self, targets, parent=None):
+        super().__init__(parent)
+        self.targets = targets
+        self.plan = None
+        self.setWindowTitle("Bulk Edit")
+        layout = QFormLayout(self)
+
+        self.level_combo = QComboBox()
+        for level in ("channel", "station"):
+            if targets.get(level):
+                self.level_combo.addItem(
+                    f"{len(targets[level])} {level}(s)", level
+                )
+        self.level_combo.currentIndexChanged.connect(self.update_fields)
+        layout.addRow("Apply to:", self.level_combo)
+        self.field_combo = QComboBox()
+        self.field_combo.currentIndexChanged.connect(self.update_hint)
+        layout.addRow("Field:", self.field_combo)
+        self.operation_combo = QComboBox()
+        self.operation_combo.currentIndexChanged.connect(self.update_hint)
+        layout.addRow("Operation:", self.operation_combo)
+        self.value_edit = QLineEdit()
+        layout.addRow("Value:", self.value_edit)
+        self.hint_label = QLabel()
+        layout.addRow(self.hint_label)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel
+        )
+        buttons.accepted.connect(self.validate_and_accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+        self.update_fields()
+
+    def update_fields(self):
+        level = self.level_combo.currentData()
+        self.field_combo.clear()
+        self.field_combo.addItems(FIELDS.get(level, ()))
+        self.operation_combo.clear()
+        self.operation_combo.addItems(
+            OPERATIONS if level == "channel" else OPERATIONS[:2]
+        )
+
+    def update_hint(self):
+        field = self.field_combo.currentText()
+        operation = self.operation_combo.currentText()
+        if operation == "copy from station":
+            hint = "Each channel takes the value of its station."
+        elif operation == "add offset":
+            hint = (
+                "Days added to each date, may be negative."
+                if field.endswith("_date")
+                else "Number added to each value."
+            )
+        elif field == "end_date":
+            hint = "UTC date, e.g. 2024-03-01T00:00:00, or empty for open."
+        elif field == "start_date":
+            hint = "UTC date, e.g. 2024-03-01T00:00:00."
+        else:
+            hint = "New value for every selected object."
+        self.value_edit.setEnabled(operation != "copy from station")
+        self.hint_label.setText(hint)
+
+    def validate_and_accept(self):
+        level = self.level_combo.currentData()
+        try:
+            plan = plan_bulk_edit(
+                self.targets[level],
+                self.field_combo.currentText(),
+                self.operation_combo.currentText(),
+                self.value_edit.text(),
+            )
+        except Exception as e:
+            QMessageBox.warning(self, "Invalid Edit", str(e))
+            return
+        if plan["errors"]:
+            lines = [
+                f"{_label(plan['objects'][i])}: {message}"
+                for i, message in plan["errors"][:MAX_LISTED_ERRORS]
+            ]
+            if len(plan["errors"]) > MAX_LISTED_ERRORS:
+                lines.append(
+                    f"... and {len(plan['errors']) - MAX_LISTED_ERRORS} more"
+                )
+            QMessageBox.warning(
+                self,
+                "Invalid Edit",
+                f"{len(plan['errors'])} value(s) would be invalid, nothing "
+                "was changed:\n" + "\n".join(lines),
+            )
+            return
+        self.plan = plan
+        self.accept()
+
+
+def _label(obj):
+    if hasattr(obj, "location_code"):
+        return f"{obj.location_code}.{obj.code}"
+    return obj.code
+
+
+class BulkEditCommand(QUndoCommand):
+    # One undo entry for the whole edit. The values are already written when
+    # the command is pushed, so the first redo() only refreshes the views.
+    def __init__(self, main_window, plan, filepaths):
+        super().__init__(
+            f"Edit {plan['field']} of {len(plan['objects'])} object(s)"
+        )
+        self.main_window = main_window
+        self.plan = plan
+        self.filepaths = filepaths
+        self.applied = True
+
+    def _apply(self, values):
+        apply_values(self.plan["objects"], self.plan["field"], values)
+        self._refresh()
+
+    def _refresh(self):
+        self.main_window.objects_changed(
+            self.plan["objects"], self.filepaths, (self.plan["field"],)
+        )
+
+    def redo(self):
+        if self.applied:
+            self.applied = False
+            self._refresh()
+            return
+        self._apply(self.plan["new"])
+
+    def undo(self):
+        self._apply(self.plan["old"])
@@ -0,0 +1,38 @@
+# Matplotlib is only needed once a response is plotted, so this module is
+# imported lazily by ResponseTab to keep it out of application startup.
+from matplotlib.backends.backend_qt5agg import (
+    FigureCanvasQTAgg as FigureCanvas,
+)
+from matplotlib.figure import Figure
+
+
+class MplCanvas(FigureCanvas):
+    def __init__(self, parent=None):
+        self.fig = Figure(figsize=(5, 4), dpi=100)
+        self.ax_amp = self.fig.add_subplot(211)
+        self.ax_phase = self.fig.add_subplot(212, sharex=self.ax_amp)
+        self.fig.tight_layout()
+        super().__init__(self.fig)
+
+
+# Creating a Figure with its canvas is slow, so canvases of closed response
+# tabs are kept for the next ones
+POOL_SIZE = 4
+_pool = []
+
+
+def acquire_canvas(parent=None):
+    canvas = _pool.pop() if _pool else MplCanvas()
+    canvas.setParent(parent)
+    return canvas
+
+
+def release_canvas(canvas):
+    # The plotted data is dropped with the lines
+    canvas.ax_amp.clear()
+    canvas.ax_phase.clear()
+    canvas.setParent(None)
+    if len(_pool) < POOL_SIZE:
+        _pool.append(canvas)
+    else:
+        canvas.deleteLater()
@@ -0,0 +1,204 @@
+import os
+
+import numpy as np
+from PyQt5.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QTableView,
+    QAbstractItemView,
+    QMessageBox,
+    QApplication,
+)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+
+from SRM_core.columnar import ATTRIBUTES, COLUMNS, ChannelTable
+
+HEADERS = (
+    "File", "Network", "Station", "Location", "Channel", "Latitude",
+    "Longitude", "Elevation", "Depth", "Azimuth", "Dip", "Sample Rate",
+    "Start", "End", "Sensitivity",
+)
+
+
+class ChannelGridModel(QAbstractTableModel):
+    # Only the visible cells are ever formatted; the view order is an index
+    # array into the ChannelTable
+    def __init__(self, table, on_edit=None, parent=None):
+        super().__init__(parent)
+        self.table = table
+        self.on_edit = on_edit
+        self.order = np.arange(len(table))
+        self.sort_key = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return section + 1
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() and COLUMNS[index.column() - 1] in ATTRIBUTES:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole):
+            return None
+        row = self.order[index.row()]
+        if index.column() == 0:
+            path = self.table.files[row]
+            return path if role == Qt.ToolTipRole else os.path.basename(path)
+        return self.table.text(row, COLUMNS[index.column() - 1])
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.column():
+            return False
+        row = self.order[index.row()]
+        try:
+            chan = self.table.set_text(row, COLUMNS[index.column() - 1], value)
+        except Exception as e:
+            QMessageBox.warning(None, "Invalid Value", str(e))
+            return False
+        self.dataChanged.emit(
+            self.index(index.row(), 0),
+            self.index(index.row(), len(HEADERS) - 1),
+        )
+        if self.on_edit is not None:
+            self.on_edit(chan)
+        return True
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # The file column and the view's "unsorted" -1 keep the load order
+        if column < 1:
+            return
+        self.sort_key = (column, order)
+        self.layoutAboutToBeChanged.emit()
+        self.order = self.table.sort(
+            self.order,
+            COLUMNS[column - 1],
+            descending=order == Qt.DescendingOrder,
+        )
+        self.layoutChanged.emit()
+
+    def set_filter(self, text):
+        order = self.table.select(text)
+        self.beginResetModel()
+        self.order = order
+        self.endResetModel()
+        if self.sort_key is not None:
+            self.sort(*self.sort_key)
+
+    def refresh_channels(self, objects):
+        rows = [self.table.refresh(obj) for obj in objects]
+        rows = [row for row in rows if row is not None]
+        if len(rows) == 1:
+            for position in np.flatnonzero(self.order == rows[0]):
+                self.dataChanged.emit(
+                    self.index(int(position), 0),
+                    self.index(int(position), len(HEADERS) - 1),
+                )
+        elif rows:
+            # One repaint of the view for a batch edit
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(len(self.order) - 1, len(HEADERS) - 1),
+            )
+
+
+class ChannelGridTab(QWidget):
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText(
+            "Filter: gr.*.hh? sample_rate>=100 start<2020-01-01"
+        )
+        top_layout.addWidget(self.filter_edit)
+        self.count_label = QLabel()
+        top_layout.addWidget(self.count_label)
+        bulk_btn = QPushButton("Bulk Edit")
+        bulk_btn.setToolTip(
+            "Change one field of the selected rows, or of all shown rows"
+        )
+        bulk_btn.clicked.connect(self.bulk_edit)
+        top_layout.addWidget(bulk_btn)
+        reload_btn = QPushButton("Reload")
+        reload_btn.clicked.connect(self.reload)
+        top_layout.addWidget(reload_btn)
+        layout.addLayout(top_layout)
+
+        self.view = QTableView()
+        self.view.setSortingEnabled(True)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # Uniform rows keep the view from measuring every row
+        self.view.verticalHeader().setDefaultSectionSize(22)
+        layout.addWidget(self.view)
+
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(250)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(
+            lambda _: self.filter_timer.start()
+        )
+        self.reload()
+
+    def reload(self):
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            self.model = ChannelGridModel(
+                ChannelTable(self.main_window.loaded_files),
+                self.main_window.object_edited,
+                self,
+            )
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.view.setModel(self.model)
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.apply_filter()
+
+    def bulk_edit(self):
+        selected = self.view.selectionModel().selectedRows()
+        if selected:
+            rows = self.model.order[[index.row() for index in selected]]
+        else:
+            rows = self.model.order
+        table = self.model.table
+        stations = {}
+        channels = []
+        for row in rows.tolist():
+            sta = table.parents[row][1]
+            stations[id(sta)] = sta
+            channels.append((table.channels[row], sta))
+        self.main_window.bulk_edit(
+            {
+                "channel": channels,
+                "station": [(sta, None) for sta in stations.values()],
+            },
+            {table.files[row] for row in rows.tolist()},
+        )
+
+    def apply_filter(self):
+        try:
+            self.model.set_filter(self.filter_edit.text())
+        except Exception as e:
+            self.count_label.setText(f"Invalid filter: {e}")
+            return
+        self.count_label.setText(
+            f"{self.model.rowCount()} of {len(self.model.table)} channels"
+        )
@@ -0,0 +1,260 @@
+# Matplotlib is only needed once responses are compared, so this module is
+# imported lazily by MainWindow to keep it out of application startup.
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.backends.backend_qt5agg import (
+    FigureCanvasQTAgg as FigureCanvas,
+)
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+from PyQt5.QtWidgets import (
+    QWidget,
+    QHBoxLayout,
+    QVBoxLayout,
+    QSplitter,
+    QLabel,
+    QComboBox,
+    QPushButton,
+    QListWidget,
+    QListWidgetItem,
+)
+from PyQt5.QtGui import QColor, QIcon, QPixmap
+from PyQt5.QtCore import Qt
+
+from SRM_core.compare import (
+    compare,
+    decimate,
+    evaluate_responses,
+    shared_grid,
+)
+
+# (title, y label, y scale) of the amplitude, ratio, phase and phase
+# difference panels, in the order compare() returns them
+PANELS = (
+    ("Amplitude", "Amplitude", "log"),
+    ("Phase", "Phase [°]", "linear"),
+    ("Amplitude Ratio to Reference", "Ratio", "log"),
+    ("Phase Difference to Reference", "Difference [°]", "linear"),
+)
+# Subplot position of each panel in a 2x2 grid
+PANEL_POSITIONS = (1, 3, 2, 4)
+
+
+class CompareTab(QWidget):
+    # Overlays responses evaluated on one shared grid, with their amplitude
+    # ratio and phase difference to a reference. Only the evaluated curves
+    # are kept. Lines are animated artists drawn over a cached background,
+    # so showing, hiding or highlighting one redraws just the lines, and
+    # each is decimated to about two points per pixel.
+    def __init__(self, entries):
+        super().__init__()
+        # entries: [(label, response)]
+        self.labels = [label for label, _ in entries]
+        self.freq = shared_grid()
+        self.h, self.errors = evaluate_responses(
+            [resp for _, resp in entries], self.freq
+        )
+        self.reference = next(
+            (i for i in range(len(entries)) if i not in self.errors), 0
+        )
+        self.visible = [True] * len(entries)
+        self.highlighted = None
+        self.background = None
+        self.points = 0
+        self.colors = [
+            to_hex(c) for c in rcParams["axes.prop_cycle"].by_key()["color"]
+        ]
+
+        layout = QHBoxLayout(self)
+        splitter = QSplitter(Qt.Horizontal)
+        layout.addWidget(splitter)
+
+        left_widget = QWidget()
+        left_layout = QVBoxLayout(left_widget)
+        left_layout.addWidget(QLabel("Reference:"))
+        self.reference_combo = QComboBox()
+        self.reference_combo.addItems(self.labels)
+        self.reference_combo.setCurrentIndex(self.reference)
+        self.reference_combo.currentIndexChanged.connect(self.set_reference)
+        left_layout.addWidget(self.reference_combo)
+
+        self.response_list = QListWidget()
+        for row, label in enumerate(self.labels):
+            item = QListWidgetItem(label)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            pixmap = QPixmap(12, 12)
+            pixmap.fill(QColor(self.color(row)))
+            item.setIcon(QIcon(pixmap))
+            if row in self.errors:
+                item.setForeground(QColor("firebrick"))
+                item.setToolTip(
+                    f"Could not be evaluated: {self.errors[row]}"
+                )
+            self.response_list.addItem(item)
+        self.response_list.itemChanged.connect(self.toggle_response)
+        self.response_list.currentRowChanged.connect(self.highlight)
+        left_layout.addWidget(self.response_list)
+
+        btn_layout = QHBoxLayout()
+        show_all = QPushButton("Show All")
+        show_all.clicked.connect(lambda: self.show_all(True))
+        btn_layout.addWidget(show_all)
+        hide_all = QPushButton("Hide All")
+        hide_all.clicked.connect(lambda: self.show_all(False))
+        btn_layout.addWidget(hide_all)
+        left_layout.addLayout(btn_layout)
+        self.hover_label = QLabel()
+        self.hover_label.setWordWrap(True)
+        left_layout.addWidget(self.hover_label)
+        splitter.addWidget(left_widget)
+
+        self.fig = Figure(figsize=(8, 6), dpi=100)
+        self.canvas = FigureCanvas(self.fig)
+        self.axes = []
+        for (title, ylabel, yscale), position in zip(
+            PANELS, PANEL_POSITIONS
+        ):
+            ax = self.fig.add_subplot(
+                2, 2, position, sharex=self.axes[0] if self.axes else None
+            )
+            ax.set_title(title)
+            ax.set_ylabel(ylabel)
+            ax.set_xscale("log")
+            ax.set_yscale(yscale)
+            ax.grid(True, which="both", alpha=0.3)
+            self.axes.append(ax)
+        for ax in self.axes[1], self.axes[3]:
+            ax.set_xlabel("Frequency [Hz]")
+        # lines[row][panel]
+        self.lines = [
+            [
+                ax.plot(
+                    [], [], color=self.color(row), linewidth=1,
+                    animated=True,
+                )[0]
+                for ax in self.axes
+            ]
+            for row in range(len(self.labels))
+        ]
+        self.fig.tight_layout()
+        splitter.addWidget(self.canvas)
+        splitter.setSizes([250, 750])
+
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+        self.canvas.mpl_connect("motion_notify_event", self.on_motion)
+        self.update_lines()
+
+    def color(self, row):
+        return self.colors[row % len(self.colors)]
+
+    def display_points(self):
+        return max(int(self.axes[0].bbox.width) * 2, 200)
+
+    def update_lines(self, rescale=True):
+        # The ratio and difference of every row are computed together, then
+        # every curve is decimated for the current width of the panels
+        self.points = self.display_points()
+        for panel, values in enumerate(compare(self.h, self.reference)):
+            values = np.where(np.isfinite(values), values, np.nan)
+            xs, ys = decimate(self.freq, values, self.points)
+            for row, line in enumerate(self.lines):
+                line[panel].set_data(xs[row], ys[row])
+            if rescale:
+                self._rescale(self.axes[panel], values)
+
+    def _rescale(self, ax, values):
+        # Limits cover every response, visible or not, so that toggling
+        # one does not redraw the axes
+        if ax.get_yscale() == "log":
+            values = np.where(values > 0, values, np.nan)
+        if np.all(np.isnan(values)):
+            return
+        low, high = np.nanmin(values), np.nanmax(values)
+        if ax.get_yscale() == "log":
+            ax.set_ylim(low / 1.2, high * 1.2)
+        else:
+            margin = (high - low) * 0.05 or 1.0
+            ax.set_ylim(low - margin, high + margin)
+        ax.set_xlim(self.freq[0], self.freq[-1])
+
+    def on_draw(self, event):
+        # The axes were drawn without the lines; keep them as background.
+        # A resize changes only how finely the lines are decimated.
+        if self.display_points() != self.points:
+            self.update_lines(rescale=False)
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_lines()
+
+    def _draw_lines(self):
+        rows = [
+            row for row in range(len(self.lines))
+            if self.visible[row] and row != self.highlighted
+        ]
+        if (
+            self.highlighted is not None
+            and self.visible[self.highlighted]
+        ):
+            rows.append(self.highlighted)
+        for row in rows:
+            for line in self.lines[row]:
+                self.fig.draw_artist(line)
+
+    def blit(self):
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_lines()
+        self.canvas.blit(self.fig.bbox)
+
+    def toggle_response(self, item):
+        row = self.response_list.row(item)
+        self.visible[row] = item.checkState() == Qt.Checked
+        self.blit()
+
+    def show_all(self, visible):
+        self.response_list.blockSignals(True)
+        try:
+            for row in range(self.response_list.count()):
+                self.response_list.item(row).setCheckState(
+                    Qt.Checked if visible else Qt.Unchecked
+                )
+        finally:
+            self.response_list.blockSignals(False)
+        self.visible = [visible] * len(self.visible)
+        self.blit()
+
+    def highlight(self, row):
+        row = None if row < 0 else row
+        if row == self.highlighted:
+            return
+        self.highlighted = row
+        for i, lines in enumerate(self.lines):
+            for line in lines:
+                if row is None:
+                    line.set_linewidth(1)
+                    line.set_alpha(1.0)
+                elif i == row:
+                    line.set_linewidth(2.5)
+                    line.set_alpha(1.0)
+                else:
+                    line.set_linewidth(1)
+                    line.set_alpha(0.3)
+        self.hover_label.setText("" if row is None else self.labels[row])
+        self.blit()
+
+    def on_motion(self, event):
+        if event.inaxes not in self.axes:
+            return
+        panel = self.axes.index(event.inaxes)
+        for row in reversed(range(len(self.lines))):
+            if self.visible[row] and self.lines[row][panel].contains(
+                event
+            )[0]:
+                self.response_list.setCurrentRow(row)
+                return
+
+    def set_reference(self, row):
+        self.reference = row
+        self.update_lines()
+        self.canvas.draw_idle()
@@ -0,0 +1,125 @@
+import os
+
+from PyQt5.QtWidgets import (
+    QWidget,
+    QDialog,
+    QVBoxLayout,
+    QFormLayout,
+    QLabel,
+    QComboBox,
+    QDialogButtonBox,
+    QTreeWidget,
+    QTreeWidgetItem,
+)
+from PyQt5.QtGui import QColor, QBrush
+from PyQt5.QtCore import Qt
+
+from SRM_core.diff import diff_inventories
+
+KIND_COLORS = {
+    "added": "seagreen",
+    "removed": "firebrick",
+    "changed": "royalblue",
+}
+
+
+class DiffSelectionDialog(QDialog):
+    # Each loaded file can be compared in its edited state or as saved
+    def __init__(self, filepaths, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diff Inventories")
+        layout = QFormLayout(self)
+
+        self.old_combo = QComboBox()
+        self.new_combo = QComboBox()
+        for combo in (self.old_combo, self.new_combo):
+            for path in filepaths:
+                name = os.path.basename(path)
+                combo.addItem(f"{name} (on disk)", (path, "disk"))
+                combo.addItem(f"{name} (in memory)", (path, "memory"))
+        self.new_combo.setCurrentIndex(1)
+        layout.addRow("Old:", self.old_combo)
+        layout.addRow("New:", self.new_combo)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def get_selection(self):
+        return self.old_combo.currentData(), self.new_combo.currentData()
+
+
+class DiffTab(QWidget):
+    COLUMNS = ("Change", "Object", "Epoch", "Field", "Old", "New")
+
+    def __init__(self, old_label, new_label, old_inventory, new_inventory):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(self.COLUMNS)
+        self.tree.setColumnWidth(0, 110)
+        self.tree.setColumnWidth(1, 180)
+        self.tree.setColumnWidth(2, 200)
+        self.tree.setColumnWidth(3, 200)
+        layout.addWidget(self.tree)
+
+        self.changes = diff_inventories(old_inventory, new_inventory)
+        self.populate(old_label, new_label)
+
+    def populate(self, old_label, new_label):
+        self.tree.clear()
+        counts = {"added": 0, "removed": 0, "changed": 0}
+        groups = {}
+        items = []
+        for change in self.changes:
+            level = change["level"]
+            if change["stage"] is not None:
+                level = f"stage {change['stage']}"
+            if change["kind"] != "changed":
+                counts[change["kind"]] += 1
+                item = QTreeWidgetItem(
+                    [change["kind"], change["id"], change["epoch"], level]
+                )
+                item.setForeground(
+                    0, QBrush(QColor(KIND_COLORS[change["kind"]]))
+                )
+                items.append(item)
+                continue
+
+            # Field changes are grouped under the object they belong to
+            key = (change["id"], change["epoch"])
+            parent = groups.get(key)
+            if parent is None:
+                counts["changed"] += 1
+                parent = QTreeWidgetItem(
+                    ["changed", change["id"], change["epoch"]]
+                )
+                parent.setForeground(0, QBrush(QColor(KIND_COLORS["changed"])))
+                groups[key] = parent
+                items.append(parent)
+            field = change["field"]
+            if change["level"] in ("response", "stage"):
+                field = f"{level}: {field}"
+            child = QTreeWidgetItem(
+                ["", "", "", field, change["old"] or "", change["new"] or ""]
+            )
+            child.setToolTip(4, change["old"] or "")
+            child.setToolTip(5, change["new"] or "")
+            parent.addChild(child)
+        self.tree.addTopLevelItems(items)
+
+        self.summary_label.setText(
+            f"<b>{old_label}</b> → <b>{new_label}</b>: "
+            f"{counts['added']} added, {counts['removed']} removed, "
+            f"{counts['changed']} changed."
+            if self.changes
+            else f"<b>{old_label}</b> and <b>{new_label}</b> are identical."
+        )
+        self.tree.setSortingEnabled(True)
+        self.tree.sortItems(1, Qt.AscendingOrder)
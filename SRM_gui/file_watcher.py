@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from SRM_core.watch import read_baseline, read_changed, same_stat
+
+# Writers often touch a file several times in a row
+DEBOUNCE_MS = 500
+
+
+class InventoryWatcher(QObject):
+    # Watches the loaded files. When a file is watched, after loading or
+    # saving it, the state and digests of the file on disk are read in a
+    # worker thread; they are the base that unsaved edits and later
+    # changes are told apart from. One whose content changed is read again
+    # in the worker and handed over by changed(path, result); the receiver
+    # calls done(path) when it has dealt with it.
+    changed = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+    # Results of the worker, delivered in the GUI thread
+    read_finished = pyqtSignal(str, int, bool, object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.schedule)
+        # path -> file_state() and digests of the file on disk
+        self.states = {}
+        self.bases = {}
+        # Bumped by every watch(); reads started before are stale
+        self.generations = {}
+        self.pending = set()
+        self.reading = set()
+        self.rebase = set()
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEBOUNCE_MS)
+        self.timer.timeout.connect(self.check_pending)
+        self.failed.connect(self.done)
+        self.read_finished.connect(self._read_finished)
+
+    def watch(self, path, baseline=None):
+        # Called after reading or saving path; baseline is read_baseline()
+        # of it when the caller read the file itself
+        self.generations[path] = self.generations.get(path, 0) + 1
+        self.states.pop(path, None)
+        self.bases.pop(path, None)
+        if baseline is not None:
+            self._set_base(path, baseline)
+        elif path in self.reading:
+            # Read once the running read is done
+            self.rebase.add(path)
+        else:
+            self._read(path, read_baseline, True)
+
+    def is_watched(self, path):
+        return path in self.states
+
+    def clear(self):
+        if self.watcher.files():
+            self.watcher.removePaths(self.watcher.files())
+        self.states.clear()
+        self.bases.clear()
+        self.generations.clear()
+        self.pending.clear()
+        self.rebase.clear()
+
+    def schedule(self, path):
+        self.pending.add(path)
+        self.timer.start()
+
+    def check_pending(self):
+        pending, self.pending = self.pending, set()
+        for path in pending:
+            if path in self.reading:
+                # Checked again once the running read is done
+                self.pending.add(path)
+                continue
+            if path not in self.states:
+                continue
+            # A file replaced by a rename is no longer watched
+            if os.path.exists(path) and path not in self.watcher.files():
+                self.watcher.addPath(path)
+            if same_stat(path, self.states[path]):
+                continue
+            self._read(path, read_changed, False)
+
+    def _set_base(self, path, baseline):
+        self.states[path] = baseline["state"]
+        self.bases[path] = baseline["digests"]
+        if path not in self.watcher.files():
+            self.watcher.addPath(path)
+
+    def _read(self, path, reader, is_base):
+        self.reading.add(path)
+        generation = self.generations.get(path)
+        future = self.pool.submit(reader, path)
+        future.add_done_callback(
+            lambda f: self._emit_result(path, generation, is_base, f)
+        )
+
+    def _emit_result(self, path, generation, is_base, future):
+        # Worker thread; the signal is delivered in the GUI thread
+        try:
+            result, error = future.result(), None
+        except Exception as e:
+            result, error = None, str(e)
+        self.read_finished.emit(path, generation or 0, is_base, result, error)
+
+    def _read_finished(self, path, generation, is_base, result, error):
+        if generation != self.generations.get(path):
+            # Watched again, or no longer, since the read started
+            self.done(path)
+        elif is_base:
+            # A file that cannot be read stays unwatched
+            if error is None:
+                self._set_base(path, result)
+            self.done(path)
+        elif error is not None:
+            self.failed.emit(path, error)
+        else:
+            self.changed.emit(path, result)
+
+    def done(self, path, *args):
+        self.reading.discard(path)
+        if path in self.rebase:
+            self.rebase.discard(path)
+            self._read(path, read_baseline, True)
+        elif path in self.pending:
+            self.timer.start()
@@ -0,0 +1,96 @@
+import os
+
+from PyQt5.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QDoubleSpinBox,
+    QTreeWidget,
+    QTreeWidgetItem,
+)
+from PyQt5.QtCore import Qt
+
+from SRM_core.rules import MAX_CHANNEL_OFFSET_KM
+from SRM_core.spatial import COLOCATED_KM
+
+
+class LocationCheckTab(QWidget):
+    COLUMNS = ("Check", "Object", "File", "Other", "Distance (km)")
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        top_layout.addWidget(self.summary_label)
+        top_layout.addStretch()
+        top_layout.addWidget(QLabel("Co-located within (m):"))
+        self.colocated_spin = QDoubleSpinBox()
+        self.colocated_spin.setRange(0.1, 100000.0)
+        self.colocated_spin.setValue(COLOCATED_KM * 1000)
+        top_layout.addWidget(self.colocated_spin)
+        top_layout.addWidget(QLabel("Channel offset above (km):"))
+        self.offset_spin = QDoubleSpinBox()
+        self.offset_spin.setDecimals(3)
+        self.offset_spin.setRange(0.001, 20000.0)
+        self.offset_spin.setValue(MAX_CHANNEL_OFFSET_KM)
+        top_layout.addWidget(self.offset_spin)
+        rerun_btn = QPushButton("Re-run")
+        rerun_btn.clicked.connect(self.run_check)
+        top_layout.addWidget(rerun_btn)
+        layout.addLayout(top_layout)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(self.COLUMNS)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setColumnWidth(0, 140)
+        self.tree.setColumnWidth(1, 180)
+        self.tree.itemDoubleClicked.connect(self.show_in_manager)
+        layout.addWidget(self.tree)
+
+    def run_check(self):
+        index = self.main_window.spatial_index
+        colocated = index.colocated_stations(
+            self.colocated_spin.value() / 1000
+        )
+        distant = index.distant_channels(self.offset_spin.value())
+        items = []
+        for a, b in colocated:
+            item = QTreeWidgetItem(
+                [
+                    "co-located",
+                    a["label"],
+                    os.path.basename(a["file"]),
+                    f"{b['label']} ({os.path.basename(b['file'])})",
+                    "",
+                ]
+            )
+            item.setData(0, Qt.UserRole, a["path"][-1])
+            items.append(item)
+        for entry in distant:
+            item = QTreeWidgetItem(
+                [
+                    "far from station",
+                    entry["label"],
+                    os.path.basename(entry["file"]),
+                    entry["path"][1].code,
+                    f"{entry['distance_km']:.3f}",
+                ]
+            )
+            item.setData(0, Qt.UserRole, entry["path"][-1])
+            items.append(item)
+        self.tree.clear()
+        self.tree.addTopLevelItems(items)
+        self.summary_label.setText(
+            f"{len(colocated)} co-located station pair(s), "
+            f"{len(distant)} channel(s) far from their station."
+        )
+
+    def show_in_manager(self, item, column):
+        manager = self.main_window.manager_tab
+        if manager.select_objects([item.data(0, Qt.UserRole)]):
+            self.main_window.tabs.setCurrentIndex(0)
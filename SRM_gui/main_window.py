@@ -13,7 +13,6 @@ from PyQt5.QtWidgets import (
     QDialog,
     QDialogButtonBox,
     QLineEdit,
-    QComboBox,
     QInputDialog,
     QGroupBox,
     QRadioButton,
@@ -24,25 +23,91 @@ from PyQt5.QtWidgets import (
     QAction,
     QDateTimeEdit,
     QTabBar,
+    QTableWidget,
+    QTableWidgetItem,
+    QProgressDialog,
+    QHeaderView,
+    QApplication,
+    QAbstractItemView,
+    QCompleter,
+    QListWidget,
+    QListWidgetItem,
+    QSlider,
+    QUndoStack,
 )
 from copy import deepcopy
 from PyQt5.QtWebEngineWidgets import QWebEngineView
+from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtGui import QColor, QFont, QBrush
-from PyQt5.QtCore import Qt, QTimer, QDateTime
+from PyQt5.QtCore import (
+    Qt,
+    QTimer,
+    QDateTime,
+    QStringListModel,
+    QObject,
+    QSettings,
+    pyqtSignal,
+    pyqtSlot,
+)
 from SRM_core.utils import (
     combine_resp,
     resource_path,
     wrap_text,
     convert_inventory_to_xml,
-    natural_sort_key
+    natural_sort_key,
+    is_nrl_root,
+    get_nrl,
+    collect_channels,
+    collect_stations,
+    apply_response_to_channels,
+    detach_response,
+)
+from SRM_core.mseed import scan_mseed, scan_mseed_archive
+from SRM_core.rules import RuleEngine
+from SRM_core.search import SearchIndex, INDEXED_FIELDS
+from SRM_core.epochs import EpochIndex
+from SRM_core.spatial import SpatialIndex
+from SRM_core.inventory_io import (
+    is_inventory_file,
+    read_inventory_file,
+    read_inventory_files,
+    split_suffix,
+)
+from SRM_core.stationxml import write_stationxml
+from SRM_core.project import (
+    EXTENSION as PROJECT_EXTENSION,
+    ShardedProject,
+    is_project,
+)
+from SRM_core.diff import index_keys
+from SRM_core.watch import (
+    apply_reload,
+    key_label,
+    plan_reload,
+    read_loaded,
+    response_pairs,
+)
+from SRM_gui.file_watcher import InventoryWatcher
+from SRM_core.residency import LoadedFiles, measure, pack
+from SRM_gui.tab_pool import OffloadedTab, TabPool
+from SRM_core.stage_arrays import array_fields
+from SRM_core.plot_export import FORMATS, draw_response, export_plots
+from SRM_core.workspace import Workspace, save_workspace, EXTENSION
+from SRM_core.builder import (
+    build_channel,
+    build_station_inventory,
+    group_archive_streams,
+    read_station_table,
+    validate_station_table,
+    table_instrument_keys,
+    build_inventory_from_table,
+    STATION_TABLE_COLUMNS,
+    OPTIONAL_TABLE_COLUMNS,
+    NRL_KEY_SEPARATOR,
 )
 import os
 import sys
-from matplotlib.backends.backend_qt5agg import (
-    FigureCanvasQTAgg as FigureCanvas,
-)
-from matplotlib.figure import Figure
-from obspy import Inventory, UTCDateTime, read
+from obspy import Inventory, UTCDateTime
 from obspy.core.inventory.response import Response
 from obspy.core.inventory.response import (
     ResponseStage,
@@ -53,68 +118,89 @@ from obspy.core.inventory.response import (
     PolynomialResponseStage,
     ResponseListElement,
 )
-import numpy as np
 from obspy import read_inventory
 from obspy.core.inventory import Station, Network, Channel
 import configparser
 import copy
 import json
-from obspy.clients.nrl import NRL
 from pathlib import Path
 import colorsys
 
 
-class MplCanvas(FigureCanvas):
-    def __init__(self, parent=None):
-        self.fig = Figure(figsize=(5, 4), dpi=100)
-        self.ax_amp = self.fig.add_subplot(211)
-        self.ax_phase = self.fig.add_subplot(212, sharex=self.ax_amp)
-        self.fig.tight_layout()
-        super().__init__(self.fig)
-
-
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Seismic Inventory Manager")
         self.resize(1200, 700)
 
-        self.loaded_files = {}
+        self.loaded_files = LoadedFiles()
+        self.loaded_files.on_wake = self.file_woken
         self.open_tabs = {}
+        self.rules = RuleEngine()
+        self.search_index = SearchIndex()
+        self.epoch_index = EpochIndex()
+        self.spatial_index = SpatialIndex()
+        self.undo_stack = QUndoStack(self)
+        self.workspace = None
+        self.restore_queue = []
+        self.restore_dirty = set()
+        # One inventory per event loop pass keeps the window responsive and
+        # shows each file as soon as it is ready
+        self.restore_timer = QTimer(self)
+        self.restore_timer.setSingleShot(True)
+        self.restore_timer.setInterval(0)
+        self.restore_timer.timeout.connect(self.restore_next_file)
+        # Files with edits not yet saved
+        self.dirty_files = set()
+        # Sharded projects among loaded_files, by their folder
+        self.projects = {}
+        self.file_watcher = InventoryWatcher(self)
+        self.file_watcher.changed.connect(self.file_changed_on_disk)
+        self.file_watcher.failed.connect(self.file_read_failed)
+        # Megabytes the loaded inventories may take before the least
+        # recently used ones are hibernated; 0 for no limit
+        self.settings = QSettings("SRM", "Seismic Response Manager")
+        self.memory_budget = int(self.settings.value("memory_budget", 0))
+        self.budget_timer = QTimer(self)
+        self.budget_timer.setSingleShot(True)
+        self.budget_timer.setInterval(1000)
+        self.budget_timer.timeout.connect(self.enforce_memory_budget)
+        # Explorer and response tabs kept built at the same time
+        self.tab_cap = int(self.settings.value("tab_cap", 8))
 
         self.nrl_root = resource_path(os.path.join("resources", "NRL"))
-        while True:
-            try:
-                self.nrl = NRL(root=self.nrl_root)
-                break
-            except Exception:
-                reply = QMessageBox.question(
-                    self,
-                    "NRL Not Found",
-                    "NRL folder not detected at:\n"
-                    f"{self.nrl_root}\n\nWould you like to select the NRL"
-                    f"folder manually?",
-                    QMessageBox.Yes | QMessageBox.No,
-                    QMessageBox.Yes,
-                )
-                if reply == QMessageBox.Yes:
-                    folder = QFileDialog.getExistingDirectory(
-                        self, "Select NRL Folder", os.path.expanduser("~")
-                    )
-                    if folder:
-                        self.nrl_root = folder
-                        continue
-                QMessageBox.critical(
-                    self,
-                    "NRL Required",
-                    "NRL folder is required to run this application."
-                    "\nExiting.",
+        while not is_nrl_root(self.nrl_root):
+            reply = QMessageBox.question(
+                self,
+                "NRL Not Found",
+                "NRL folder not detected at:\n"
+                f"{self.nrl_root}\n\nWould you like to select the NRL"
+                f"folder manually?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.Yes,
+            )
+            if reply == QMessageBox.Yes:
+                folder = QFileDialog.getExistingDirectory(
+                    self, "Select NRL Folder", os.path.expanduser("~")
                 )
-                sys.exit(1)
+                if folder:
+                    self.nrl_root = folder
+                    continue
+            QMessageBox.critical(
+                self,
+                "NRL Required",
+                "NRL folder is required to run this application."
+                "\nExiting.",
+            )
+            sys.exit(1)
 
         self.setup_menu()
         self.setup_ui()
 
+    @property
+    def nrl(self):
+        return get_nrl(self.nrl_root)
+
     def setup_menu(self):
         menubar = self.menuBar()
         file_menu = menubar.addMenu("File")
@@ -127,13 +213,75 @@ class MainWindow(QMainWindow):
         save_all = QAction("Save All Files", self)
         save_all.triggered.connect(self.save_all_files)
         file_menu.addAction(save_all)
+        file_menu.addSeparator()
+        open_workspace = QAction("Open Workspace", self)
+        open_workspace.triggered.connect(self.open_workspace)
+        file_menu.addAction(open_workspace)
+        save_workspace_action = QAction("Save Workspace", self)
+        save_workspace_action.triggered.connect(self.save_workspace)
+        file_menu.addAction(save_workspace_action)
+        open_project = QAction("Open Project", self)
+        open_project.triggered.connect(self.open_project)
+        file_menu.addAction(open_project)
+        save_project = QAction("Save File As Project", self)
+        save_project.triggered.connect(self.save_as_project)
+        file_menu.addAction(save_project)
+        export_project = QAction("Export Project", self)
+        export_project.triggered.connect(self.export_project)
+        file_menu.addAction(export_project)
+        open_store = QAction("Open Inventory Store", self)
+        open_store.triggered.connect(self.open_store)
+        file_menu.addAction(open_store)
+        memory_budget = QAction("Memory Budget", self)
+        memory_budget.triggered.connect(self.set_memory_budget)
+        file_menu.addAction(memory_budget)
+        tab_cap = QAction("Open Tab Limit", self)
+        tab_cap.triggered.connect(self.set_tab_cap)
+        file_menu.addAction(tab_cap)
+        file_menu.addSeparator()
         exit_action = QAction("Exit", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
+        edit_menu = menubar.addMenu("Edit")
+        undo_action = self.undo_stack.createUndoAction(self, "Undo")
+        undo_action.setShortcut("Ctrl+Z")
+        edit_menu.addAction(undo_action)
+        redo_action = self.undo_stack.createRedoAction(self, "Redo")
+        redo_action.setShortcut("Ctrl+Shift+Z")
+        edit_menu.addAction(redo_action)
         tools_menu = menubar.addMenu("Tools")
         build_inventory = QAction("Build Inventory", self)
         build_inventory.triggered.connect(self.build_new_inventory)
         tools_menu.addAction(build_inventory)
+        build_from_archive = QAction("Build Inventories from Archive", self)
+        build_from_archive.triggered.connect(
+            self.build_inventories_from_archive
+        )
+        tools_menu.addAction(build_from_archive)
+        build_from_csv = QAction("Build Inventory from CSV", self)
+        build_from_csv.triggered.connect(self.build_inventory_from_csv)
+        tools_menu.addAction(build_from_csv)
+        merge_action = QAction("Merge Inventories", self)
+        merge_action.triggered.connect(self.merge_inventories)
+        tools_menu.addAction(merge_action)
+        diff_action = QAction("Diff Inventories", self)
+        diff_action.triggered.connect(self.open_diff_tab)
+        tools_menu.addAction(diff_action)
+        channel_grid = QAction("Channel Table", self)
+        channel_grid.triggered.connect(self.open_channel_grid_tab)
+        tools_menu.addAction(channel_grid)
+        check_locations = QAction("Check Station Locations", self)
+        check_locations.triggered.connect(self.open_location_check_tab)
+        tools_menu.addAction(check_locations)
+        validate = QAction("Validate Inventories", self)
+        validate.triggered.connect(self.open_validation_tab)
+        tools_menu.addAction(validate)
+        export_plots_action = QAction("Export Response Plots", self)
+        export_plots_action.triggered.connect(self.export_response_plots)
+        tools_menu.addAction(export_plots_action)
+        compare_action = QAction("Compare Responses", self)
+        compare_action.triggered.connect(self.compare_responses)
+        tools_menu.addAction(compare_action)
         convert_to_xml = QAction("Convert to XML", self)
         convert_to_xml.triggered.connect(self.convert_to_xml)
         tools_menu.addAction(convert_to_xml)
@@ -147,45 +295,525 @@ class MainWindow(QMainWindow):
         self.tabs.setTabsClosable(True)
         self.tabs.tabCloseRequested.connect(self.close_tab)
         self.tabs.tabBar().setTabButton(0, QTabBar.RightSide, None)
+        self.tab_pool = TabPool(
+            self.tabs, self.open_tabs, self.build_pooled_tab, self.tab_cap
+        )
 
     def save_all_files(self):
-
-        for filepath, inv in self.loaded_files.items():
+        files = self.loaded_files
+        for filepath in list(files):
+            # Hibernated files are only woken to save their edits
+            if (
+                files.is_hibernated(filepath)
+                and filepath not in self.dirty_files
+            ):
+                continue
             try:
-                inv.write(filepath, format="STATIONXML")
-                for (tab_type, tab_id), widget in self.open_tabs.items():
-                    if tab_type == "explorer" and isinstance(
-                        widget, ExplorerTab
-                    ):
-                        inv = self.loaded_files.get(tab_id)
-                        if inv:
-                            widget.populate_tree(inv)
-                self.manager_tab.refresh()
+                inv = files[filepath]
+                if filepath in self.projects:
+                    self.projects[filepath].save(inv)
+                else:
+                    write_stationxml(inv, filepath)
+                    self.file_watcher.watch(filepath)
+                self.dirty_files.discard(filepath)
+                self.loaded_files.sizes.pop(filepath, None)
             except Exception as e:
                 QMessageBox.warning(
                     self, "Error", f"Failed to save {filepath}:\n{e}"
                 )
+        # Saving changes no objects, so the views are rebuilt once
+        for (tab_type, tab_id), widget in self.open_tabs.items():
+            if tab_type == "explorer" and isinstance(widget, ExplorerTab):
+                inv = self.loaded_files.get(tab_id)
+                if inv:
+                    widget.populate_tree(inv)
+        self.manager_tab.refresh()
+        self.budget_timer.start()
         QMessageBox.information(
             self, "Save Complete", "All inventories saved successfully."
         )
 
+    def file_changed_on_disk(self, path, result):
+        # Another program rewrote a loaded file. What changed there is merged
+        # into the open inventory; unsaved edits here to the same stations
+        # are a conflict the user decides.
+        watcher = self.file_watcher
+        try:
+            if self.loaded_files.is_hibernated(path):
+                # Without unsaved edits the new version is simply read when
+                # the file is woken
+                self.loaded_files.invalidate(path)
+                watcher.states[path] = result["state"]
+                watcher.bases[path] = result["digests"]
+                return
+            inv = self.loaded_files.get(path)
+            if inv is None or not watcher.is_watched(path):
+                return
+            if result["state"]["hash"] == watcher.states[path]["hash"]:
+                watcher.states[path] = result["state"]
+                return
+            # Only the stations changed on disk are hashed here
+            memory_index = index_keys(inv)
+            external, conflicts = plan_reload(
+                watcher.bases[path], memory_index, result["digests"]
+            )
+            take = external
+            if conflicts:
+                labels = sorted(key_label(k) for k in conflicts)
+                if len(labels) > 20:
+                    labels = labels[:20] + [f"... and {len(labels) - 20} more"]
+                answer = QMessageBox.question(
+                    self,
+                    "File Changed on Disk",
+                    f"{os.path.basename(path)} was changed by another "
+                    "program, and these have unsaved edits here too:\n"
+                    + "\n".join(labels)
+                    + "\n\nReplace them with the version on disk? Other "
+                    "changes on disk are loaded either way.",
+                    QMessageBox.Yes | QMessageBox.No,
+                    QMessageBox.No,
+                )
+                if answer != QMessageBox.Yes:
+                    take = external - conflicts
+            removed, added = apply_reload(
+                inv, memory_index, result["index"], take
+            )
+            watcher.states[path] = result["state"]
+            watcher.bases[path] = result["digests"]
+            self.manager_tab.sync_file(path, removed, added)
+            if removed:
+                self.undo_stack.clear()
+            self.refresh_after_response_change(
+                {path}, response_pairs(removed, added)
+            )
+            grid = self.open_tabs.get(("grid", "all"))
+            if grid is not None:
+                grid.reload()
+            self.statusBar().showMessage(
+                f"Reloaded {len(take)} change(s) to "
+                f"{os.path.basename(path)} from disk",
+                5000,
+            )
+        finally:
+            watcher.done(path)
+
+    def file_read_failed(self, path, error):
+        if path in self.loaded_files:
+            self.statusBar().showMessage(
+                f"{os.path.basename(path)} changed on disk but could not be "
+                f"read: {error}",
+                10000,
+            )
+
+    def set_memory_budget(self):
+        budget, ok = QInputDialog.getInt(
+            self,
+            "Memory Budget",
+            "Hibernate the least recently used inventories without unsaved\n"
+            "changes when all of them take more than (MB, 0 for no limit):",
+            self.memory_budget,
+            0,
+            1 << 20,
+            256,
+        )
+        if not ok:
+            return
+        self.memory_budget = budget
+        self.settings.setValue("memory_budget", budget)
+        self.budget_timer.start()
+
+    def set_tab_cap(self):
+        cap, ok = QInputDialog.getInt(
+            self,
+            "Open Tab Limit",
+            "Explorer and response tabs kept open; the least recently\n"
+            "shown ones beyond this are rebuilt when shown again:",
+            self.tab_cap,
+            1,
+            1000,
+        )
+        if not ok:
+            return
+        self.tab_cap = self.tab_pool.cap = cap
+        self.settings.setValue("tab_cap", cap)
+        self.tab_pool.trim()
+
+    def build_pooled_tab(self, key, state):
+        kind, tab_id = key
+        if kind == "response":
+            return ResponseTab(
+                state["response"],
+                self,
+                state["filepath"],
+                self.nrl_root,
+                state["original_response"],
+            )
+        explorer = ExplorerTab(filepath=tab_id, main_window=self)
+        inventory = self.loaded_files.get(tab_id)
+        if inventory is not None:
+            explorer.populate_tree(inventory)
+            explorer.restore_view(state)
+        return explorer
+
+    def pinned_files(self):
+        # Files whose objects are held by open tabs or the undo history;
+        # hibernating them would leave those editing stale copies
+        pinned = set(self.projects)
+        for i in range(self.undo_stack.count()):
+            pinned.update(self.undo_stack.command(i).filepaths)
+        for (tab_type, tab_id), widget in self.open_tabs.items():
+            if tab_type == "explorer":
+                # An offloaded explorer holds no objects
+                if not isinstance(widget, OffloadedTab):
+                    pinned.add(tab_id)
+            elif tab_type == "response" and isinstance(widget, OffloadedTab):
+                pinned.add(widget.state["filepath"])
+            elif tab_type == "response":
+                pinned.add(widget.filepath)
+            elif tab_type == "diff":
+                pinned.update(path for path, _ in tab_id)
+            elif tab_type == "compare":
+                # Holds only the evaluated curves
+                continue
+            elif tab_type != "store":
+                # The other tabs show every loaded file
+                return set(self.loaded_files)
+        return pinned
+
+    def enforce_memory_budget(self):
+        # One step per pass so that the window stays responsive: a resident
+        # file is measured, or the least recently used file that can go is
+        # hibernated. Without a budget nothing is measured.
+        if not self.memory_budget:
+            return
+        files = self.loaded_files
+        for path, inv in files.resident():
+            if path not in files.sizes:
+                files.sizes[path] = measure(inv)
+                self.manager_tab.show_memory(path)
+                self.budget_timer.start()
+                return
+        budget = self.memory_budget << 20
+        if sum(files.sizes.values()) <= budget:
+            return
+        pinned = self.pinned_files()
+        watcher = self.file_watcher
+        for path in files.least_recently_used():
+            # Only unchanged files of which the watcher knows the saved state
+            if (
+                path in pinned
+                or path in self.dirty_files
+                or not watcher.is_watched(path)
+            ):
+                continue
+            inv = files.peek(path)
+            data = pack(inv)
+            self.manager_tab.hibernate_file(path, inv)
+            files.hibernate(path, data)
+            self.manager_tab.show_memory(path)
+            self.statusBar().showMessage(
+                f"Hibernated {os.path.basename(path)}", 3000
+            )
+            self.budget_timer.start()
+            return
+
+    def file_woken(self, path, inventory):
+        self.manager_tab.wake_file(path, inventory)
+        self.budget_timer.start()
+
+    def open_project(self):
+        path = QFileDialog.getExistingDirectory(
+            self, f"Select a Project Folder (*{PROJECT_EXTENSION})"
+        )
+        if not path:
+            return
+        path = os.path.abspath(path)
+        if path in self.loaded_files:
+            QMessageBox.warning(self, "Error", f"{path} is already open.")
+            return
+        try:
+            project = ShardedProject(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to open project:\n{e}")
+            return
+        pattern, ok = QInputDialog.getText(
+            self,
+            "Open Project",
+            f"{project.station_count()} stations. Load the stations "
+            "matching (NET.STA, wildcards allowed):",
+            text="*",
+        )
+        if not ok:
+            return
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            inv = project.load(pattern.strip() or "*")
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to load project:\n{e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.projects[path] = project
+        self.loaded_files[path] = inv
+        self.manager_tab.add_file_to_tree(path, inv)
+
+    def save_as_project(self):
+        files = [p for p in self.loaded_files if p not in self.projects]
+        if not files:
+            QMessageBox.warning(
+                self, "No Data", "Load a StationXML or dataless file first."
+            )
+            return
+        source, ok = QInputDialog.getItem(
+            self, "Save File As Project", "File:", files, 0, False
+        )
+        if not ok:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save As Project",
+            os.path.splitext(source)[0] + PROJECT_EXTENSION,
+            f"SRM Project (*{PROJECT_EXTENSION})",
+        )
+        if not path:
+            return
+        if not path.endswith(PROJECT_EXTENSION):
+            path += PROJECT_EXTENSION
+        path = os.path.abspath(path)
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            project = ShardedProject.create(path, self.loaded_files[source])
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to save project:\n{e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        # The project takes the place of the file it was made from
+        key = ("explorer", source)
+        if key in self.open_tabs:
+            self.close_tab(self.tabs.indexOf(self.open_tabs[key]))
+        self.loaded_files.rename(source, path)
+        self.dirty_files.discard(source)
+        self.projects[path] = project
+        self.manager_tab.refresh()
+
+    def export_project(self):
+        if not self.projects:
+            QMessageBox.warning(self, "No Project", "Open a project first.")
+            return
+        source, ok = QInputDialog.getItem(
+            self,
+            "Export Project",
+            "Saved project to write as one StationXML file:",
+            list(self.projects),
+            0,
+            False,
+        )
+        if not ok:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Project",
+            os.path.splitext(source)[0] + ".xml",
+            STATIONXML_FILTERS,
+        )
+        if not path:
+            return
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            ShardedProject(source).export(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to export:\n{e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        QMessageBox.information(
+            self, "Success", f"Project exported to:\n{path}"
+        )
+
+    def save_workspace(self):
+        if not self.loaded_files:
+            QMessageBox.warning(self, "No Data", "Nothing to save.")
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Workspace", "", f"SRM Workspace (*{EXTENSION})"
+        )
+        if not path:
+            return
+        if not path.endswith(EXTENSION):
+            path += EXTENSION
+        tabs = [
+            list(key)
+            for key, widget in sorted(
+                self.open_tabs.items(),
+                key=lambda item: self.tabs.indexOf(item[1]),
+            )
+            if key[0] in RESTORED_TABS
+        ]
+        current = self.tabs.currentWidget()
+        state = {
+            "tabs": tabs,
+            "current_tab": next(
+                (list(k) for k, w in self.open_tabs.items() if w is current),
+                None,
+            ),
+            "map": self.manager_tab.map_bridge.view,
+            "dirty": sorted(self.dirty_files),
+        }
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            save_workspace(path, self.loaded_files, state)
+        except Exception as e:
+            QMessageBox.warning(
+                self, "Error", f"Failed to save workspace:\n{e}"
+            )
+        finally:
+            QApplication.restoreOverrideCursor()
+
+    def open_workspace(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open Workspace", "", f"SRM Workspace (*{EXTENSION})"
+        )
+        if not path:
+            return
+        if self.loaded_files:
+            text = "The inventories loaded now are closed."
+            if self.dirty_files:
+                text += (
+                    f" {len(self.dirty_files)} of them have unsaved edits, "
+                    "which are lost."
+                )
+            answer = QMessageBox.question(
+                self,
+                "Open Workspace",
+                f"{text}\n\nOpen the workspace anyway?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            if answer != QMessageBox.Yes:
+                return
+        try:
+            workspace = Workspace(path)
+        except Exception as e:
+            QMessageBox.warning(
+                self, "Error", f"Failed to open workspace:\n{e}"
+            )
+            return
+        if self.workspace is not None:
+            # The restore of another workspace is still running
+            self.restore_timer.stop()
+            self.workspace.close()
+        for index in reversed(range(1, self.tabs.count())):
+            self.close_tab(index)
+        self.loaded_files.clear()
+        self.dirty_files.clear()
+        self.projects.clear()
+        self.file_watcher.clear()
+        self.undo_stack.clear()
+        self.manager_tab.refresh()
+        changed = workspace.changed_on_disk()
+        if changed:
+            QMessageBox.information(
+                self,
+                "Workspace",
+                "These files changed on disk after the workspace was "
+                "saved; the workspace state is restored:\n"
+                + "\n".join(changed),
+            )
+        self.workspace = workspace
+        self.restore_queue = list(workspace.files)
+        # Workspaces saved before edits were tracked may hold any
+        self.restore_dirty = set(
+            workspace.state.get("dirty", workspace.files)
+        ).union(changed)
+        self.restore_timer.start()
+
+    def restore_next_file(self):
+        workspace = self.workspace
+        if self.restore_queue:
+            filepath = self.restore_queue.pop(0)
+            done = len(workspace.files) - len(self.restore_queue)
+            self.statusBar().showMessage(
+                f"Restoring {os.path.basename(filepath)} "
+                f"({done}/{len(workspace.files)})"
+            )
+            try:
+                inv = workspace.load(filepath)
+            except Exception as e:
+                QMessageBox.warning(
+                    self, "Error", f"Failed to restore {filepath}:\n{e}"
+                )
+            else:
+                self.loaded_files[filepath] = inv
+                if filepath in self.restore_dirty:
+                    self.mark_dirty(filepath)
+                self.manager_tab.add_file_to_tree(filepath, inv)
+                # The file on disk, not the restored state, is the base
+                if not is_project(filepath):
+                    self.file_watcher.watch(filepath)
+            self.restore_timer.start()
+            return
+
+        workspace.close()
+        self.workspace = None
+        state = workspace.state
+        for kind, tab_id in state.get("tabs", []):
+            if kind == "explorer":
+                if tab_id in self.loaded_files:
+                    self.open_explorer_tab(tab_id, self.loaded_files[tab_id])
+            else:
+                RESTORED_TABS[kind](self)
+        current = self.open_tabs.get(tuple(state.get("current_tab") or ()))
+        self.tabs.setCurrentIndex(
+            self.tabs.indexOf(current) if current is not None else 0
+        )
+        view = state.get("map")
+        if view:
+            self.manager_tab.map_view.page().runJavaScript(
+                f"map.setView([{view[0]}, {view[1]}], {view[2]});"
+            )
+        self.statusBar().showMessage(
+            f"Restored {len(self.loaded_files)} inventories from "
+            f"{os.path.basename(workspace.path)}",
+            5000,
+        )
+
     def add_data(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Data Folder")
         if not folder:
             return
 
-        exts = (".xml", ".dataless", ".dless")
-        for file in Path(folder).rglob("*"):
-            if file.suffix.lower() in exts:
-                try:
-                    abs_path = str(file.resolve())
-                    inv = read_inventory(abs_path)
-                    self.loaded_files[abs_path] = inv
-                    self.manager_tab.add_file_to_tree(abs_path, inv)
-                except Exception as e:
-                    QMessageBox.warning(
-                        self, "Error", f"Failed to load {file}:\n{e}"
-                    )
+        paths = [
+            str(file.resolve())
+            for file in Path(folder).rglob("*")
+            if file.is_file() and is_inventory_file(file.name)
+        ]
+        if not paths:
+            return
+
+        progress = QProgressDialog(
+            "Reading inventories...", "Cancel", 0, len(paths), self
+        )
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def report(done, total):
+            progress.setValue(done)
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        # Files are read, decompressed and hashed in worker threads
+        results, errors = read_inventory_files(
+            paths, progress=report, reader=read_loaded
+        )
+        progress.close()
+        for abs_path, result in results.items():
+            inv = result.pop("inventory")
+            self.loaded_files[abs_path] = inv
+            self.manager_tab.add_file_to_tree(abs_path, inv)
+            self.file_watcher.watch(abs_path, result)
+        for file, e in errors:
+            QMessageBox.warning(self, "Error", f"Failed to load {file}:\n{e}")
 
     def open_explorer_tab(self, filepath, inventory):
         key = ("explorer", filepath)
@@ -201,11 +829,17 @@ class MainWindow(QMainWindow):
             index = self.tabs.indexOf(self.open_tabs[key])
             self.tabs.setCurrentIndex(index)
 
-    def open_response_tab(self, response_id, response_data, explorer_tab):
+    def open_response_tab(
+        self, response_id, response_data, explorer_tab, channel=None
+    ):
         key = ("response", response_id)
         if key not in self.open_tabs:
+            if channel is not None:
+                response_data = self.own_response(
+                    channel, explorer_tab.filepath
+                )
             response_tab = ResponseTab(
-                response_data, self, explorer_tab, self.nrl_root
+                response_data, self, explorer_tab.filepath, self.nrl_root
             )
             index = self.tabs.addTab(response_tab, f"Response - {response_id}")
             self.open_tabs[key] = response_tab
@@ -214,6 +848,461 @@ class MainWindow(QMainWindow):
             index = self.tabs.indexOf(self.open_tabs[key])
             self.tabs.setCurrentIndex(index)
 
+    def open_validation_tab(self):
+        if not self.loaded_files:
+            QMessageBox.warning(
+                self, "No Data", "Load at least one inventory to validate."
+            )
+            return
+        from SRM_gui.validation_tab import ValidationTab
+
+        key = ("validation", "all")
+        if key not in self.open_tabs:
+            self.open_tabs[key] = ValidationTab(self)
+            self.tabs.addTab(self.open_tabs[key], "Validation")
+        widget = self.open_tabs[key]
+        self.tabs.setCurrentIndex(self.tabs.indexOf(widget))
+        widget.run_validation()
+
+    def selected_channel_entries(self):
+        # (filepath, seed_id, channel) of the channels selected in the
+        # manager, or of all channels
+        from SRM_core.validation import iter_channels
+
+        selection = self.manager_tab.selected_channels()
+        if not selection:
+            return list(iter_channels(self.loaded_files))
+        chosen = {id(chan) for chans in selection.values() for chan in chans}
+        files = {path: self.loaded_files[path] for path in selection}
+        return [
+            entry for entry in iter_channels(files) if id(entry[2]) in chosen
+        ]
+
+    def export_response_plots(self):
+        if not self.loaded_files:
+            QMessageBox.warning(
+                self, "No Data", "Load at least one inventory first."
+            )
+            return
+        channels = self.selected_channel_entries()
+        if not channels:
+            QMessageBox.warning(self, "No Channels", "No channels selected.")
+            return
+        fmt, ok = QInputDialog.getItem(
+            self,
+            "Export Response Plots",
+            f"Plot format for {len(channels)} channels:",
+            [f.upper() for f in FORMATS],
+            0,
+            False,
+        )
+        if not ok:
+            return
+        folder = QFileDialog.getExistingDirectory(
+            self, "Select Output Folder"
+        )
+        if not folder:
+            return
+
+        progress = QProgressDialog(
+            "Plotting responses...", "Cancel", 0, 0, self
+        )
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def report(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        # Each distinct response is plotted once, in worker processes
+        try:
+            index, count, errors = export_plots(
+                channels, folder, fmt.lower(), progress=report
+            )
+        except Exception as e:
+            progress.close()
+            QMessageBox.critical(
+                self, "Error", f"Failed to export plots:\n{e}"
+            )
+            return
+        progress.close()
+        message = (
+            f"Plotted {count} distinct responses of {len(channels)} "
+            f"channels into {folder}.\nSummary: {index}"
+        )
+        if errors:
+            message += (
+                f"\n\n{len(errors)} responses could not be evaluated; "
+                "they are marked in the summary."
+            )
+        QMessageBox.information(self, "Plots Exported", message)
+
+    def compare_responses(self):
+        entries = [
+            entry for entry in self.selected_channel_entries()
+            if entry[2].response is not None
+        ]
+        if len(entries) < 2:
+            QMessageBox.warning(
+                self,
+                "Compare Responses",
+                "Select at least two channels with a response in the "
+                "Manager.",
+            )
+            return
+        from SRM_gui.compare_tab import CompareTab
+
+        several = len({filepath for filepath, _, _ in entries}) > 1
+        labels = []
+        for filepath, seed_id, chan in entries:
+            label = seed_id
+            if chan.start_date is not None:
+                label += f" {chan.start_date.date}"
+            if several:
+                label += f" ({os.path.basename(filepath)})"
+            labels.append(label)
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            compare_tab = CompareTab(
+                [
+                    (label, entry[2].response)
+                    for label, entry in zip(labels, entries)
+                ]
+            )
+        finally:
+            QApplication.restoreOverrideCursor()
+        key = ("compare", tuple(labels))
+        if key in self.open_tabs:
+            self.close_tab(self.tabs.indexOf(self.open_tabs[key]))
+        self.open_tabs[key] = compare_tab
+        index = self.tabs.addTab(compare_tab, f"Compare ({len(entries)})")
+        self.tabs.setCurrentIndex(index)
+
+    def open_channel_grid_tab(self):
+        if not self.loaded_files:
+            QMessageBox.warning(
+                self, "No Data", "Load at least one inventory first."
+            )
+            return
+        from SRM_gui.channel_grid import ChannelGridTab
+
+        key = ("grid", "all")
+        if key not in self.open_tabs:
+            self.open_tabs[key] = ChannelGridTab(self)
+            self.tabs.addTab(self.open_tabs[key], "Channels")
+        else:
+            self.open_tabs[key].reload()
+        self.tabs.setCurrentIndex(self.tabs.indexOf(self.open_tabs[key]))
+
+    def open_store(self):
+        from SRM_core.store import EXTENSION as STORE_EXTENSION, InventoryStore
+        from SRM_gui.store_tab import StoreTab
+
+        # A new file name creates an empty store
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Open or Create Inventory Store",
+            "",
+            f"SRM Inventory Store (*{STORE_EXTENSION})",
+            options=QFileDialog.DontConfirmOverwrite,
+        )
+        if not path:
+            return
+        if not path.endswith(STORE_EXTENSION):
+            path += STORE_EXTENSION
+        key = ("store", os.path.abspath(path))
+        if key not in self.open_tabs:
+            try:
+                store = InventoryStore(path)
+            except Exception as e:
+                QMessageBox.warning(
+                    self, "Error", f"Failed to open inventory store:\n{e}"
+                )
+                return
+            self.open_tabs[key] = StoreTab(self, store)
+            self.tabs.addTab(
+                self.open_tabs[key], f"Store - {os.path.basename(path)}"
+            )
+        self.tabs.setCurrentIndex(self.tabs.indexOf(self.open_tabs[key]))
+
+    def open_location_check_tab(self):
+        if not self.loaded_files:
+            QMessageBox.warning(
+                self, "No Data", "Load at least one inventory to check."
+            )
+            return
+        from SRM_gui.location_check import LocationCheckTab
+
+        key = ("locations", "all")
+        if key not in self.open_tabs:
+            self.open_tabs[key] = LocationCheckTab(self)
+            self.tabs.addTab(self.open_tabs[key], "Locations")
+        widget = self.open_tabs[key]
+        self.tabs.setCurrentIndex(self.tabs.indexOf(widget))
+        widget.run_check()
+
+    def open_diff_tab(self):
+        if not self.loaded_files:
+            QMessageBox.warning(
+                self, "No Data", "Load at least one inventory to compare."
+            )
+            return
+        from SRM_gui.diff_tab import DiffSelectionDialog, DiffTab
+
+        dlg = DiffSelectionDialog(list(self.loaded_files), self)
+        if dlg.exec_() != QDialog.Accepted:
+            return
+        sides = dlg.get_selection()
+        inventories = []
+        labels = []
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            for path, state in sides:
+                if state == "disk" and path in self.projects:
+                    inventories.append(ShardedProject(path).load())
+                elif state == "disk":
+                    inventories.append(read_inventory_file(path))
+                else:
+                    inventories.append(self.loaded_files[path])
+                labels.append(f"{os.path.basename(path)} ({state})")
+            diff_tab = DiffTab(labels[0], labels[1], *inventories)
+        except Exception as e:
+            QMessageBox.warning(
+                self, "Diff Error", f"Failed to compare inventories:\n{e}"
+            )
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        key = ("diff", tuple(sides))
+        if key in self.open_tabs:
+            self.close_tab(self.tabs.indexOf(self.open_tabs[key]))
+        self.open_tabs[key] = diff_tab
+        index = self.tabs.addTab(diff_tab, f"Diff - {labels[1]}")
+        self.tabs.setCurrentIndex(index)
+
+    def merge_inventories(self):
+        if len(self.loaded_files) < 2:
+            QMessageBox.warning(
+                self, "Merge", "Load at least two inventories to merge."
+            )
+            return
+        from SRM_gui.merge_dialog import (
+            MergeSourcesDialog,
+            MergeConflictDialog,
+        )
+        from SRM_core.merge import plan_merge, build_merged_inventory
+
+        dlg = MergeSourcesDialog(list(self.loaded_files), self)
+        if dlg.exec_() != QDialog.Accepted:
+            return
+        paths = dlg.selected_paths()
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            plan = plan_merge(
+                [(os.path.basename(p), self.loaded_files[p]) for p in paths]
+            )
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if plan["conflicts"]:
+            conflict_dlg = MergeConflictDialog(plan["conflicts"], self)
+            if conflict_dlg.exec_() != QDialog.Accepted:
+                return
+
+        try:
+            inv, overlaps = build_merged_inventory(
+                plan, source="Seismic Response Manager"
+            )
+        except Exception as e:
+            QMessageBox.warning(
+                self, "Error", f"Failed to merge inventories:\n{e}"
+            )
+            return
+        if overlaps:
+            shown = "\n".join(overlaps[:10])
+            if len(overlaps) > 10:
+                shown += f"\n… and {len(overlaps) - 10} more"
+            reply = QMessageBox.question(
+                self,
+                "Overlapping Epochs",
+                f"{len(overlaps)} epoch(s) of the merged inventory overlap "
+                f"another epoch with the same codes:\n{shown}\n\n"
+                "Save the merged inventory anyway?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            if reply != QMessageBox.Yes:
+                return
+
+        filepath, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Merged Inventory",
+            "merged.xml",
+            STATIONXML_FILTERS,
+        )
+        if not filepath:
+            return
+
+        try:
+            write_stationxml(inv, filepath)
+        except Exception as e:
+            QMessageBox.warning(
+                self, "Error", f"Failed to merge inventories:\n{e}"
+            )
+            return
+        filepath = os.path.abspath(filepath)
+        self.dirty_files.discard(filepath)
+        if filepath in self.loaded_files:
+            self.loaded_files[filepath] = inv
+            self.manager_tab.refresh()
+        else:
+            self.loaded_files[filepath] = inv
+            self.manager_tab.add_file_to_tree(filepath, inv)
+        self.file_watcher.watch(filepath)
+        self.open_explorer_tab(filepath, inv)
+        QMessageBox.information(
+            self,
+            "Merge Complete",
+            f"Merged {plan['total']} channel epoch(s) from {len(paths)} "
+            f"file(s): {plan['duplicates']} identical duplicate(s) "
+            f"dropped, {len(plan['conflicts'])} conflict(s) resolved.",
+        )
+
+    def apply_response_to_channels(self, channels_by_file):
+        channels_by_file = {
+            path: chans for path, chans in channels_by_file.items() if chans
+        }
+        count = sum(len(chans) for chans in channels_by_file.values())
+        if not count:
+            QMessageBox.warning(
+                self,
+                "No Selection",
+                "Select channels, stations or networks to apply a response.",
+            )
+            return
+
+        dlg = ResponseSelectionDialog(self.nrl_root, self)
+        if dlg.exec_() != QDialog.Accepted:
+            return
+        new_resp, _, _ = dlg.get_response()
+        if not new_resp:
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Apply Response",
+            f"Replace the response of {count} channel(s) in "
+            f"{len(channels_by_file)} file(s)?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        replaced = []
+        for path, chans in channels_by_file.items():
+            replaced.extend(apply_response_to_channels(chans, new_resp))
+            self.object_edited(*chans, filepaths=(path,))
+        self.refresh_after_response_change(channels_by_file, replaced)
+        QMessageBox.information(
+            self, "Success", f"Response applied to {count} channel(s)."
+        )
+
+    def own_response(self, channel, filepath):
+        # A response shared by several channels is copied for the channel
+        # opened in an editor; its rules then read the copy
+        inventory = self.loaded_files.get(filepath)
+        if inventory is not None and detach_response(channel, inventory):
+            self.object_edited(channel, filepaths=())
+        return channel.response
+
+    def mark_dirty(self, *filepaths):
+        self.dirty_files.update(filepaths)
+
+    def object_edited(self, *objects, fields=None, filepaths=None):
+        # filepaths: the files holding the objects, when the caller knows
+        if filepaths is None:
+            filepaths = self.rules.files_of(*objects)
+        self.mark_dirty(*filepaths)
+        changed = self.rules.touch(*objects, fields=fields)
+        reindex = fields is None or not INDEXED_FIELDS.isdisjoint(fields)
+        for obj in objects:
+            if reindex:
+                self.search_index.update(obj)
+            self.epoch_index.update(obj)
+            self.spatial_index.update(obj)
+        self.manager_tab.update_problems(changed)
+        self.manager_tab.schedule_time_filter()
+        grid = self.open_tabs.get(("grid", "all"))
+        if grid is not None:
+            grid.model.refresh_channels(objects)
+
+    def objects_changed(self, objects, filepaths, fields=None):
+        # One refresh of problems, indexes and explorers after a batch edit
+        self.object_edited(*objects, fields=fields, filepaths=filepaths)
+        self.refresh_after_response_change(filepaths, [])
+
+    def bulk_edit(self, targets, filepaths):
+        from SRM_gui.bulk_edit import BulkEditDialog, BulkEditCommand
+        from SRM_core.bulk import apply_values
+
+        if not any(targets.values()):
+            QMessageBox.warning(
+                self, "No Selection", "Select stations or channels first."
+            )
+            return
+        dlg = BulkEditDialog(targets, self)
+        if dlg.exec_() != QDialog.Accepted:
+            return
+        plan = dlg.plan
+        try:
+            apply_values(plan["objects"], plan["field"], plan["new"])
+        except Exception as e:
+            QMessageBox.warning(
+                self, "Bulk Edit", f"Nothing was changed:\n{e}"
+            )
+            return
+        self.undo_stack.push(BulkEditCommand(self, plan, set(filepaths)))
+
+    def refresh_after_response_change(self, filepaths, replaced):
+        # replaced: (old, new) responses, new being old for one changed in
+        # place. Response tabs of an old one show the new one instead, or
+        # are closed when the channel has none left.
+        replacements = {id(old): new for old, new in replaced}
+        closed = 0
+        for (tab_type, tab_id), widget in list(self.open_tabs.items()):
+            offloaded = isinstance(widget, OffloadedTab)
+            if tab_type == "response":
+                response = (
+                    widget.state["response"] if offloaded else widget.response
+                )
+                if id(response) not in replacements:
+                    continue
+                new = replacements[id(response)]
+                if new is None:
+                    self.close_tab(self.tabs.indexOf(widget))
+                    closed += 1
+                elif offloaded and new is not response:
+                    widget.state["response"] = new
+                    widget.state["original_response"] = deepcopy(new)
+                elif not offloaded:
+                    widget.retarget(new)
+            # Offloaded explorers are built from the inventory when shown
+            elif tab_type == "explorer" and tab_id in filepaths:
+                if offloaded:
+                    continue
+                inv = self.loaded_files.get(tab_id)
+                if inv:
+                    widget.populate_tree(inv)
+        if closed:
+            self.statusBar().showMessage(
+                f"Closed {closed} response tab(s) of channels that no longer "
+                "have a response",
+                5000,
+            )
+
     def close_tab(self, index):
         if index == 0:
             return
@@ -221,8 +1310,16 @@ class MainWindow(QMainWindow):
         for key, tab in list(self.open_tabs.items()):
             if tab == widget:
                 del self.open_tabs[key]
+                if key[0] == "store":
+                    widget.store.close()
+                self.tab_pool.forget(key)
                 break
         self.tabs.removeTab(index)
+        # Removed tabs would otherwise stay alive as hidden pages
+        if isinstance(widget, ResponseTab):
+            widget.release()
+        widget.deleteLater()
+        self.budget_timer.start()
 
     def create_new_inventory(self):
         filepath, _ = QFileDialog.getSaveFileName(
@@ -238,7 +1335,9 @@ class MainWindow(QMainWindow):
             inv = Inventory(networks=[], source="Seismic Response Manager")
             self.loaded_files[filepath] = inv
             inv.write(filepath, format="STATIONXML")
+            self.dirty_files.discard(filepath)
             self.manager_tab.add_file_to_tree(filepath, inv)
+            self.file_watcher.watch(filepath)
             self.open_explorer_tab(filepath, inv)
         except Exception as e:
             QMessageBox.warning(
@@ -274,27 +1373,76 @@ class MainWindow(QMainWindow):
                 if inv_wizard.exec_() == QDialog.Accepted:
                     print("Inventory creation from MiniSEED successful!")
 
+    def build_inventories_from_archive(self):
+        folder = QFileDialog.getExistingDirectory(
+            self, "Select SDS Archive or MiniSEED Folder"
+        )
+        if not folder:
+            return
+
+        progress = QProgressDialog(
+            "Scanning MiniSEED headers...", "Cancel", 0, 0, self
+        )
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+
+        def report(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        rows, errors = scan_mseed_archive(folder, progress=report)
+        canceled = progress.wasCanceled()
+        progress.close()
+        if canceled:
+            return
+        if errors:
+            QMessageBox.warning(
+                self,
+                "Unreadable Files",
+                f"{len(errors)} file(s) could not be read, e.g.:\n"
+                + "\n".join(f"{path}: {e}" for path, e in errors[:5]),
+            )
+        if not rows:
+            QMessageBox.warning(
+                self, "No Data", "No MiniSEED streams found in this folder."
+            )
+            return
+
+        wizard = BatchStationInventoryWizard(self.nrl_root, rows, parent=self)
+        if wizard.exec_() == QDialog.Accepted:
+            print("Batch inventory creation from archive successful!")
+
+    def build_inventory_from_csv(self):
+        dialog = BatchCSVBuildDialog(self.nrl_root, parent=self)
+        if dialog.exec_() == QDialog.Accepted:
+            print("Batch inventory creation from CSV successful!")
+
     def convert_to_xml(self):
         input_path, _ = QFileDialog.getOpenFileName(
             None,
             "Select an Input Dataless or RESP File",
             "",
-            "Response Files (*.dataless *.resp);;All Files (*)",
+            "Response Files (*.dataless *.resp *.dataless.gz *.dataless.zst)"
+            ";;All Files (*)",
         )
 
         if not input_path:
             print("Operation cancelled by user (no input file selected).")
             return
 
+        name = os.path.basename(input_path)
+        suffix, compression = split_suffix(name)
         default_output_name = (
-            os.path.splitext(os.path.basename(input_path))[0] + ".xml"
+            name[: len(name) - len(suffix + compression)] + ".xml"
         )
 
         output_path, _ = QFileDialog.getSaveFileName(
             None,
             "Save StationXML File As...",
             default_output_name,
-            "StationXML Files (*.xml);;All Files (*)",
+            STATIONXML_FILTERS,
         )
 
         if not output_path:
@@ -316,6 +1464,75 @@ class MainWindow(QMainWindow):
         msg_box.exec_()
 
 
+# Save dialogs; a .gz or .zst name writes compressed StationXML
+STATIONXML_FILTERS = (
+    "StationXML Files (*.xml);;"
+    "Compressed StationXML (*.xml.gz *.xml.zst);;All Files (*)"
+)
+
+# Selecting more tree items than this makes the Manager tab unresponsive
+MAX_FIND_SELECTION = 1000
+MAX_IMPORT_RESULTS = 200
+
+
+# Tabs reopened with a workspace; explorers are opened per file
+RESTORED_TABS = {
+    "explorer": None,
+    "validation": MainWindow.open_validation_tab,
+    "grid": MainWindow.open_channel_grid_tab,
+    "locations": MainWindow.open_location_check_tab,
+}
+
+
+class MapBridge(QObject):
+    # Receives the selections made on the map page through QWebChannel
+    lasso = pyqtSignal(list)
+    point = pyqtSignal(float, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.view = None
+
+    @pyqtSlot(float, float, int)
+    def view_changed(self, lat, lon, zoom):
+        self.view = [lat, lon, zoom]
+
+    @pyqtSlot(str)
+    def lasso_drawn(self, points):
+        self.lasso.emit(json.loads(points))
+
+    @pyqtSlot(float, float)
+    def point_clicked(self, lat, lon):
+        self.point.emit(lat, lon)
+
+
+class IndexCompleter(QCompleter):
+    # Suggestions come from a SearchIndex query instead of prefix-filtering
+    # a fixed list, so it stays fast on inventories of any size
+    def __init__(self, line_edit, index, kinds=None):
+        super().__init__(line_edit)
+        self.line_edit = line_edit
+        self.index = index
+        self.kinds = kinds
+        self.labels = QStringListModel(self)
+        self.setModel(self.labels)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        line_edit.setCompleter(self)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(150)
+        self.timer.timeout.connect(self.update_completions)
+        line_edit.textEdited.connect(lambda _: self.timer.start())
+
+    def update_completions(self):
+        text = self.line_edit.text().strip()
+        self.labels.setStringList(
+            self.index.complete(text, kinds=self.kinds) if text else []
+        )
+        if text:
+            self.complete()
+
+
 class ManagerTab(QWidget):
     def __init__(self, main_window):
         super().__init__()
@@ -327,8 +1544,59 @@ class ManagerTab(QWidget):
         left_layout = QVBoxLayout(left_widget)
         self.all_stations = []
         self.network_colors = {}
+
+        find_layout = QHBoxLayout()
+        self.find_edit = QLineEdit()
+        self.find_edit.setPlaceholderText(
+            "Find: XX.STA.*.HHZ, station, site or instrument"
+        )
+        self.find_edit.returnPressed.connect(self.find_items)
+        IndexCompleter(self.find_edit, self.main_window.search_index)
+        find_layout.addWidget(self.find_edit)
+        self.find_label = QLabel()
+        find_layout.addWidget(self.find_label)
+        left_layout.addLayout(find_layout)
+
+        time_layout = QHBoxLayout()
+        self.time_check = QCheckBox("Active from")
+        self.time_check.setToolTip(
+            "Only show stations and channels whose epoch overlaps the range"
+        )
+        time_layout.addWidget(self.time_check)
+        self.time_from = QDateTimeEdit()
+        self.time_to = QDateTimeEdit()
+        for edit in (self.time_from, self.time_to):
+            edit.setTimeSpec(Qt.UTC)
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm")
+            edit.setCalendarPopup(True)
+            edit.setDateTime(QDateTime.currentDateTimeUtc())
+        time_layout.addWidget(self.time_from)
+        time_layout.addWidget(QLabel("to"))
+        time_layout.addWidget(self.time_to)
+        self.time_slider = QSlider(Qt.Horizontal)
+        self.time_slider.setToolTip("Move both dates to one day")
+        self.time_slider.valueChanged.connect(self.slide_time_filter)
+        time_layout.addWidget(self.time_slider)
+        left_layout.addLayout(time_layout)
+        self.hidden_ids = set()
+        self.time_timer = QTimer(self)
+        self.time_timer.setSingleShot(True)
+        self.time_timer.setInterval(150)
+        self.time_timer.timeout.connect(self.apply_time_filter)
+        self.time_check.toggled.connect(self.schedule_time_filter)
+        self.time_from.dateTimeChanged.connect(self.schedule_time_filter)
+        self.time_to.dateTimeChanged.connect(self.schedule_time_filter)
+
         self.file_tree = QTreeWidget()
-        self.file_tree.setHeaderLabels(["Loaded Inventories"])
+        self.file_tree.setHeaderLabels(
+            ["Loaded Inventories", "Problems", "Memory"]
+        )
+        self.file_tree.setColumnWidth(0, 240)
+        self.tree_items = {}
+        # Map markers of hibernated files, by file
+        self.dormant_markers = {}
+        self.file_tree.itemExpanded.connect(self.wake_item)
+        self.file_tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.file_tree.itemDoubleClicked.connect(self.handle_item_double_click)
         left_layout.addWidget(self.file_tree)
         self.file_tree.itemSelectionChanged.connect(
@@ -351,7 +1619,44 @@ class ManagerTab(QWidget):
         delete_btn.clicked.connect(self.delete_selected_item)
         btn_layout.addWidget(delete_btn)
 
+        apply_resp_btn = QPushButton("Apply Response")
+        apply_resp_btn.setToolTip(
+            "Apply one response to every selected channel"
+        )
+        apply_resp_btn.clicked.connect(self.apply_response_to_selection)
+        btn_layout.addWidget(apply_resp_btn)
+
+        compare_btn = QPushButton("Compare")
+        compare_btn.setToolTip(
+            "Overlay the responses of the selected channels"
+        )
+        compare_btn.clicked.connect(self.main_window.compare_responses)
+        btn_layout.addWidget(compare_btn)
+
+        bulk_btn = QPushButton("Bulk Edit")
+        bulk_btn.setToolTip("Change one field of every selected object")
+        bulk_btn.clicked.connect(self.bulk_edit_selection)
+        btn_layout.addWidget(bulk_btn)
+
         left_layout.addLayout(btn_layout)
+
+        self.problems_label = QLabel("Problems (0)")
+        left_layout.addWidget(self.problems_label)
+        self.problem_list = QTreeWidget()
+        self.problem_list.setHeaderLabels(
+            ["Severity", "Object", "Rule", "Message"]
+        )
+        self.problem_list.setRootIsDecorated(False)
+        # Sorting only on request; a sorted view re-sorts on every lookup
+        self.problem_list.header().setSectionsClickable(True)
+        self.problem_list.header().sectionClicked.connect(
+            lambda col: self.problem_list.sortItems(col, Qt.AscendingOrder)
+        )
+        self.problem_list.itemDoubleClicked.connect(self.focus_problem)
+        self.problem_items = {}
+        left_layout.addWidget(self.problem_list)
+        left_layout.setStretch(2, 3)
+        left_layout.setStretch(5, 1)
         layout.addWidget(left_widget)
 
         self.map_view = QWebEngineView()
@@ -362,6 +1667,12 @@ class ManagerTab(QWidget):
             html_template = f.read()
 
         self.map_view.setHtml(html_template)
+        self.map_bridge = MapBridge(self)
+        self.map_bridge.lasso.connect(self.select_in_lasso)
+        self.map_bridge.point.connect(self.select_around)
+        self.map_channel = QWebChannel(self)
+        self.map_channel.registerObject("bridge", self.map_bridge)
+        self.map_view.page().setWebChannel(self.map_channel)
 
         layout.setStretch(0, 1)
         layout.setStretch(1, 2)
@@ -377,46 +1688,423 @@ class ManagerTab(QWidget):
             self.network_colors[network_name] = hex_color
         return self.network_colors[network_name]
 
-    def add_file_to_tree(self, abs_filepath, inventory):
+    def _add_file_item(self, abs_filepath):
         file_item = QTreeWidgetItem([os.path.basename(abs_filepath)])
         file_item.setData(0, Qt.UserRole, ("file", abs_filepath))
-        file_item.setExpanded(True)
         file_item.setFlags(
             file_item.flags() | Qt.ItemIsSelectable | Qt.ItemIsEnabled
         )
         self.file_tree.addTopLevelItem(file_item)
+        self.tree_items[abs_filepath] = file_item
+        return file_item
+
+    def add_file_to_tree(self, abs_filepath, inventory):
+        file_item = self._add_file_item(abs_filepath)
+        file_item.setExpanded(True)
+
+        for net in inventory.networks:
+            net_item = QTreeWidgetItem([f"Network: {net.code}"])
+            net_item.setData(0, Qt.UserRole, ("network", net))
+            file_item.addChild(net_item)
+            self.tree_items[id(net)] = net_item
+
+            for sta in net.stations:
+                sta_item = QTreeWidgetItem([f"Station: {sta.code}"])
+                sta_item.setData(0, Qt.UserRole, ("station", sta))
+                net_item.addChild(sta_item)
+                self.tree_items[id(sta)] = sta_item
+
+                for chan in sta.channels:
+                    chan_item = QTreeWidgetItem([f"Channel: {chan.code}"])
+                    chan_item.setData(0, Qt.UserRole, ("channel", chan))
+                    sta_item.addChild(chan_item)
+                    self.tree_items[id(chan)] = chan_item
+
+                file_item.setExpanded(True)
+
+        for net in inventory.networks:
+            for sta in net.stations:
+                self.all_stations.append(self._marker(net, sta))
+        self.reindex_file(abs_filepath)
+        self.show_stations_on_map()
+        self.show_memory(abs_filepath)
+        self.main_window.budget_timer.start()
+
+    def add_hibernated_file(self, filepath):
+        file_item = self._add_file_item(filepath)
+        file_item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        self.all_stations.extend(self.dormant_markers.get(filepath, []))
+        self.show_memory(filepath)
+
+    def show_memory(self, filepath):
+        files = self.main_window.loaded_files
+        item = self.tree_items.get(filepath)
+        if item is not None:
+            if files.is_hibernated(filepath):
+                item.setText(2, "hibernated")
+            elif filepath in files.sizes:
+                item.setText(2, f"~{files.sizes[filepath] / 2**20:.1f} MB")
+            else:
+                item.setText(2, "")
+        total = sum(files.sizes.values()) / 2**20
+        self.file_tree.headerItem().setText(2, f"Memory (~{total:.0f} MB)")
+
+    def hibernate_file(self, filepath, inventory):
+        # Drops everything that holds objects of the file. Its row, its
+        # stations on the map and its search and spatial entries stay;
+        # expanding the row, or finding one of them, wakes it.
+        file_item = self.tree_items[filepath]
+        file_item.setExpanded(False)
+        file_item.takeChildren()
+        file_item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        file_item.setText(1, "")
+        ids = set()
+        for net in inventory.networks:
+            ids.add(id(net))
+            for sta in net.stations:
+                ids.add(id(sta))
+                ids.update(id(chan) for chan in sta.channels)
+        for obj_id in ids:
+            self.tree_items.pop(obj_id, None)
+        self.hidden_ids -= ids
+        main_window = self.main_window
+        main_window.search_index.hibernate(filepath)
+        main_window.epoch_index.remove_inventory(filepath)
+        main_window.spatial_index.hibernate(filepath)
+        self.update_problems(main_window.rules.remove_inventory(filepath))
+
+        # Markers get keys that cannot be taken by the ids of new objects
+        markers = [m for m in self.all_stations if m["id"] in ids]
+        dormant = [
+            dict(marker, id=f"{filepath}#{n}")
+            for n, marker in enumerate(markers)
+        ]
+        self.dormant_markers[filepath] = dormant
+        self.all_stations = [
+            m for m in self.all_stations if m["id"] not in ids
+        ] + dormant
+        self.map_view.page().runJavaScript(
+            f"updateStations({json.dumps([m['id'] for m in markers])}, "
+            f"{json.dumps(dormant)});"
+        )
+
+    def wake_file(self, filepath, inventory):
+        dormant = {m["id"] for m in self.dormant_markers.pop(filepath, [])}
+        self.all_stations = [
+            m for m in self.all_stations if m["id"] not in dormant
+        ]
+        self.map_view.page().runJavaScript(
+            f"updateStations({json.dumps(sorted(dormant))}, []);"
+        )
+        file_item = self.tree_items[filepath]
+        file_item.setChildIndicatorPolicy(
+            QTreeWidgetItem.DontShowIndicatorWhenChildless
+        )
+        self.sync_file(
+            filepath,
+            [],
+            [sta for net in inventory.networks for sta in net.stations],
+        )
+        self.show_memory(filepath)
+
+    def wake_item(self, item):
+        data = item.data(0, Qt.UserRole)
+        if not data or data[0] != "file":
+            return
+        self.wake_files([data[1]])
+
+    def wake_files(self, filepaths):
+        # Returns whether any of the files was hibernated
+        files = self.main_window.loaded_files
+        filepaths = [p for p in filepaths if files.is_hibernated(p)]
+        if not filepaths:
+            return False
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            for filepath in filepaths:
+                try:
+                    files[filepath]
+                except Exception as e:
+                    QMessageBox.warning(
+                        self, "Error", f"Failed to load {filepath}:\n{e}"
+                    )
+        finally:
+            QApplication.restoreOverrideCursor()
+        return True
+
+    def wake_entries(self, entries):
+        # Entries of hibernated files hold no objects; their files are woken
+        # so that the caller can look again
+        return self.wake_files({e["file"] for e in entries if not e["path"]})
+
+    def _marker(self, net, sta):
+        return {
+            "name": f"{net.code}.{sta.code}",
+            "lat": sta.latitude,
+            "lon": sta.longitude,
+            "network": net.code,
+            "color": self.get_color_for_network(net.code),
+            "id": id(sta),
+        }
 
+    def sync_file(self, filepath, removed, added):
+        # Brings the tree and the map in line with a file whose inventory
+        # was reloaded in place; items and markers of the stations that were
+        # kept stay as they are
+        inventory = self.main_window.loaded_files[filepath]
+        file_item = self.tree_items[filepath]
+        networks = {id(net) for net in inventory.networks}
+        gone = [
+            file_item.child(i).data(0, Qt.UserRole)[1]
+            for i in range(file_item.childCount())
+        ]
+        gone = [net for net in gone if id(net) not in networks]
+        for sta in removed + [s for net in gone for s in net.stations]:
+            for obj in [sta] + list(sta.channels):
+                self.tree_items.pop(id(obj), None)
+        for net in gone:
+            self.tree_items.pop(id(net), None)
+
+        net_items = []
         for net in inventory.networks:
-            net_item = QTreeWidgetItem([f"Network: {net.code}"])
-            net_item.setData(0, Qt.UserRole, ("network", net))
-            file_item.addChild(net_item)
-
-            for sta in net.stations:
-                sta_item = QTreeWidgetItem([f"Station: {sta.code}"])
-                sta_item.setData(0, Qt.UserRole, ("station", sta))
-                net_item.addChild(sta_item)
+            net_item = self.tree_items.get(id(net))
+            if net_item is None:
+                net_item = QTreeWidgetItem()
+                net_item.setData(0, Qt.UserRole, ("network", net))
+                self.tree_items[id(net)] = net_item
+            net_item.setText(0, f"Network: {net.code}")
+            sta_items = [
+                self.tree_items.get(id(sta))
+                or self._add_station_to_tree(net_item, sta)
+                for sta in net.stations
+            ]
+            net_item.takeChildren()
+            net_item.addChildren(sta_items)
+            net_items.append(net_item)
+        file_item.takeChildren()
+        file_item.addChildren(net_items)
+
+        removed_ids = {id(sta) for sta in removed}
+        removed_ids.update(id(s) for net in gone for s in net.stations)
+        self.all_stations = [
+            s for s in self.all_stations if s["id"] not in removed_ids
+        ]
+        added_ids = {id(sta) for sta in added}
+        markers = [
+            self._marker(net, sta)
+            for net in inventory.networks
+            for sta in net.stations
+            if id(sta) in added_ids
+        ]
+        self.all_stations.extend(markers)
+        self.reindex_file(filepath)
+        visible = [m for m in markers if m["id"] not in self.hidden_ids]
+        self.map_view.page().runJavaScript(
+            f"updateStations({json.dumps(sorted(removed_ids))}, "
+            f"{json.dumps(visible)});"
+        )
 
-                for chan in sta.channels:
-                    chan_item = QTreeWidgetItem([f"Channel: {chan.code}"])
-                    chan_item.setData(0, Qt.UserRole, ("channel", chan))
-                    sta_item.addChild(chan_item)
+    def show_stations_on_map(self):
+        stations = [
+            s for s in self.all_stations if s["id"] not in self.hidden_ids
+        ]
+        js_code = f"addStations({json.dumps(stations)});"
+        self.map_view.page().runJavaScript(js_code)
 
-                file_item.setExpanded(True)
+    def reindex_file(self, filepath):
+        inventory = self.main_window.loaded_files.get(filepath)
+        if inventory is None:
+            return
+        self.main_window.search_index.add_inventory(filepath, inventory)
+        self.main_window.epoch_index.add_inventory(filepath, inventory)
+        self.main_window.spatial_index.add_inventory(filepath, inventory)
+        self.update_time_slider()
+        self.schedule_time_filter()
+        keys = self.main_window.rules.add_inventory(filepath, inventory)
+        self.update_problems(keys)
+
+    def file_edited(self, filepath):
+        # After objects were added to or removed from the file
+        self.main_window.mark_dirty(filepath)
+        self.reindex_file(filepath)
+
+    def update_time_slider(self):
+        # The slider covers the loaded epochs in steps of one day
+        span = self.main_window.epoch_index.time_span()
+        if span is None:
+            return
+        self.time_slider.blockSignals(True)
+        self.time_slider.setRange(int(span[0] // 86400), int(span[1] // 86400))
+        self.time_slider.blockSignals(False)
+
+    def slide_time_filter(self, day):
+        time = QDateTime.fromSecsSinceEpoch(day * 86400, Qt.UTC)
+        self.time_from.setDateTime(time)
+        self.time_to.setDateTime(time)
+        self.time_check.setChecked(True)
+
+    def schedule_time_filter(self):
+        if self.time_check.isChecked() or self.hidden_ids:
+            self.time_timer.start()
+
+    def apply_time_filter(self):
+        index = self.main_window.epoch_index
+        hidden = set()
+        if self.time_check.isChecked():
+            start = self.time_from.dateTime().toSecsSinceEpoch()
+            end = self.time_to.dateTime().toSecsSinceEpoch()
+            active = set(index.overlapping_ids(start, end))
+            hidden = {
+                entry_id
+                for entry_id, entry in index.entries.items()
+                if entry["kind"] != "network" and entry_id not in active
+            }
+        # Only items whose state changes are touched
+        for entry_id in hidden ^ self.hidden_ids:
+            item = self.tree_items.get(entry_id)
+            if item is not None:
+                item.setHidden(entry_id in hidden)
+        self.hidden_ids = hidden
+        self.show_stations_on_map()
+
+    def find_items(self):
+        text = self.find_edit.text().strip()
+        if not text:
+            return
+        entries = self.main_window.search_index.search(text)
+        if self.wake_entries(entries):
+            entries = self.main_window.search_index.search(text)
+        # Files that could not be woken have no objects
+        shown = self.select_objects(
+            e["path"][-1] for e in entries if e["path"]
+        )
+        text = f"{len(entries)} match(es)"
+        if shown < len(entries):
+            text += f", {shown} selected"
+        self.find_label.setText(text)
+
+    def select_objects(self, objects):
+        # Selects the tree items of the objects and returns their number
+        self.file_tree.clearSelection()
+        first = None
+        shown = 0
+        for obj in objects:
+            if shown >= MAX_FIND_SELECTION:
+                break
+            item = self.tree_items.get(id(obj))
+            if item is None or id(obj) in self.hidden_ids:
+                continue
+            item.setSelected(True)
+            parent = item.parent()
+            while parent:
+                parent.setExpanded(True)
+                parent = parent.parent()
+            first = first or item
+            shown += 1
+        if first is not None:
+            self.file_tree.scrollToItem(first)
+        return shown
+
+    def select_in_lasso(self, points):
+        index = self.main_window.spatial_index
+        entries = index.within_polygon(points, kinds=("station",))
+        if self.wake_entries(entries):
+            entries = index.within_polygon(points, kinds=("station",))
+        shown = self.select_objects(
+            e["path"][-1] for e in entries if e["path"]
+        )
+        self.find_label.setText(f"{shown} station(s) in lasso")
 
-        for net in inventory.networks:
-            color = self.get_color_for_network(net.code)
-            for sta in net.stations:
-                self.all_stations.append(
-                    {
-                        "name": f"{net.code}.{sta.code}",
-                        "lat": sta.latitude,
-                        "lon": sta.longitude,
-                        "network": net.code,
-                        "color": color,
-                    }
+    def select_around(self, lat, lon):
+        lon = (lon + 180) % 360 - 180
+        km, ok = QInputDialog.getDouble(
+            self,
+            "Stations Around Point",
+            f"Radius around {lat:.4f}, {lon:.4f} (km):",
+            50.0,
+            0.001,
+            20000.0,
+            3,
+        )
+        if not ok:
+            return
+        index = self.main_window.spatial_index
+        entries = index.within_radius(lat, lon, km, kinds=("station",))
+        if self.wake_entries(entries):
+            entries = index.within_radius(lat, lon, km, kinds=("station",))
+        shown = self.select_objects(
+            e["path"][-1] for e in entries if e["path"]
+        )
+        text = f"{shown} station(s) within {km:g} km"
+        nearest = entries or index.nearest(lat, lon, kinds=("station",))
+        if nearest:
+            text += (
+                f", nearest {nearest[0]['label']} "
+                f"({nearest[0]['distance_km']:.1f} km)"
+            )
+        self.find_label.setText(text)
+        self.map_view.page().runJavaScript(f"drawCircle({lat}, {lon}, {km});")
+
+    def update_problems(self, keys):
+        rules = self.main_window.rules
+        touched = set()
+        for key in keys:
+            old_items = self.problem_items.pop(key, [])
+            for item in old_items:
+                index = self.problem_list.indexOfTopLevelItem(item)
+                if index >= 0:
+                    self.problem_list.takeTopLevelItem(index)
+            if key[1] not in rules.subjects:
+                continue
+            if not old_items and not rules.results.get(key):
+                continue
+            filepath, path = rules.subjects[key[1]]
+            touched.add(filepath)
+            touched.update(id(obj) for obj in path)
+            items = []
+            for issue in rules.issues_for(key):
+                item = QTreeWidgetItem(
+                    [
+                        issue["severity"],
+                        issue["label"],
+                        issue["rule"],
+                        issue["message"],
+                    ]
                 )
-        js_code = f"addStations({json.dumps(self.all_stations)});"
-        self.map_view.page().runJavaScript(js_code)
+                color = "firebrick" if issue["severity"] == "error" else (
+                    "darkorange"
+                )
+                item.setForeground(0, QBrush(QColor(color)))
+                item.setData(0, Qt.UserRole, key)
+                items.append(item)
+            if items:
+                self.problem_list.addTopLevelItems(items)
+                self.problem_items[key] = items
+        for tree_key in touched:
+            tree_item = self.tree_items.get(tree_key)
+            if tree_item is None:
+                continue
+            count = rules.counts.get(tree_key, 0)
+            tree_item.setText(1, str(count) if count else "")
+            tree_item.setForeground(1, QBrush(QColor("firebrick")))
+        self.problems_label.setText(
+            f"Problems ({self.problem_list.topLevelItemCount()})"
+        )
+
+    def focus_problem(self, item, column):
+        key = item.data(0, Qt.UserRole)
+        subject = self.main_window.rules.subjects.get(key[1])
+        if subject is None:
+            return
+        tree_item = self.tree_items.get(id(subject[1][-1]))
+        if tree_item is not None:
+            self.file_tree.setCurrentItem(tree_item)
+            self.file_tree.scrollToItem(tree_item)
+
+    def _file_of(self, item):
+        while item.parent():
+            item = item.parent()
+        return item.data(0, Qt.UserRole)[1]
 
     def handle_item_double_click(self, item, column):
         print("Double-click on item:", item.text(0))
@@ -483,6 +2171,7 @@ class ManagerTab(QWidget):
 
         if pasted_item:
             target_item.setExpanded(True)
+            self.file_edited(self._file_of(target_item))
 
     def delete_selected_item(self):
         item = self.file_tree.currentItem()
@@ -507,20 +2196,31 @@ class ManagerTab(QWidget):
             if net_data and net_data[0] == "network":
                 net_data[1].stations.remove(obj)
                 parent.removeChild(item)
+                self._forget_items(obj, *obj.channels)
+                self.file_edited(self._file_of(parent))
         elif type_ == "channel" and parent:
             sta_data = parent.data(0, Qt.UserRole)
             if sta_data and sta_data[0] == "station":
                 sta_data[1].channels.remove(obj)
                 parent.removeChild(item)
+                self._forget_items(obj)
+                self.file_edited(self._file_of(parent))
         else:
             QMessageBox.warning(
                 self, "Invalid Delete", "Cannot delete this type of item."
             )
 
+    def _forget_items(self, *objects):
+        # The ids of deleted objects can be taken by new ones
+        for obj in objects:
+            self.tree_items.pop(id(obj), None)
+            self.hidden_ids.discard(id(obj))
+
     def _add_network_to_tree(self, file_item, net):
         net_item = QTreeWidgetItem([f"Network: {net.code}"])
         net_item.setData(0, Qt.UserRole, ("network", net))
         file_item.addChild(net_item)
+        self.tree_items[id(net)] = net_item
 
         for sta in net.stations:
             self._add_station_to_tree(net_item, sta)
@@ -531,6 +2231,7 @@ class ManagerTab(QWidget):
         sta_item = QTreeWidgetItem([f"Station: {sta.code}"])
         sta_item.setData(0, Qt.UserRole, ("station", sta))
         net_item.addChild(sta_item)
+        self.tree_items[id(sta)] = sta_item
 
         for chan in sta.channels:
             self._add_channel_to_tree(sta_item, chan)
@@ -541,6 +2242,7 @@ class ManagerTab(QWidget):
         chan_item = QTreeWidgetItem([f"Channel: {chan.code}"])
         chan_item.setData(0, Qt.UserRole, ("channel", chan))
         sta_item.addChild(chan_item)
+        self.tree_items[id(chan)] = chan_item
 
         return chan_item
 
@@ -570,6 +2272,7 @@ class ManagerTab(QWidget):
             print(f"Added new network 'XX' to {filepath}")
             self._add_network_to_tree(selected_item, net)
             selected_item.setExpanded(True)
+            self.file_edited(filepath)
 
         elif type_ == "network":
             net = obj
@@ -579,6 +2282,7 @@ class ManagerTab(QWidget):
             net.stations.append(sta)
             self._add_station_to_tree(selected_item, sta)
             selected_item.setExpanded(True)
+            self.file_edited(self._file_of(selected_item))
 
         elif type_ == "station":
             sta = obj
@@ -599,6 +2303,7 @@ class ManagerTab(QWidget):
             sta.channels.append(chan)
             self._add_channel_to_tree(selected_item, chan)
             selected_item.setExpanded(True)
+            self.file_edited(self._file_of(selected_item))
 
         else:
             QMessageBox.warning(
@@ -608,6 +2313,58 @@ class ManagerTab(QWidget):
                 "Network, or Station.",
             )
 
+    def selected_channels(self):
+        selection = {}
+        for item in self.file_tree.selectedItems():
+            data = item.data(0, Qt.UserRole)
+            if not data:
+                continue
+            file_item = item
+            while file_item.parent():
+                file_item = file_item.parent()
+            filepath = file_item.data(0, Qt.UserRole)[1]
+            obj = data[1]
+            if data[0] == "file":
+                obj = self.main_window.loaded_files.get(filepath)
+                if obj is None:
+                    continue
+            selection.setdefault(filepath, []).append(obj)
+        return {
+            path: collect_channels(objs) for path, objs in selection.items()
+        }
+
+    def apply_response_to_selection(self):
+        self.main_window.apply_response_to_channels(self.selected_channels())
+
+    def bulk_edit_selection(self):
+        # Channels below the selection and the stations they belong to
+        stations, channels, filepaths = {}, {}, set()
+        for item in self.file_tree.selectedItems():
+            data = item.data(0, Qt.UserRole)
+            if not data:
+                continue
+            kind, obj = data
+            filepath = self._file_of(item)
+            if kind == "channel":
+                sta = item.parent().data(0, Qt.UserRole)[1]
+                stations[id(sta)] = sta
+                channels[id(obj)] = (obj, sta)
+            else:
+                if kind == "file":
+                    obj = self.main_window.loaded_files.get(filepath)
+                    if obj is None:
+                        continue
+                for sta in collect_stations(obj):
+                    stations[id(sta)] = sta
+                    for chan in sta.channels:
+                        channels[id(chan)] = (chan, sta)
+            filepaths.add(filepath)
+        targets = {
+            "channel": list(channels.values()),
+            "station": [(sta, None) for sta in stations.values()],
+        }
+        self.main_window.bulk_edit(targets, filepaths)
+
     def handle_selection_changed(self):
         selected_items = self.file_tree.selectedItems()
         if not selected_items:
@@ -626,9 +2383,32 @@ class ManagerTab(QWidget):
                 print(f"Error focusing on station: {e}")
 
     def refresh(self):
+        files = self.main_window.loaded_files
+        # Hibernated files keep their dormant search and spatial entries;
+        # nothing else can restore them without waking the file
+        hibernated = [p for p in files if files.is_hibernated(p)]
         self.file_tree.clear()
-        for filepath, inventory in self.main_window.loaded_files.items():
-            self.add_file_to_tree(filepath, inventory)
+        self.tree_items.clear()
+        self.problem_list.clear()
+        self.problem_items.clear()
+        self.main_window.rules.clear()
+        self.main_window.search_index.retain(hibernated)
+        self.main_window.epoch_index.clear()
+        self.main_window.spatial_index.retain(hibernated)
+        self.all_stations = []
+        self.hidden_ids = set()
+        self.dormant_markers = {
+            path: markers
+            for path, markers in self.dormant_markers.items()
+            if files.is_hibernated(path)
+        }
+        for filepath in files:
+            inventory = files.peek(filepath)
+            if inventory is None:
+                self.add_hibernated_file(filepath)
+            else:
+                self.add_file_to_tree(filepath, inventory)
+        self.show_stations_on_map()
 
 
 class ExplorerTab(QWidget):
@@ -645,13 +2425,22 @@ class ExplorerTab(QWidget):
         self.new_button = QPushButton("New")
         self.new_button.setEnabled(True)
         self.new_button.clicked.connect(self.create_new_field)
+        self.apply_resp_button = QPushButton("Apply Response")
+        self.apply_resp_button.setToolTip(
+            "Apply one response to every selected channel"
+        )
+        self.apply_resp_button.clicked.connect(
+            self.apply_response_to_selection
+        )
         top_layout.addWidget(self.object_label)
         top_layout.addStretch()
+        top_layout.addWidget(self.apply_resp_button)
         top_layout.addWidget(self.new_button)
         layout.addLayout(top_layout)
 
         self.tree = QTreeWidget()
         self.tree.setHeaderLabels(["Field", "Value"])
+        self.tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.tree.itemChanged.connect(self.handle_tree_edit)
         self.tree.itemDoubleClicked.connect(self.handle_tree_double_click)
         layout.addWidget(self.tree)
@@ -660,6 +2449,35 @@ class ExplorerTab(QWidget):
         self.info_label = QLabel(f"Loaded file: {filepath}")
         layout.addWidget(self.info_label)
 
+    def pool_state(self):
+        # Where the view was; the tree is built again from the inventory
+        path = []
+        item = self.tree.currentItem()
+        while item is not None:
+            path.insert(0, item.text(0))
+            item = item.parent()
+        return {
+            "current": path,
+            "scroll": self.tree.verticalScrollBar().value(),
+        }
+
+    def restore_view(self, state):
+        item = None
+        for text in state["current"]:
+            children = (
+                [item.child(i) for i in range(item.childCount())]
+                if item is not None
+                else [
+                    self.tree.topLevelItem(i)
+                    for i in range(self.tree.topLevelItemCount())
+                ]
+            )
+            item = next((c for c in children if c.text(0) == text), None)
+            if item is None:
+                break
+            self.tree.setCurrentItem(item)
+        self.tree.verticalScrollBar().setValue(state["scroll"])
+
     def create_new_field(self):
         item = self.tree.currentItem()
         if not item:
@@ -685,6 +2503,7 @@ class ExplorerTab(QWidget):
                 code="STA", latitude=0.0, longitude=0.0, elevation=0.0
             )
             net.stations.append(sta)
+            self.main_window.mark_dirty(self.filepath)
             self.populate_tree(parent_inventory)
             return
 
@@ -743,6 +2562,7 @@ class ExplorerTab(QWidget):
             )
             chan.response = Response()
             sta.channels.append(chan)
+            self.main_window.mark_dirty(self.filepath)
             self.populate_tree(parent_inventory)
             return
 
@@ -822,6 +2642,7 @@ class ExplorerTab(QWidget):
         try:
             for net in inv.networks:
                 net_item = QTreeWidgetItem([f"Network: {net.code}", ""])
+                net_item.setData(0, Qt.UserRole, ("network", net))
                 self.tree.addTopLevelItem(net_item)
 
                 for field in dir(net):
@@ -857,6 +2678,7 @@ class ExplorerTab(QWidget):
                         chan_item = QTreeWidgetItem(
                             [f"Channel: {chan.code}", ""]
                         )
+                        chan_item.setData(0, Qt.UserRole, ("channel", chan))
                         sta_item.addChild(chan_item)
                         leaf_item = QTreeWidgetItem(
                             sta_item, [field, str(value)]
@@ -982,6 +2804,19 @@ class ExplorerTab(QWidget):
         else:
             self.current_obj = None
 
+    def apply_response_to_selection(self):
+        objects = []
+        for item in self.tree.selectedItems():
+            ref = item.data(0, Qt.UserRole)
+            if (
+                isinstance(ref, tuple)
+                and ref[0] in ("network", "station", "channel")
+            ):
+                objects.append(ref[1])
+        self.main_window.apply_response_to_channels(
+            {self.filepath: collect_channels(objects)}
+        )
+
     def handle_tree_edit(self, item, column):
         if column != 1:
             return
@@ -1000,6 +2835,9 @@ class ExplorerTab(QWidget):
             elif isinstance(old_value, int):
                 new_value = int(new_value)
             setattr(ref_object, attr, new_value)
+            self.main_window.object_edited(
+                ref_object, filepaths=(self.filepath,)
+            )
 
             font = QFont()
             font.setBold(True)
@@ -1017,8 +2855,6 @@ class ExplorerTab(QWidget):
     def handle_tree_double_click(self, item, column):
         data = item.data(0, Qt.UserRole)
         if data and isinstance(data, tuple) and data[0] == "response":
-            response = data[1]
-
             chan_item = item.parent() if item.parent() else None
             sta_item = (
                 chan_item.parent()
@@ -1041,27 +2877,72 @@ class ExplorerTab(QWidget):
 
             unique_id = f"{net_code}.{sta_code}..{chan_code}"
 
+            # The channel may have been given its own copy meanwhile
+            chan = chan_item.data(0, Qt.UserRole)[1]
             self.main_window.open_response_tab(
                 response_id=unique_id,
-                response_data=response,
+                response_data=chan.response,
                 explorer_tab=self,
+                channel=chan,
             )
+            item.setData(0, Qt.UserRole, ("response", chan.response))
 
 
 class ResponseTab(QWidget):
-    def __init__(self, response_data, main_window, explorer_tab, nrl_root):
+    def __init__(
+        self,
+        response_data,
+        main_window,
+        filepath,
+        nrl_root,
+        original_response=None,
+    ):
         super().__init__()
         self.response = response_data
-        self.original_response = deepcopy(response_data)
+        if original_response is None:
+            original_response = deepcopy(response_data)
+        self.original_response = original_response
         self.main_window = main_window
-        self.explorer_tab = explorer_tab
+        self.filepath = filepath
         self.nrl_root = nrl_root
+        self.canvas = None
+        # Table edits replot once typing or pasting pauses
+        self.plot_timer = QTimer(self)
+        self.plot_timer.setSingleShot(True)
+        self.plot_timer.setInterval(200)
+        self.plot_timer.timeout.connect(
+            lambda: self.plot_response(self.selected_response)
+        )
         self.response_layout = QVBoxLayout(self)
-        self.load_response_editor(self.response)
+        self.load_response_editor(self.response, edited=False)
+
+    def retarget(self, response):
+        # The channel's response was replaced, or changed in place
+        if response is not self.response:
+            self.response = response
+            self.original_response = deepcopy(response)
+        self.load_response_editor(self.response, edited=False)
+
+    def pool_state(self):
+        return {
+            "response": self.response,
+            "original_response": self.original_response,
+            "filepath": self.filepath,
+        }
+
+    def release(self):
+        from SRM_gui.canvas import release_canvas
+
+        if self.canvas is not None:
+            release_canvas(self.canvas)
+            self.canvas = None
 
-    def load_response_editor(self, response):
+    def load_response_editor(self, response, edited=True):
         self.selected_response = response
 
+        # The canvas is kept for the new editor
+        if self.canvas is not None:
+            self.canvas.setParent(None)
         for i in reversed(range(self.response_layout.count())):
             item = self.response_layout.itemAt(i)
             if item.widget():
@@ -1085,9 +2966,16 @@ class ResponseTab(QWidget):
         self.stage_tree.setColumnWidth(0, 200)
         self.stage_tree.itemChanged.connect(self.handle_response_edit)
         self.stage_tree.itemDoubleClicked.connect(self.edit_complex_value)
+        self.stage_tree.currentItemChanged.connect(self.show_array_editor)
 
         self.populate_stage_tree(response)
         left_layout.addWidget(self.stage_tree)
+        from SRM_gui.stage_table import StageArrayEditor
+
+        self.array_editor = StageArrayEditor()
+        self.array_editor.changed.connect(self.stage_array_changed)
+        self.array_editor.hide()
+        left_layout.addWidget(self.array_editor)
         btn_layout = QHBoxLayout()
         add_stage = QPushButton("New")
         add_stage.clicked.connect(self.new)
@@ -1101,55 +2989,35 @@ class ResponseTab(QWidget):
         replace_button.clicked.connect(self.replace_response)
         btn_layout.addWidget(replace_button)
 
+        import_button = QPushButton("Import from Inventory")
+        import_button.clicked.connect(
+            lambda: self.select_response_from_inventory()
+        )
+        btn_layout.addWidget(import_button)
+
         save_btn = QPushButton("Revert Response")
         save_btn.clicked.connect(self.revert_response)
         btn_layout.addWidget(save_btn)
         left_layout.addLayout(btn_layout)
         splitter.addWidget(left_widget)
 
-        self.canvas = MplCanvas(self)
+        from SRM_gui.canvas import acquire_canvas
+
+        if self.canvas is None:
+            self.canvas = acquire_canvas()
         splitter.addWidget(self.canvas)
 
         self.response_layout.addWidget(splitter)
         self.plot_response(response)
+        # Stages may have been added, removed or replaced
+        self.main_window.object_edited(
+            response, filepaths=(self.filepath,) if edited else ()
+        )
 
     def plot_response(self, response):
         self.canvas.ax_amp.clear()
         self.canvas.ax_phase.clear()
-        try:
-            freq = np.logspace(-2, 2, 1000)
-            h = response.get_evalresp_response_for_frequencies(
-                freq, output="DEF"
-            )
-
-            amp = np.abs(h)
-            phase = np.angle(h, deg=True)
-
-            self.canvas.ax_amp.plot(
-                freq, amp, color="royalblue", label="Amplitude"
-            )
-            self.canvas.ax_amp.set_title("Amplitude Response")
-            self.canvas.ax_amp.set_ylabel("Amplitude")
-            self.canvas.ax_amp.set_xscale("log")
-            self.canvas.ax_amp.set_yscale("log")
-            self.canvas.ax_amp.legend()
-
-            self.canvas.ax_phase.plot(
-                freq, phase, color="seagreen", label="Phase"
-            )
-            self.canvas.ax_phase.set_title("Phase Response")
-            self.canvas.ax_phase.set_xlabel("Frequency [Hz]")
-            self.canvas.ax_phase.set_ylabel("Phase [°]")
-            self.canvas.ax_phase.set_xscale("log")
-            self.canvas.ax_phase.legend()
-
-        except Exception as e:
-            self.canvas.ax_amp.text(
-                0.5, 0.5, f"Error plotting: {e}", ha="center"
-            )
-            self.canvas.ax_phase.text(
-                0.5, 0.5, f"Error plotting: {e}", ha="center"
-            )
+        draw_response(self.canvas.ax_amp, self.canvas.ax_phase, response)
         self.canvas.draw()
 
     def revert_response(self):
@@ -1220,6 +3088,34 @@ class ResponseTab(QWidget):
                     )
                     zero_item.setData(0, Qt.UserRole, ("zero", stage, j))
 
+            for attr, label, _ in array_fields(stage):
+                item = QTreeWidgetItem(stage_item, [label, ""])
+                item.setData(0, Qt.UserRole, ("array", stage, attr))
+                self._set_array_count(item)
+
+    def _set_array_count(self, item):
+        _, stage, attr = item.data(0, Qt.UserRole)
+        text = f"{len(getattr(stage, attr) or [])} values"
+        if attr == "coefficients":
+            text += f" ({stage.symmetry})"
+        item.setText(1, text)
+
+    def show_array_editor(self, item, previous=None):
+        ref = item.data(0, Qt.UserRole) if item is not None else None
+        if isinstance(ref, tuple) and ref[0] == "array":
+            self.array_editor.edit(ref[1], ref[2])
+            self.array_editor.show()
+        else:
+            self.array_editor.hide()
+
+    def stage_array_changed(self, stage):
+        # Only the count in the stage tree changes; the plot follows
+        item = self.stage_tree.currentItem()
+        if item is not None and item.data(0, Qt.UserRole)[0] == "array":
+            self._set_array_count(item)
+        self.main_window.object_edited(stage, filepaths=(self.filepath,))
+        self.plot_timer.start()
+
     def handle_response_edit(self, item, column):
         if column != 1:
             return
@@ -1244,6 +3140,9 @@ class ResponseTab(QWidget):
                 new_value = new_text
 
             setattr(ref_object, attr, new_value)
+            self.main_window.object_edited(
+                ref_object, filepaths=(self.filepath,)
+            )
 
             item.setForeground(1, QBrush(QColor("blue")))
             font = item.font(1)
@@ -1304,6 +3203,9 @@ class ResponseTab(QWidget):
                     stage.poles[index] = new_val
                 else:
                     stage.zeros[index] = new_val
+                self.main_window.object_edited(
+                    stage, filepaths=(self.filepath,)
+                )
 
                 item.setText(1, f"{new_val.real} + {new_val.imag}j")
                 item.setForeground(1, QBrush(QColor("blue")))
@@ -1318,26 +3220,53 @@ class ResponseTab(QWidget):
                     self, "Invalid Input", "Please enter valid float numbers."
                 )
 
-    def select_response_from_inventory(self, inventory):
+    def select_response_from_inventory(self, inventory=None):
+        if inventory is None:
+            index = self.main_window.search_index
+        else:
+            index = SearchIndex()
+            index.add_inventory("", inventory)
+
         dialog = QDialog(self)
         dialog.setWindowTitle("Select Response to Import")
+        dialog.resize(420, 420)
         layout = QVBoxLayout(dialog)
 
-        combo = QComboBox()
-        channel_map = {}
-
-        for net in inventory.networks:
-            for sta in net.stations:
-                for chan in sta.channels:
-                    label = (
-                        f"{net.code}.{sta.code}."
-                        f"{chan.location_code}.{chan.code}"
-                    )
-                    combo.addItem(label)
-                    channel_map[label] = chan
-
-        layout.addWidget(QLabel("Select Channel Response:"))
-        layout.addWidget(combo)
+        layout.addWidget(QLabel("Find Channel (e.g. XX.STA.*.HHZ):"))
+        find_edit = QLineEdit()
+        layout.addWidget(find_edit)
+        IndexCompleter(find_edit, index, kinds=("channel",))
+        result_list = QListWidget()
+        layout.addWidget(result_list)
+
+        def update_results():
+            result_list.clear()
+            text = find_edit.text().strip() or "*"
+            for entry in index.search(
+                text, kinds=("channel",), limit=MAX_IMPORT_RESULTS
+            ):
+                # Channels of hibernated files are found from the manager
+                if not entry["path"]:
+                    continue
+                label = entry["label"]
+                chan = entry["path"][-1]
+                if chan.start_date:
+                    label += f"  ({chan.start_date.date})"
+                if entry["file"]:
+                    label += f"  [{os.path.basename(entry['file'])}]"
+                item = QListWidgetItem(label)
+                item.setData(Qt.UserRole, chan)
+                result_list.addItem(item)
+            if result_list.count():
+                result_list.setCurrentRow(0)
+
+        timer = QTimer(dialog)
+        timer.setSingleShot(True)
+        timer.setInterval(150)
+        timer.timeout.connect(update_results)
+        find_edit.textChanged.connect(lambda _: timer.start())
+        result_list.itemDoubleClicked.connect(lambda _: dialog.accept())
+        update_results()
 
         buttons = QDialogButtonBox(
             QDialogButtonBox.Ok | QDialogButtonBox.Cancel
@@ -1348,8 +3277,10 @@ class ResponseTab(QWidget):
         buttons.rejected.connect(dialog.reject)
 
         if dialog.exec_() == QDialog.Accepted:
-            selected = combo.currentText()
-            chan_to_copy = channel_map[selected]
+            current = result_list.currentItem()
+            if current is None:
+                return
+            chan_to_copy = current.data(Qt.UserRole)
 
             if hasattr(self, "selected_response") and self.selected_response:
                 new_response = chan_to_copy.response
@@ -1763,7 +3694,6 @@ class ResponseSelectionDialog(QDialog):
         self.setWindowTitle("Select Instrument Response")
         self.setMinimumWidth(600)
 
-        self.nrl = NRL(root=nrl_root)
         self.nrl_root = nrl_root
 
         self.sensor_response = None
@@ -1825,7 +3755,9 @@ class ResponseSelectionDialog(QDialog):
             keys, desc = wizard.get_result()
             if keys:
                 try:
-                    self.sensor_response = self.nrl.get_sensor_response(keys)
+                    self.sensor_response = get_nrl(
+                        self.nrl_root
+                    ).get_sensor_response(keys)
                     self.sensor_info = f"From NRL: {desc}"
                 except Exception as e:
                     QMessageBox.critical(
@@ -1842,9 +3774,9 @@ class ResponseSelectionDialog(QDialog):
             keys, desc = wizard.get_result()
             if keys:
                 try:
-                    self.digitizer_response = self.nrl.get_datalogger_response(
-                        keys
-                    )
+                    self.digitizer_response = get_nrl(
+                        self.nrl_root
+                    ).get_datalogger_response(keys)
                     self.digitizer_info = f"From NRL: {desc}"
                 except Exception as e:
                     QMessageBox.critical(
@@ -2252,12 +4184,15 @@ class StationInventoryWizard(QDialog):
         comp_edit.setToolTip(
             "Comma-separated channel endings (e.g., Z,N,E or 1,2,Z)"
         )
+        rate_edit = QLineEdit()
+        rate_edit.setPlaceholderText("From response")
 
         return {
             "loc": loc_edit,
             "base": QLineEdit("HH"),
             "comp": comp_edit,
             "depth": QLineEdit("0.0"),
+            "rate": rate_edit,
             "date": QDateTimeEdit(QDateTime.currentDateTimeUtc()),
             "resp_label": QLabel("Not Selected"),
             "resp_btn": QPushButton("Select Response..."),
@@ -2271,6 +4206,7 @@ class StationInventoryWizard(QDialog):
         layout.addRow("Location Code(s):", widgets["loc"])
         layout.addRow("Channel Base Code:", widgets["base"])
         layout.addRow("Channel Components:", widgets["comp"])
+        layout.addRow("Sample Rate (Hz):", widgets["rate"])
         layout.addRow("Start Date:", widgets["date"])
         layout.addRow("Sensor Depth (m):", widgets["depth"])
         layout.addRow("Instrument Response:", widgets["resp_label"])
@@ -2284,17 +4220,23 @@ class StationInventoryWizard(QDialog):
         self.lon_edit.setText(data.get("lon", "0.0"))
         self.ele_edit.setText(data.get("ele", "0.0"))
 
-        if "group1" in data:
-            g1_data = data["group1"]
-            self.groups[1]["loc"].setText(g1_data.get("locs", ""))
-            self.groups[1]["base"].setText(g1_data.get("base", ""))
-            self.groups[1]["comp"].setText(g1_data.get("comps", ""))
-        if "group2" in data:
-            self.toggle_group2_cb.setChecked(True)
-            g2_data = data["group2"]
-            self.groups[2]["loc"].setText(g2_data.get("locs", ""))
-            self.groups[2]["base"].setText(g2_data.get("base", ""))
-            self.groups[2]["comp"].setText(g2_data.get("comps", ""))
+        for group_num in (1, 2):
+            group_data = data.get(f"group{group_num}")
+            if not group_data:
+                continue
+            if group_num == 2:
+                self.toggle_group2_cb.setChecked(True)
+            widgets = self.groups[group_num]
+            widgets["loc"].setText(group_data.get("locs", ""))
+            widgets["base"].setText(group_data.get("base", ""))
+            widgets["comp"].setText(group_data.get("comps", ""))
+            widgets["rate"].setText(group_data.get("rate", ""))
+            if group_data.get("start") is not None:
+                widgets["date"].setDateTime(
+                    QDateTime.fromMSecsSinceEpoch(
+                        int(group_data["start"].timestamp * 1000), Qt.UTC
+                    )
+                )
 
     def _select_response(self, group_num):
         dialog = ResponseSelectionDialog(self.nrl_root, self)
@@ -2415,6 +4357,13 @@ class StationInventoryWizard(QDialog):
             raise ValueError(
                 f"{group_name}: Sensor Depth must be a valid number."
             )
+        if widgets["rate"].text().strip():
+            try:
+                float(widgets["rate"].text())
+            except ValueError:
+                raise ValueError(
+                    f"{group_name}: Sample Rate must be a valid number."
+                )
 
         locs = [
             loc.strip().upper()
@@ -2448,19 +4397,15 @@ class StationInventoryWizard(QDialog):
 
         creation_dt = self.groups[1]["date"].dateTime().toPyDateTime()
 
-        station = Station(
-            code=self.sta_edit.text().upper(),
-            latitude=float(self.lat_edit.text()),
-            longitude=float(self.lon_edit.text()),
-            elevation=float(self.ele_edit.text()),
-            creation_date=UTCDateTime(creation_dt),
-            channels=all_channels,
-        )
-        network = Network(
-            code=self.net_edit.text().upper(), stations=[station]
-        )
-        self.inventory = Inventory(
-            networks=[network], source="StationInventoryWizard"
+        self.inventory = build_station_inventory(
+            self.net_edit.text(),
+            self.sta_edit.text(),
+            float(self.lat_edit.text()),
+            float(self.lon_edit.text()),
+            float(self.ele_edit.text()),
+            all_channels,
+            creation_dt,
+            "StationInventoryWizard",
         )
 
     def _build_channels_for_group(self, widgets, group_name):
@@ -2477,46 +4422,362 @@ class StationInventoryWizard(QDialog):
         response = widgets["response_obj"]
 
         for i, comp in enumerate(comps):
-            code = base + comp
-            az, dip = 0, 0
-            if comp.endswith("E"):
-                az, dip = 90, 0
-            elif comp.endswith("N"):
-                az, dip = 0, 0
-            elif comp.endswith("Z"):
-                az, dip = 0, -90
-
-            rate = (
-                response.instrument_sensitivity.frequency
-                if isinstance(response, Response)
-                and response.instrument_sensitivity
-                else 1.0
-            )
+            if widgets["rate"].text().strip():
+                rate = float(widgets["rate"].text())
+            else:
+                rate = (
+                    response.instrument_sensitivity.frequency
+                    if isinstance(response, Response)
+                    and response.instrument_sensitivity
+                    else 1.0
+                )
 
             channels.append(
-                Channel(
-                    code=code,
-                    location_code=locs[i],
-                    latitude=station_lat,
-                    longitude=station_lon,
-                    elevation=station_ele,
-                    depth=sensor_depth,
-                    azimuth=az,
-                    dip=dip,
-                    sample_rate=rate,
-                    start_date=start_date,
-                    response=response,
+                build_channel(
+                    base + comp,
+                    locs[i],
+                    station_lat,
+                    station_lon,
+                    station_ele,
+                    sensor_depth,
+                    rate,
+                    start_date,
+                    response,
                 )
             )
         return channels
 
 
+class BatchStationInventoryWizard(QDialog):
+    STATION_COLUMNS = (
+        "Network", "Station", "Latitude", "Longitude", "Elevation (m)",
+        "Channels", "First Data", "Last Data",
+    )
+
+    def __init__(self, nrl_root, archive_rows, parent=None):
+        super().__init__(parent)
+        self.nrl_root = nrl_root
+        self.setWindowTitle("Batch Station Inventory Creation")
+        self.resize(1000, 700)
+        self.stations = group_archive_streams(archive_rows)
+        self.station_keys = sorted(self.stations)
+        self.instrument_groups = {}
+        self.inventories = []
+        self._init_ui()
+
+    def _init_ui(self):
+        main_layout = QVBoxLayout(self)
+
+        station_group = QGroupBox(
+            f"Stations ({len(self.station_keys)}) - edit coordinates here"
+        )
+        station_layout = QVBoxLayout(station_group)
+        self.station_table = QTableWidget(
+            len(self.station_keys), len(self.STATION_COLUMNS)
+        )
+        self.station_table.setHorizontalHeaderLabels(self.STATION_COLUMNS)
+        self.station_table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeToContents
+        )
+        for row, key in enumerate(self.station_keys):
+            streams = [
+                s for group in self.stations[key].values() for s in group
+            ]
+            values = (
+                key[0],
+                key[1],
+                "0.0",
+                "0.0",
+                "0.0",
+                ", ".join(
+                    sorted(f"{s['location']}.{s['channel']}" for s in streams)
+                ),
+                min(s["starttime"] for s in streams).strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                ),
+                max(s["endtime"] for s in streams).strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                ),
+            )
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col not in (2, 3, 4):
+                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+                self.station_table.setItem(row, col, item)
+        station_layout.addWidget(self.station_table)
+        main_layout.addWidget(station_group, 2)
+
+        instrument_group = QGroupBox(
+            "Instrument Responses (one per channel base code)"
+        )
+        instrument_layout = QFormLayout(instrument_group)
+        bases = sorted(
+            {base for groups in self.stations.values() for _, base in groups}
+        )
+        for base in bases:
+            count = sum(
+                1
+                for groups in self.stations.values()
+                if any(b == base for _, b in groups)
+            )
+            widgets = {
+                "depth": QLineEdit("0.0"),
+                "resp_label": QLabel("Not Selected"),
+                "resp_btn": QPushButton("Select Response..."),
+                "response_obj": None,
+            }
+            widgets["resp_btn"].clicked.connect(
+                lambda _, b=base: self._select_response(b)
+            )
+            row_layout = QHBoxLayout()
+            row_layout.addWidget(QLabel("Depth (m):"))
+            row_layout.addWidget(widgets["depth"])
+            row_layout.addWidget(widgets["resp_label"], 1)
+            row_layout.addWidget(widgets["resp_btn"])
+            instrument_layout.addRow(
+                f"{base}* ({count} station(s)):", row_layout
+            )
+            self.instrument_groups[base] = widgets
+        main_layout.addWidget(instrument_group, 1)
+
+        self.button_box = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel
+        )
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        main_layout.addWidget(self.button_box)
+
+    def _select_response(self, base):
+        dialog = ResponseSelectionDialog(self.nrl_root, self)
+        if dialog.exec_() == QDialog.Accepted:
+            response_obj, s_info, d_info = dialog.get_response()
+            widgets = self.instrument_groups[base]
+            widgets["response_obj"] = response_obj
+            widgets["resp_label"].setText(
+                wrap_text(f"Sensor: {s_info} | Datalogger: {d_info}")
+            )
+
+    def _station_coordinates(self, row):
+        values = []
+        for col, name in ((2, "Latitude"), (3, "Longitude"),
+                          (4, "Elevation")):
+            text = self.station_table.item(row, col).text()
+            try:
+                values.append(float(text))
+            except ValueError:
+                net, sta = self.station_keys[row]
+                raise ValueError(
+                    f"{net}.{sta}: {name} must be a valid number."
+                )
+        return values
+
+    def _validate_inputs(self):
+        try:
+            for row in range(len(self.station_keys)):
+                self._station_coordinates(row)
+            for base, widgets in self.instrument_groups.items():
+                if not widgets["response_obj"]:
+                    raise ValueError(
+                        f"An instrument response must be selected for {base}."
+                    )
+                try:
+                    float(widgets["depth"].text())
+                except ValueError:
+                    raise ValueError(
+                        f"{base}: Sensor Depth must be a valid number."
+                    )
+        except ValueError as e:
+            QMessageBox.warning(self, "Input Error", str(e))
+            return False
+        return True
+
+    def _build_inventories(self):
+        self.inventories = []
+        for row, (net, sta) in enumerate(self.station_keys):
+            lat, lon, ele = self._station_coordinates(row)
+            channels = []
+            groups = self.stations[(net, sta)]
+            for (loc, base), streams in sorted(groups.items()):
+                widgets = self.instrument_groups[base]
+                depth = float(widgets["depth"].text())
+                for stream in sorted(streams, key=lambda s: s["channel"]):
+                    channels.append(
+                        build_channel(
+                            stream["channel"],
+                            loc,
+                            lat,
+                            lon,
+                            ele,
+                            depth,
+                            stream["sample_rate"],
+                            stream["starttime"],
+                            widgets["response_obj"],
+                        )
+                    )
+            creation = min(c.start_date for c in channels)
+            self.inventories.append(
+                build_station_inventory(
+                    net, sta, lat, lon, ele, channels, creation,
+                    "StationInventoryWizard",
+                )
+            )
+
+    def accept(self):
+        if not self._validate_inputs():
+            return
+        try:
+            self._build_inventories()
+            folder = QFileDialog.getExistingDirectory(
+                self, "Select Output Folder for Station Inventories"
+            )
+            if not folder:
+                return
+            for inv in self.inventories:
+                filename = f"{inv[0].code}.{inv[0][0].code}.xml"
+                inv.write(
+                    os.path.join(folder, filename), format="STATIONXML"
+                )
+            QMessageBox.information(
+                self,
+                "Success",
+                f"{len(self.inventories)} inventories saved to:\n{folder}",
+            )
+            super().accept()
+        except Exception as e:
+            QMessageBox.critical(
+                self, "Build Error", f"Failed to build or save inventory:\n{e}"
+            )
+
+
+class BatchCSVBuildDialog(QDialog):
+    def __init__(self, nrl_root, parent=None):
+        super().__init__(parent)
+        self.nrl_root = nrl_root
+        self.setWindowTitle("Build Inventory from CSV")
+        self.resize(900, 500)
+        self.table = None
+        self.inventory = None
+
+        layout = QVBoxLayout(self)
+        help_label = QLabel(
+            "One row per channel group. Required columns: "
+            + ", ".join(STATION_TABLE_COLUMNS)
+            + ". Optional: "
+            + ", ".join(OPTIONAL_TABLE_COLUMNS)
+            + f". NRL key paths are separated by '{NRL_KEY_SEPARATOR}'."
+        )
+        help_label.setWordWrap(True)
+        layout.addWidget(help_label)
+
+        path_layout = QHBoxLayout()
+        self.path_edit = QLineEdit()
+        self.path_edit.setReadOnly(True)
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_file)
+        path_layout.addWidget(self.path_edit)
+        path_layout.addWidget(browse_btn)
+        layout.addLayout(path_layout)
+
+        self.summary_label = QLabel("No file loaded.")
+        layout.addWidget(self.summary_label)
+
+        self.error_table = QTableWidget(0, 3)
+        self.error_table.setHorizontalHeaderLabels(
+            ["Row", "Column", "Problem"]
+        )
+        self.error_table.horizontalHeader().setStretchLastSection(True)
+        self.error_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.error_table)
+
+        self.button_box = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel
+        )
+        self.button_box.button(QDialogButtonBox.Ok).setText("Build")
+        self.button_box.button(QDialogButtonBox.Ok).setEnabled(False)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+    def browse_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Select Station Table", "", "CSV Files (*.csv);;All (*)"
+        )
+        if path:
+            self.path_edit.setText(path)
+            self.load_table(path)
+
+    def load_table(self, path):
+        self.table = None
+        self.error_table.setRowCount(0)
+        try:
+            table = read_station_table(path)
+        except Exception as e:
+            self.summary_label.setText(f"Could not read table: {e}")
+            self.button_box.button(QDialogButtonBox.Ok).setEnabled(False)
+            return
+
+        errors = validate_station_table(table)
+        self.error_table.setRowCount(len(errors))
+        for i, (row, column, message) in enumerate(errors):
+            self.error_table.setItem(i, 0, QTableWidgetItem(str(row)))
+            self.error_table.setItem(i, 1, QTableWidgetItem(column))
+            self.error_table.setItem(i, 2, QTableWidgetItem(message))
+
+        stations = {
+            (n, s) for n, s in zip(table["network"], table["station"])
+        }
+        channels = sum(
+            len([c for c in value.split(",") if c.strip()])
+            for value in table["channels"]
+        )
+        self.summary_label.setText(
+            f"{len(table['row'])} rows, {len(stations)} stations, "
+            f"{channels} channels, "
+            f"{len(table_instrument_keys(table))} distinct instruments"
+            + (f" - {len(errors)} problem(s) found." if errors else ".")
+        )
+        if not errors:
+            self.table = table
+        self.button_box.button(QDialogButtonBox.Ok).setEnabled(not errors)
+
+    def accept(self):
+        if self.table is None:
+            return
+        try:
+            self.inventory = build_inventory_from_table(
+                self.table, get_nrl(self.nrl_root)
+            )
+        except Exception as e:
+            QMessageBox.critical(
+                self, "Build Error", f"Failed to build inventory:\n{e}"
+            )
+            return
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Inventory File", "", "StationXML (*.xml)"
+        )
+        if not save_path:
+            return
+        try:
+            self.inventory.write(save_path, format="STATIONXML")
+        except Exception as e:
+            QMessageBox.critical(
+                self, "Save Error", f"Failed to save inventory:\n{e}"
+            )
+            return
+        QMessageBox.information(
+            self, "Success", f"Inventory saved to:\n{save_path}"
+        )
+        super().accept()
+
+
 class ImportFromMiniSEEDDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Import from MiniSEED")
         self.setMinimumWidth(400)
         self.initial_data = {}
+        self.filepath = None
+        self.streams = []
         layout = QFormLayout(self)
         self.path_edit = QLineEdit()
         self.path_edit.setReadOnly(True)
@@ -2524,6 +4785,8 @@ class ImportFromMiniSEEDDialog(QDialog):
         browse_btn.clicked.connect(self.browse_file)
         layout.addRow("MiniSEED File:", self.path_edit)
         layout.addRow("", browse_btn)
+        self.summary_label = QLabel("")
+        layout.addRow(self.summary_label)
         button_box = QDialogButtonBox(
             QDialogButtonBox.Ok | QDialogButtonBox.Cancel
         )
@@ -2541,6 +4804,22 @@ class ImportFromMiniSEEDDialog(QDialog):
         if path:
             self.filepath = path
             self.path_edit.setText(path)
+            try:
+                self.streams = scan_mseed(path)
+            except Exception as e:
+                self.streams = []
+                self.summary_label.setText(f"Could not scan file: {e}")
+                return
+            self.summary_label.setText(
+                "\n".join(
+                    f"{s['network']}.{s['station']}.{s['location']}."
+                    f"{s['channel']}  {s['sample_rate']:g} Hz  "
+                    f"{s['starttime'].strftime('%Y-%m-%d %H:%M:%S')} - "
+                    f"{s['endtime'].strftime('%Y-%m-%d %H:%M:%S')}  "
+                    f"gaps: {s['gaps']}"
+                    for s in self.streams
+                )
+            )
 
     def accept(self):
         if not self.filepath:
@@ -2549,26 +4828,27 @@ class ImportFromMiniSEEDDialog(QDialog):
             )
             return
         try:
-            stream = read(self.filepath, headonly=False)
-            if not stream:
+            if not self.streams:
+                self.streams = scan_mseed(self.filepath)
+            streams = [s for s in self.streams if s["samples"] > 0]
+            if not streams:
                 QMessageBox.warning(
                     self,
                     "Empty File",
                     "The selected file contains no data traces.",
                 )
                 return
-            stream = [tr for tr in stream if len(tr.data) > 0]
             grouped_channels = {}
-            for tr in stream:
-                band_code = tr.stats.channel[0]
+            for stream in streams:
+                band_code = stream["channel"][0]
                 if band_code not in grouped_channels:
                     grouped_channels[band_code] = []
-                grouped_channels[band_code].append(tr)
+                grouped_channels[band_code].append(stream)
 
-            first_trace = stream[0]
+            first_stream = streams[0]
             self.initial_data = {
-                "net": first_trace.stats.network,
-                "sta": first_trace.stats.station,
+                "net": first_stream["network"],
+                "sta": first_stream["station"],
             }
 
             group_keys = sorted(grouped_channels.keys())
@@ -2587,9 +4867,9 @@ class ImportFromMiniSEEDDialog(QDialog):
                 self, "Read Error", f"Could not read or parse the file:\n{e}"
             )
 
-    def _process_channel_group(self, traces):
+    def _process_channel_group(self, streams):
         chan_info = sorted(
-            list(set((tr.stats.location, tr.stats.channel) for tr in traces)),
+            list(set((s["location"], s["channel"]) for s in streams)),
             key=lambda x: x[1],
         )
 
@@ -2607,6 +4887,8 @@ class ImportFromMiniSEEDDialog(QDialog):
             "locs": ",".join(locs),
             "base": base,
             "comps": ",".join(comps),
+            "rate": str(max(s["sample_rate"] for s in streams)),
+            "start": min(s["starttime"] for s in streams),
         }
 
     def get_initial_data(self):
@@ -0,0 +1,151 @@
+import os
+
+from PyQt5.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QComboBox,
+    QPushButton,
+    QDialogButtonBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QAbstractItemView,
+    QMessageBox,
+)
+from PyQt5.QtCore import Qt
+from obspy import UTCDateTime
+
+from SRM_core.merge import RESOLUTIONS
+
+
+def _format_epoch(start, end):
+    def fmt(value):
+        if abs(value) == float("inf"):
+            return "…"
+        return UTCDateTime(value).strftime("%Y-%m-%d %H:%M:%S")
+
+    return f"{fmt(start)} – {fmt(end)}"
+
+
+class MergeSourcesDialog(QDialog):
+    def __init__(self, filepaths, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Merge Inventories")
+        self.resize(480, 360)
+        layout = QVBoxLayout(self)
+        layout.addWidget(
+            QLabel(
+                "Select the inventories to merge. Earlier files take "
+                "precedence for network and station fields."
+            )
+        )
+        self.file_list = QListWidget()
+        self.file_list.setDragDropMode(QAbstractItemView.InternalMove)
+        for path in filepaths:
+            item = QListWidgetItem(os.path.basename(path))
+            item.setData(Qt.UserRole, path)
+            item.setToolTip(path)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.file_list.addItem(item)
+        layout.addWidget(self.file_list)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel
+        )
+        buttons.accepted.connect(self.validate_and_accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def selected_paths(self):
+        return [
+            self.file_list.item(i).data(Qt.UserRole)
+            for i in range(self.file_list.count())
+            if self.file_list.item(i).checkState() == Qt.Checked
+        ]
+
+    def validate_and_accept(self):
+        if len(self.selected_paths()) < 2:
+            QMessageBox.warning(
+                self, "Merge", "Select at least two inventories to merge."
+            )
+            return
+        self.accept()
+
+
+class MergeConflictDialog(QDialog):
+    COLUMNS = (
+        "SEED ID", "Existing", "Existing Epoch", "Incoming",
+        "Incoming Epoch", "Resolution",
+    )
+
+    def __init__(self, conflicts, parent=None):
+        super().__init__(parent)
+        self.conflicts = conflicts
+        self.setWindowTitle("Resolve Merge Conflicts")
+        self.resize(900, 500)
+        layout = QVBoxLayout(self)
+        layout.addWidget(
+            QLabel(
+                f"{len(conflicts)} station or channel epoch(s) overlap an "
+                "epoch from another file and differ in content. Channels "
+                "go with the station epoch they belong to."
+            )
+        )
+
+        self.table = QTableWidget(len(conflicts), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.combos = []
+        for row, conflict in enumerate(conflicts):
+            incoming = conflict["incoming"]
+            existing = conflict["existing"]
+            values = (
+                conflict["id"],
+                ", ".join(sorted({e["source"] for e in existing})),
+                "\n".join(
+                    _format_epoch(e["start"], e["end"]) for e in existing
+                ),
+                incoming["source"],
+                _format_epoch(incoming["start"], incoming["end"]),
+            )
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+            combo = QComboBox()
+            combo.addItems(RESOLUTIONS)
+            combo.setCurrentText(conflict["resolution"])
+            self.table.setCellWidget(row, len(values), combo)
+            self.combos.append(combo)
+        self.table.resizeColumnsToContents()
+        self.table.resizeRowsToContents()
+        layout.addWidget(self.table)
+
+        all_layout = QHBoxLayout()
+        all_layout.addWidget(QLabel("Set all to:"))
+        self.all_combo = QComboBox()
+        self.all_combo.addItems(RESOLUTIONS)
+        all_layout.addWidget(self.all_combo)
+        apply_all_btn = QPushButton("Apply")
+        apply_all_btn.clicked.connect(self.apply_to_all)
+        all_layout.addWidget(apply_all_btn)
+        all_layout.addStretch()
+        layout.addLayout(all_layout)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel
+        )
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def apply_to_all(self):
+        for combo in self.combos:
+            combo.setCurrentText(self.all_combo.currentText())
+
+    def accept(self):
+        for conflict, combo in zip(self.conflicts, self.combos):
+            conflict["resolution"] = combo.currentText()
+        super().accept()
@@ -0,0 +1,223 @@
+import numpy as np
+from PyQt5.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTableView,
+    QAbstractItemView,
+    QFileDialog,
+    QMessageBox,
+    QApplication,
+    QShortcut,
+)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QKeySequence
+
+from SRM_core.stage_arrays import (
+    array_fields,
+    compress_fir,
+    detect_symmetry,
+    expand_fir,
+    parse_values,
+    set_stage_array,
+    stage_array,
+)
+
+
+class ArrayModel(QAbstractTableModel):
+    # An (n, columns) float array; only the visible cells are formatted
+    def __init__(self, values, headers, parent=None):
+        super().__init__(parent)
+        self.values = values
+        self.headers = headers
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.values)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return section + 1
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        return repr(float(self.values[index.row(), index.column()]))
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole:
+            return False
+        try:
+            value = float(value)
+        except ValueError:
+            return False
+        self.values[index.row(), index.column()] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def set_values(self, values):
+        self.beginResetModel()
+        self.values = values
+        self.endResetModel()
+
+
+class StageArrayEditor(QWidget):
+    # Edits one long list of a response stage (FIR coefficients, numerators
+    # or denominators, response list) as a table. Every change is written
+    # to the stage at once and reported by changed(stage).
+    changed = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.stage = None
+        self.attr = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.title_label = QLabel()
+        layout.addWidget(self.title_label)
+
+        self.model = ArrayModel(np.empty((0, 1)), ("Value",), self)
+        self.model.dataChanged.connect(self.write_back)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionMode(QAbstractItemView.ContiguousSelection)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        # Rows of equal height let the view skip measuring them
+        self.view.verticalHeader().setDefaultSectionSize(22)
+        layout.addWidget(self.view)
+        QShortcut(QKeySequence.Paste, self.view, self.paste)
+
+        btn_layout = QHBoxLayout()
+        for text, slot in (
+            ("Add Row", self.add_row),
+            ("Delete Rows", self.delete_rows),
+            ("Paste", self.paste),
+            ("Import", self.import_file),
+        ):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            btn_layout.addWidget(button)
+        self.compress_btn = QPushButton("Compress")
+        self.compress_btn.setToolTip(
+            "Store only half of a symmetric FIR filter"
+        )
+        self.compress_btn.clicked.connect(self.compress)
+        btn_layout.addWidget(self.compress_btn)
+        self.expand_btn = QPushButton("Expand")
+        self.expand_btn.setToolTip("Store every tap of the FIR filter")
+        self.expand_btn.clicked.connect(self.expand)
+        btn_layout.addWidget(self.expand_btn)
+        layout.addLayout(btn_layout)
+
+    def edit(self, stage, attr):
+        self.stage = stage
+        self.attr = attr
+        _, label, headers = next(
+            f for f in array_fields(stage) if f[0] == attr
+        )
+        self.label = label
+        self.model.headers = headers
+        self.model.set_values(stage_array(stage, attr))
+        fir = attr == "coefficients"
+        self.compress_btn.setVisible(fir)
+        self.expand_btn.setVisible(fir)
+        self.update_title()
+
+    def update_title(self):
+        text = f"<b>{self.label}:</b> {len(self.model.values)}"
+        if self.attr == "coefficients":
+            symmetry = self.stage.symmetry
+            taps = len(expand_fir(self.model.values[:, 0], symmetry))
+            text += f" stored, {taps} taps, symmetry {symmetry}"
+        self.title_label.setText(text)
+
+    def write_back(self, *args):
+        set_stage_array(self.stage, self.attr, self.model.values)
+        self.update_title()
+        self.changed.emit(self.stage)
+
+    def replace_values(self, values):
+        self.model.set_values(values)
+        self.write_back()
+
+    def add_row(self):
+        # A copy of the last selected row, or of the last row, follows it
+        rows = {index.row() for index in self.view.selectedIndexes()}
+        values = self.model.values
+        position = max(rows) + 1 if rows else len(values)
+        if position:
+            new = values[position - 1]
+        else:
+            new = np.zeros(values.shape[1])
+        self.replace_values(np.insert(values, position, new, axis=0))
+        self.view.selectRow(position)
+
+    def delete_rows(self):
+        rows = {index.row() for index in self.view.selectedIndexes()}
+        if rows:
+            self.replace_values(
+                np.delete(self.model.values, sorted(rows), axis=0)
+            )
+
+    def _insert_text(self, text, source):
+        # Pasted or imported values replace the selected rows, or all rows
+        # when nothing is selected
+        try:
+            values = parse_values(text, self.model.values.shape[1])
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Values", f"{source}: {e}")
+            return
+        if not len(values):
+            return
+        rows = sorted({index.row() for index in self.view.selectedIndexes()})
+        if rows:
+            current = np.delete(self.model.values, rows, axis=0)
+            values = np.insert(current, rows[0], values, axis=0)
+        self.replace_values(values)
+
+    def paste(self):
+        self._insert_text(QApplication.clipboard().text(), "Clipboard")
+
+    def import_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            f"Import {self.label}",
+            "",
+            "Text Files (*.txt *.csv *.dat);;All Files (*)",
+        )
+        if not path:
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Failed to read {path}:\n{e}")
+            return
+        self.view.clearSelection()
+        self._insert_text(text, path)
+
+    def compress(self):
+        taps = expand_fir(self.model.values[:, 0], self.stage.symmetry)
+        symmetry = detect_symmetry(taps)
+        if symmetry == "NONE":
+            QMessageBox.information(
+                self, "Not Symmetric", "The FIR filter is not symmetric."
+            )
+            return
+        self.stage.symmetry = symmetry
+        self.replace_values(compress_fir(taps, symmetry).reshape(-1, 1))
+
+    def expand(self):
+        taps = expand_fir(self.model.values[:, 0], self.stage.symmetry)
+        self.stage.symmetry = "NONE"
+        self.replace_values(taps.reshape(-1, 1))
@@ -0,0 +1,225 @@
+import os
+
+from PyQt5.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QAbstractItemView,
+    QFileDialog,
+    QMessageBox,
+    QProgressDialog,
+    QApplication,
+)
+from PyQt5.QtCore import Qt
+
+from SRM_core.inventory_io import COMPRESSED_SUFFIXES, INVENTORY_SUFFIXES
+from SRM_core.stationxml import write_stationxml
+
+INVENTORY_FILTER = "Inventory Files ({});;All Files (*)".format(
+    " ".join(
+        f"*{suffix}{compression}"
+        for suffix in INVENTORY_SUFFIXES
+        for compression in ("",) + COMPRESSED_SUFFIXES
+    )
+)
+
+
+def _day(date):
+    return (date or "")[:10]
+
+
+class StoreTab(QWidget):
+    # Browses an InventoryStore without loading it: stations and channels
+    # are queried when their parent is expanded
+    COLUMNS = ("Code", "Start", "End", "Contents")
+
+    def __init__(self, main_window, store):
+        super().__init__()
+        self.main_window = main_window
+        self.store = store
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        top_layout.addWidget(self.summary_label)
+        top_layout.addStretch()
+        import_btn = QPushButton("Import Files")
+        import_btn.clicked.connect(self.import_files)
+        top_layout.addWidget(import_btn)
+        export_btn = QPushButton("Export Selection")
+        export_btn.clicked.connect(self.export_selection)
+        top_layout.addWidget(export_btn)
+        open_btn = QPushButton("Open Selection in Manager")
+        open_btn.clicked.connect(self.open_selection)
+        top_layout.addWidget(open_btn)
+        layout.addLayout(top_layout)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(self.COLUMNS)
+        self.tree.setColumnWidth(0, 220)
+        self.tree.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.tree.itemExpanded.connect(self.populate_item)
+        layout.addWidget(self.tree)
+        self.reload()
+
+    def reload(self):
+        networks, stations, channels = self.store.counts()
+        self.summary_label.setText(
+            f"{os.path.basename(self.store.path)}: {networks} network(s), "
+            f"{stations} station(s), {channels} channel(s)"
+        )
+        self.tree.clear()
+        items = []
+        for row in self.store.networks():
+            item = self._item(
+                "network",
+                row,
+                f"Network: {row['code']}",
+                f"{row['stations']} stations, {row['channels']} channels",
+            )
+            item.setToolTip(0, row["path"])
+            items.append(item)
+        self.tree.addTopLevelItems(items)
+
+    def _item(self, kind, row, label, contents):
+        item = QTreeWidgetItem(
+            [label, _day(row["start_date"]), _day(row["end_date"]), contents]
+        )
+        item.setData(0, Qt.UserRole, (kind, row["id"]))
+        if kind != "channel":
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        return item
+
+    def populate_item(self, item):
+        if item.childCount() or item.data(1, Qt.UserRole):
+            return
+        item.setData(1, Qt.UserRole, True)
+        kind, row_id = item.data(0, Qt.UserRole)
+        if kind == "network":
+            children = [
+                self._item(
+                    "station",
+                    row,
+                    f"Station: {row['code']}",
+                    f"{row['channels']} channels",
+                )
+                for row in self.store.stations(row_id)
+            ]
+        else:
+            children = [
+                self._item(
+                    "channel",
+                    row,
+                    f"Channel: {row['location']}.{row['code']}",
+                    f"{row['sample_rate'] or 0:g} Hz",
+                )
+                for row in self.store.channels(row_id)
+            ]
+        item.addChildren(children)
+
+    def import_files(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Import into Store", "", INVENTORY_FILTER
+        )
+        if not paths:
+            return
+        progress = QProgressDialog(
+            "Importing inventories...", "Cancel", 0, len(paths), self
+        )
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        errors = []
+        replaced = 0
+        for done, path in enumerate(paths):
+            progress.setValue(done)
+            progress.setLabelText(f"Importing {os.path.basename(path)}...")
+            QApplication.processEvents()
+            if progress.wasCanceled():
+                break
+            try:
+                replaced += self.store.import_file(path)
+            except Exception as e:
+                errors.append(f"{path}: {e}")
+        progress.close()
+        if errors:
+            QMessageBox.warning(
+                self, "Import Errors", "\n".join(errors[:10])
+            )
+        if replaced:
+            QMessageBox.information(
+                self,
+                "Import",
+                f"{replaced} file(s) were in the store already and have "
+                "been replaced.",
+            )
+        self.reload()
+
+    def selection(self):
+        return [
+            item.data(0, Qt.UserRole) for item in self.tree.selectedItems()
+        ]
+
+    def _selected_inventory(self):
+        selection = self.selection()
+        if not selection:
+            QMessageBox.information(
+                self, "No Selection", "Select networks, stations or channels."
+            )
+            return None
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            return self.store.inventory(selection)
+        finally:
+            QApplication.restoreOverrideCursor()
+
+    def _save(self, inventory, title):
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            title,
+            "selection.xml",
+            "StationXML Files (*.xml);;"
+            "Compressed StationXML (*.xml.gz *.xml.zst)",
+        )
+        if not path:
+            return None
+        try:
+            write_stationxml(inventory, path)
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"Failed to save:\n{e}")
+            return None
+        return path
+
+    def export_selection(self):
+        inventory = self._selected_inventory()
+        if inventory is None:
+            return
+        path = self._save(inventory, "Export Selection")
+        if path:
+            QMessageBox.information(
+                self, "Success", f"Selection exported to:\n{path}"
+            )
+
+    def open_selection(self):
+        # The selection is written to a file first so that it can be edited
+        # and saved like any other inventory
+        inventory = self._selected_inventory()
+        if inventory is None:
+            return
+        path = self._save(inventory, "Save Selection As")
+        if not path:
+            return
+        path = os.path.abspath(path)
+        main_window = self.main_window
+        replaced = path in main_window.loaded_files
+        main_window.loaded_files[path] = inventory
+        main_window.dirty_files.discard(path)
+        if replaced:
+            main_window.manager_tab.refresh()
+        else:
+            main_window.manager_tab.add_file_to_tree(path, inventory)
+        main_window.file_watcher.watch(path)
+        main_window.tabs.setCurrentIndex(0)
@@ -0,0 +1,87 @@
+import itertools
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+# Tabs that can be offloaded and built again from their state
+POOLED_TABS = ("explorer", "response")
+
+
+class OffloadedTab(QWidget):
+    # Stands in for an offloaded tab until it is shown again
+    def __init__(self, key, state):
+        super().__init__()
+        self.key = key
+        self.state = state
+        layout = QVBoxLayout(self)
+        label = QLabel("Loading...")
+        label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(label)
+
+
+class TabPool:
+    # Keeps at most cap explorer and response tabs built. Beyond that the
+    # least recently shown ones are replaced by an OffloadedTab holding
+    # their pool_state(); showing it calls build(key, state) for a new tab.
+    def __init__(self, tabs, open_tabs, build, cap):
+        self.tabs = tabs
+        self.open_tabs = open_tabs
+        self.build = build
+        self.cap = cap
+        self.shown = {}
+        self.clock = itertools.count()
+        tabs.currentChanged.connect(self.tab_shown)
+
+    def key_of(self, widget):
+        return next(
+            (key for key, tab in self.open_tabs.items() if tab is widget),
+            None,
+        )
+
+    def tab_shown(self, index):
+        widget = self.tabs.widget(index)
+        key = self.key_of(widget)
+        if key is None or key[0] not in POOLED_TABS:
+            return
+        self.shown[key] = next(self.clock)
+        if isinstance(widget, OffloadedTab):
+            self._replace(key, self.build(key, widget.state))
+        self.trim()
+
+    def forget(self, key):
+        self.shown.pop(key, None)
+
+    def trim(self):
+        current = self.tabs.currentWidget()
+        built = [
+            key
+            for key, tab in self.open_tabs.items()
+            if key[0] in POOLED_TABS and not isinstance(tab, OffloadedTab)
+        ]
+        excess = len(built) - self.cap
+        built.sort(key=lambda key: self.shown.get(key, -1))
+        for key in built:
+            if excess <= 0:
+                break
+            tab = self.open_tabs[key]
+            if tab is not current:
+                self._replace(key, OffloadedTab(key, tab.pool_state()))
+                excess -= 1
+
+    def _replace(self, key, widget):
+        old = self.open_tabs[key]
+        index = self.tabs.indexOf(old)
+        current = self.tabs.currentIndex()
+        # Removing and inserting would report the current tab as changed
+        self.tabs.blockSignals(True)
+        try:
+            text = self.tabs.tabText(index)
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, widget, text)
+            self.tabs.setCurrentIndex(current)
+        finally:
+            self.tabs.blockSignals(False)
+        self.open_tabs[key] = widget
+        if hasattr(old, "release"):
+            old.release()
+        old.deleteLater()
@@ -0,0 +1,160 @@
+import os
+
+from PyQt5.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QAbstractItemView,
+    QMessageBox,
+    QDoubleSpinBox,
+    QApplication,
+)
+from PyQt5.QtGui import QColor, QBrush
+from PyQt5.QtCore import Qt
+
+from SRM_core.validation import (
+    validate_inventories,
+    repair_sensitivity,
+    DEFAULT_TOLERANCE,
+)
+
+
+class ValidationTab(QWidget):
+    COLUMNS = (
+        "File", "SEED ID", "Start", "Check", "Severity", "Message",
+        "Expected", "Actual",
+    )
+    SEVERITY_COLORS = {"error": "firebrick", "warning": "darkorange"}
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.report = []
+
+        layout = QVBoxLayout(self)
+        top_layout = QHBoxLayout()
+        self.summary_label = QLabel("Not validated yet.")
+        top_layout.addWidget(self.summary_label)
+        top_layout.addStretch()
+        top_layout.addWidget(QLabel("Tolerance (%):"))
+        self.tolerance_spin = QDoubleSpinBox()
+        self.tolerance_spin.setDecimals(3)
+        self.tolerance_spin.setRange(0.001, 100.0)
+        self.tolerance_spin.setValue(DEFAULT_TOLERANCE * 100)
+        top_layout.addWidget(self.tolerance_spin)
+        rerun_btn = QPushButton("Re-run")
+        rerun_btn.clicked.connect(self.run_validation)
+        top_layout.addWidget(rerun_btn)
+        fix_selected_btn = QPushButton("Fix Selected")
+        fix_selected_btn.clicked.connect(self.fix_selected)
+        top_layout.addWidget(fix_selected_btn)
+        fix_all_btn = QPushButton("Fix All Sensitivities")
+        fix_all_btn.clicked.connect(self.fix_all)
+        top_layout.addWidget(fix_all_btn)
+        layout.addLayout(top_layout)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setStretchLastSection(False)
+        self.table.setColumnWidth(5, 380)
+        layout.addWidget(self.table)
+
+    def run_validation(self):
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            self.report = validate_inventories(
+                self.main_window.loaded_files,
+                tolerance=self.tolerance_spin.value() / 100,
+            )
+        except Exception as e:
+            QMessageBox.warning(self, "Validation Error", str(e))
+            self.report = []
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.populate_table()
+
+    def populate_table(self):
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(self.report))
+        for row, issue in enumerate(self.report):
+            values = (
+                os.path.basename(issue["file"]),
+                issue["seed_id"],
+                str(issue["start"] or ""),
+                issue["check"],
+                issue["severity"],
+                issue["message"],
+                issue["expected"],
+                issue["actual"],
+            )
+            for col, value in enumerate(values):
+                item = QTableWidgetItem()
+                if isinstance(value, float):
+                    item.setData(Qt.EditRole, value)
+                else:
+                    item.setText("" if value is None else str(value))
+                if col == 4:
+                    color = self.SEVERITY_COLORS.get(value)
+                    if color:
+                        item.setForeground(QBrush(QColor(color)))
+                item.setData(Qt.UserRole, row)
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+
+        errors = sum(1 for i in self.report if i["severity"] == "error")
+        fixable = sum(1 for i in self.report if i["fixable"])
+        channels = len({id(i["channel"]) for i in self.report})
+        self.summary_label.setText(
+            f"{len(self.report)} issue(s) on {channels} channel(s): "
+            f"{errors} error(s), {fixable} fixable."
+        )
+
+    def _fix(self, issues):
+        responses = {}
+        files = set()
+        for issue in issues:
+            if issue["fixable"] and issue["channel"].response is not None:
+                responses[id(issue["channel"].response)] = (
+                    issue["channel"].response
+                )
+                files.add(issue["file"])
+        if not responses:
+            QMessageBox.information(
+                self, "Nothing to Fix", "No fixable issues selected."
+            )
+            return
+        fixed = [r for r in responses.values() if repair_sensitivity(r)]
+        fixed_ids = {id(r) for r in fixed}
+        self.main_window.mark_dirty(
+            *(
+                issue["file"]
+                for issue in issues
+                if id(issue["channel"].response) in fixed_ids
+            )
+        )
+        # Open response tabs show the old sensitivity
+        self.main_window.refresh_after_response_change(
+            files, [(r, r) for r in fixed]
+        )
+        self.run_validation()
+        QMessageBox.information(
+            self,
+            "Fixed",
+            f"Recalculated the sensitivity of {len(fixed)} response(s).",
+        )
+
+    def fix_selected(self):
+        rows = {
+            self.table.item(index.row(), 0).data(Qt.UserRole)
+            for index in self.table.selectionModel().selectedRows()
+        }
+        self._fix([self.report[row] for row in sorted(rows)])
+
+    def fix_all(self):
+        self._fix(self.report)
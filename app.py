@@ -1,10 +1,13 @@
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
 from SRM_gui.main_window import MainWindow
 
 
 def main():
+    # Validation and plot export run in worker processes
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     app.setWindowIcon(QIcon('resources\\icon.ico'))
@@ -0,0 +1,89 @@
+# Compressed inventory read benchmark for Seismic Response Manager.
+#
+# Writes one synthetic inventory as plain, gzip and zstd StationXML and
+# compares how long each takes to read: through read_inventory_file, which
+# decompresses into memory, and for gzip also through ObsPy's own
+# read_inventory, which decompresses to a temporary file first.
+#
+#   python benchmarks/compression_benchmark.py
+#   python benchmarks/compression_benchmark.py --stations 2000 --repeat 5
+import argparse
+import copy
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from obspy import read_inventory
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from SRM_core.inventory_io import read_inventory_file  # noqa: E402
+from SRM_core.stationxml import write_stationxml  # noqa: E402
+
+
+def make_inventory(source, stations):
+    # Copies of the first station of source under new codes
+    inventory = read_inventory(source) if source else read_inventory()
+    network = inventory[0]
+    base = network.stations[0]
+    copies = []
+    for i in range(stations):
+        station = copy.deepcopy(base)
+        station.code = f"S{i:04d}"
+        copies.append(station)
+    network.stations = copies
+    inventory.networks = [network]
+    return inventory
+
+
+def timed(read, path, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        read(path)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare read times of plain and compressed StationXML."
+    )
+    parser.add_argument("--source", help="StationXML file to copy from")
+    parser.add_argument("--stations", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    inventory = make_inventory(args.source, args.stations)
+    cases = [
+        ("plain", "inventory.xml", read_inventory_file),
+        ("gzip", "inventory.xml.gz", read_inventory_file),
+        ("gzip (ObsPy temp file)", "inventory.xml.gz", read_inventory),
+        ("zstd", "inventory.xml.zst", read_inventory_file),
+    ]
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'file':<24} {'size':>10} {'read':>9}")
+        plain = None
+        for label, name, read in cases:
+            path = str(Path(workdir) / name)
+            try:
+                if not Path(path).exists():
+                    write_stationxml(inventory, path)
+            except ImportError as e:
+                print(f"{label:<24} skipped: {e}")
+                continue
+            seconds = timed(read, path, max(1, args.repeat))
+            plain = plain or seconds
+            size = Path(path).stat().st_size / 1e6
+            print(
+                f"{label:<24} {size:>8.3f}MB {seconds:>8.3f}s"
+                f" ({seconds / plain:.2f}x plain)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+# Startup benchmark for Seismic Response Manager.
+#
+# Launches the application in a fresh interpreter with ``-X importtime``,
+# measures the time until the main window has been shown and prints the
+# heaviest imports. Exits with a non-zero status when modules that should be
+# loaded lazily are imported at startup or when time-to-first-window exceeds
+# the saved baseline by more than the allowed tolerance.
+#
+#   python benchmarks/startup_benchmark.py
+#   python benchmarks/startup_benchmark.py --save-baseline
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "startup_baseline.json"
+
+# These are only needed once the user plots a response, opens the NRL,
+# reads waveform data or queries station locations, so they must not appear
+# before the first window.
+DEFERRED_MODULES = (
+    "matplotlib",
+    "obspy.clients.nrl",
+    "obspy.io.mseed",
+    "scipy",
+)
+
+PROBE = r"""
+import sys
+import time
+import json
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from SRM_core.utils import is_nrl_root
+from SRM_gui.main_window import MainWindow
+
+if not is_nrl_root("resources/NRL"):
+    sys.exit("The fake NRL does not pass the NRL check")
+
+
+def modal(*args, **kwargs):
+    # A message box at startup would wait for a click forever
+    sys.exit(f"Message box at startup: {{args[1:3]}}")
+
+
+for name in ("information", "warning", "critical", "question"):
+    setattr(QMessageBox, name, staticmethod(modal))
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+app.processEvents()
+shown = time.time()
+deferred = sorted(
+    m for m in sys.modules
+    if any(m == d or m.startswith(d + ".") for d in {deferred!r})
+)
+print("SRM_STARTUP " + json.dumps({{"shown": shown, "deferred": deferred}}))
+sys.stdout.flush()
+"""
+
+
+def make_fake_nrl(root):
+    # The main window only checks the NRL layout at startup, which needs
+    # the index of every top folder of NRL v2
+    for sub in ("sensor", "datalogger", "integrated", "soh"):
+        folder = Path(root) / "resources" / "NRL" / sub
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "index.txt").write_text(
+            "[Main]\nquestion = \"Select\"\n", encoding="utf-8"
+        )
+
+
+def parse_importtime(stderr):
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split(
+            "|", 2
+        )
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append(
+            {
+                "name": name.strip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": depth,
+            }
+        )
+    return imports
+
+
+def run_once(workdir):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(REPO_ROOT), env.get("PYTHONPATH")) if p
+    )
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    code = PROBE.format(deferred=DEFERRED_MODULES)
+    started = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=workdir,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith("SRM_STARTUP "):
+            result = json.loads(line[len("SRM_STARTUP "):])
+    if proc.returncode != 0 or result is None:
+        raise RuntimeError(
+            f"Startup probe failed ({proc.returncode}):\n{proc.stderr[-2000:]}"
+        )
+    result["first_window_s"] = result.pop("shown") - started
+    result["imports"] = parse_importtime(proc.stderr)
+    return result
+
+
+def print_report(runs, top):
+    imports = runs[-1]["imports"]
+    print(f"{'cumulative':>12} {'self':>10}  module (first two levels)")
+    top_level = sorted(
+        (i for i in imports if i["depth"] <= 1),
+        key=lambda i: i["cumulative_ms"],
+        reverse=True,
+    )
+    for entry in top_level[:top]:
+        print(
+            f"{entry['cumulative_ms']:>10.1f}ms {entry['self_ms']:>8.1f}ms"
+            f"  {'  ' * entry['depth']}{entry['name']}"
+        )
+    print()
+    print(f"{'self':>12}  module (slowest individual imports)")
+    for entry in sorted(imports, key=lambda i: i["self_ms"], reverse=True)[
+        :top
+    ]:
+        print(f"{entry['self_ms']:>10.1f}ms  {entry['name']}")
+    print()
+    times = [r["first_window_s"] for r in runs]
+    print(
+        "time to first window: "
+        + ", ".join(f"{t:.3f}s" for t in times)
+        + f" (median {statistics.median(times):.3f}s)"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Measure application startup and import costs."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        make_fake_nrl(workdir)
+        runs = [run_once(workdir) for _ in range(max(1, args.repeat))]
+
+    print_report(runs, args.top)
+    median = statistics.median(r["first_window_s"] for r in runs)
+    failed = False
+
+    deferred = sorted({m for r in runs for m in r["deferred"]})
+    if deferred:
+        print("FAIL: modules imported before the first window: "
+              + ", ".join(deferred))
+        failed = True
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps({"first_window_s": median}, indent=2) + "\n",
+            encoding="utf-8",
+        )
+        print(f"Saved baseline to {args.baseline}")
+    elif args.baseline.is_file():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        limit = baseline["first_window_s"] * (1 + args.tolerance)
+        if median > limit:
+            print(
+                f"FAIL: time to first window {median:.3f}s exceeds baseline"
+                f" {baseline['first_window_s']:.3f}s"
+                f" (+{args.tolerance:.0%} = {limit:.3f}s)"
+            )
+            failed = True
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline.")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+# The main window needs no display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+NRL_FOLDERS = ("sensor", "datalogger", "integrated", "soh")
+
+
+def make_fake_nrl(root):
+    # The main window only checks the NRL layout at startup
+    for sub in NRL_FOLDERS:
+        folder = root / "resources" / "NRL" / sub
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "index.txt").write_text(
+            "[Main]\nquestion = \"Select\"\n", encoding="utf-8"
+        )
+
+
+@pytest.fixture
+def window(tmp_path, monkeypatch):
+    # A main window whose message boxes fail the test instead of blocking
+    main_window = pytest.importorskip(
+        "SRM_gui.main_window", exc_type=ImportError
+    )
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError(f"Unexpected message box: {args[1:3]}")
+
+    for name in ("information", "warning", "critical", "question"):
+        monkeypatch.setattr(QMessageBox, name, staticmethod(unexpected))
+    make_fake_nrl(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    app = QApplication.instance() or QApplication([])
+    win = main_window.MainWindow()
+    yield win
+    win.close()
+    win.deleteLater()
+    app.processEvents()
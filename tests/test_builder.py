@@ -0,0 +1,118 @@
+import copy
+from types import SimpleNamespace
+
+import pytest
+from obspy import UTCDateTime, read_inventory
+
+from SRM_core.builder import (
+    build_inventory_from_table,
+    read_station_table,
+    table_instrument_keys,
+    validate_station_table,
+)
+
+HEADER = (
+    "network,station,latitude,longitude,elevation,depth,location,channels,"
+    "sample_rate,start_date,end_date,sensor_keys,datalogger_keys"
+)
+ROWS = (
+    "xx,ab1,48.1,11.2,500,0,00,\"HHZ,HHN,HHE\",100,2020-01-01,2021-01-01,"
+    "S|A,D|1",
+    "XX,AB1,48.1,11.2,500,0,00,HHZ,100,2021-01-01,,S|A,D|1",
+    "XX,AB2,48.2,11.3,510,0,,\"BHZ, BHN\",20,2020-06-01,,S|B,D|1",
+)
+
+
+def write_table(tmp_path, *rows):
+    path = tmp_path / "stations.csv"
+    path.write_text("\n".join((HEADER,) + rows) + "\n", encoding="utf-8")
+    return read_station_table(str(path))
+
+
+@pytest.fixture
+def nrl():
+    response = read_inventory()[1][0][0].response
+
+    def get_response(keys):
+        return copy.deepcopy(response)
+
+    return SimpleNamespace(
+        get_sensor_response=get_response,
+        get_datalogger_response=get_response,
+    )
+
+
+def test_valid_table(tmp_path):
+    table = write_table(tmp_path, *ROWS)
+    assert validate_station_table(table) == []
+    assert list(table["network"]) == ["XX", "XX", "XX"]
+    assert table_instrument_keys(table) == [
+        (("S", "A"), ("D", "1")),
+        (("S", "B"), ("D", "1")),
+    ]
+
+
+def test_missing_column(tmp_path):
+    path = tmp_path / "stations.csv"
+    path.write_text("network,station\nXX,AB1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="latitude"):
+        read_station_table(str(path))
+
+
+def test_invalid_cells(tmp_path):
+    table = write_table(
+        tmp_path,
+        "XXX,AB1,91,11.2,500,-1,00,HZ,0,2020-01-01,2019-01-01,,D|1",
+        "XX,AB2,48.2,11.3,510,0,,BHZ,20,not a date,,S|B,D|1",
+    )
+    assert {(row, column) for row, column, _ in
+            validate_station_table(table)} == {
+        (2, "network"),
+        (2, "latitude"),
+        (2, "depth"),
+        (2, "channels"),
+        (2, "sample_rate"),
+        (2, "end_date"),
+        (2, "sensor_keys"),
+        (3, "start_date"),
+    }
+
+
+def test_station_rows_must_agree(tmp_path):
+    table = write_table(
+        tmp_path, ROWS[0], ROWS[1].replace("48.1", "48.5")
+    )
+    assert validate_station_table(table) == [
+        (3, "latitude", "Differs from the first row of the same station.")
+    ]
+
+
+def test_duplicate_channel_epoch(tmp_path):
+    # The same start date written two ways
+    table = write_table(
+        tmp_path,
+        ROWS[1],
+        ROWS[1].replace("2021-01-01", "2021-01-01T00:00:00"),
+    )
+    assert validate_station_table(table) == [
+        (2, "channels", "Channel epoch is defined more than once."),
+        (3, "channels", "Channel epoch is defined more than once."),
+    ]
+
+
+def test_build_inventory(tmp_path, nrl):
+    inventory = build_inventory_from_table(write_table(tmp_path, *ROWS), nrl)
+    assert sorted(inventory.get_contents()["channels"]) == [
+        "XX.AB1.00.HHE", "XX.AB1.00.HHN", "XX.AB1.00.HHZ", "XX.AB1.00.HHZ",
+        "XX.AB2..BHN", "XX.AB2..BHZ",
+    ]
+    ab1, ab2 = inventory[0].stations
+    # The last channel epoch is open, so the station is too
+    assert ab1.start_date == UTCDateTime(2020, 1, 1)
+    assert ab1.end_date is None
+    hhe = ab1.select(channel="HHE")[0]
+    assert (hhe.azimuth, hhe.dip) == (90, 0)
+    assert hhe.end_date == UTCDateTime(2021, 1, 1)
+    # One response per instrument, shared by its channels
+    assert len({id(chan.response) for chan in ab1}) == 1
+    assert ab2[0].response is not ab1[0].response
@@ -0,0 +1,64 @@
+import pytest
+from obspy import UTCDateTime, read_inventory
+
+from SRM_core.bulk import apply_values, plan_bulk_edit
+
+
+@pytest.fixture
+def targets():
+    sta = read_inventory()[0][0]
+    return [(chan, sta) for chan in sta.channels]
+
+
+def test_set_and_limits(targets):
+    plan = plan_bulk_edit(targets, "azimuth", "set", "45")
+    assert plan["new"] == [45.0] * len(targets)
+    assert plan["errors"] == []
+    plan = plan_bulk_edit(targets, "latitude", "set", "91")
+    assert len(plan["errors"]) == len(targets)
+    with pytest.raises(ValueError):
+        plan_bulk_edit(targets, "latitude", "set", " ")
+
+
+def test_offsets(targets):
+    for chan, _ in targets:
+        chan.azimuth = 350.0
+    plan = plan_bulk_edit(targets, "azimuth", "add offset", "20")
+    assert plan["new"] == pytest.approx([10.0] * len(targets))
+    # Dates are offset in days, to the nanosecond
+    start = targets[0][0].start_date
+    plan = plan_bulk_edit(targets, "start_date", "add offset", "0.5")
+    assert plan["new"][0] == start + 43200
+    targets[0][0].end_date = None
+    plan = plan_bulk_edit(targets, "end_date", "add offset", "1")
+    assert plan["errors"][0][0] == 0
+
+
+def test_dates_are_checked_against_each_other(targets):
+    for chan, _ in targets:
+        chan.end_date = UTCDateTime(2030, 1, 1)
+    plan = plan_bulk_edit(targets, "start_date", "set", "2031-01-01")
+    assert [i for i, _ in plan["errors"]] == list(range(len(targets)))
+    plan = plan_bulk_edit(targets, "end_date", "set", "")
+    assert plan["new"] == [None] * len(targets)
+    assert plan["errors"] == []
+
+
+def test_copy_from_station(targets):
+    sta = targets[0][1]
+    plan = plan_bulk_edit(targets, "elevation", "copy from station")
+    assert plan["new"] == [float(sta.elevation)] * len(targets)
+    with pytest.raises(ValueError):
+        plan_bulk_edit(targets, "azimuth", "copy from station")
+    with pytest.raises(ValueError):
+        plan_bulk_edit([(sta, None)], "elevation", "copy from station")
+
+
+def test_apply_is_all_or_nothing(targets):
+    channels = [chan for chan, _ in targets]
+    old = [chan.sample_rate for chan in channels]
+    with pytest.raises(Exception):
+        apply_values(channels, "sample_rate", [1.0, "not a rate"])
+    assert [chan.sample_rate for chan in channels] == old
+    apply_values(channels, "sample_rate", [5.0] * len(channels))
+    assert {chan.sample_rate for chan in channels} == {5.0}
@@ -0,0 +1,53 @@
+import copy
+
+import numpy as np
+from obspy import read_inventory
+from obspy.core.inventory import Response
+
+from SRM_core.compare import compare, decimate, evaluate_responses
+
+
+def responses():
+    inventory = read_inventory()
+    return [chan.response for chan in inventory[1][0].channels[:3]]
+
+
+def test_equal_responses_are_evaluated_once():
+    first, *_ = responses()
+    freq = np.logspace(-1, 1, 16)
+    h, errors = evaluate_responses([first, copy.deepcopy(first)], freq)
+    assert errors == {}
+    assert h.shape == (2, 16)
+    np.testing.assert_array_equal(h[0], h[1])
+
+
+def test_errors_leave_nan_rows():
+    freq = np.logspace(-1, 1, 16)
+    h, errors = evaluate_responses([responses()[0], Response()], freq)
+    assert list(errors) == [1]
+    assert np.isnan(h[1]).all()
+    assert np.isfinite(h[0]).all()
+
+
+def test_compare_to_reference():
+    h = np.array([[1 + 1j, 2j], [2 + 2j, -2j]])
+    amp, phase, ratio, difference = compare(h, 0)
+    np.testing.assert_allclose(ratio[1], [2.0, 1.0])
+    np.testing.assert_allclose(ratio[0], [1.0, 1.0])
+    np.testing.assert_allclose(difference[1], [0.0, 180.0], atol=1e-12)
+    np.testing.assert_allclose(phase[0], [45.0, 90.0])
+
+
+def test_decimate_keeps_peaks_and_nan_rows():
+    x = np.arange(1000.0)
+    y = np.vstack([np.zeros(1000), np.full(1000, np.nan)])
+    y[0, 333] = 5.0
+    y[0, 777] = -5.0
+    dx, dy = decimate(x, y, 100)
+    assert dy.shape == dx.shape == (2, 100)
+    assert dy[0].max() == 5.0 and dy[0].min() == -5.0
+    assert np.all(np.diff(dx[0]) >= 0)
+    assert np.isnan(dy[1]).all()
+    # Short rows are returned as they are
+    sx, sy = decimate(x[:50], y[:, :50], 100)
+    assert sy.shape == (2, 50)
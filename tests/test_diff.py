@@ -0,0 +1,98 @@
+import copy
+
+import pytest
+from obspy import read_inventory
+
+from SRM_core.diff import diff_inventories, index_inventory
+
+
+@pytest.fixture
+def inventory():
+    return read_inventory()
+
+
+def changes(old, new):
+    return [
+        (c["kind"], c["level"], c["id"], c["stage"], c["field"])
+        for c in diff_inventories(old, new)
+    ]
+
+
+def test_identical_inventories(inventory):
+    assert diff_inventories(inventory, copy.deepcopy(inventory)) == []
+
+
+def test_changed_field(inventory):
+    new = copy.deepcopy(inventory)
+    new[0][0][0].azimuth = 45.0
+    [change] = diff_inventories(inventory, new)
+    assert change["kind"] == "changed"
+    assert change["id"] == "GR.FUR..HHZ"
+    assert change["field"] == "azimuth"
+    assert change["new"] == "45.0"
+
+
+def test_uncertainty_only_change(inventory):
+    new = copy.deepcopy(inventory)
+    new[0][0].latitude.lower_uncertainty = 0.1
+    assert changes(inventory, new) == [
+        ("changed", "station", "GR.FUR", None, "latitude")
+    ]
+
+
+def test_response_stage_changes(inventory):
+    new = copy.deepcopy(inventory)
+    stages = new[0][0][0].response.response_stages
+    stages[0].stage_gain *= 2
+    assert changes(inventory, new) == [
+        ("changed", "stage", "GR.FUR..HHZ", 1, "stage_gain")
+    ]
+    del stages[-1]
+    assert changes(inventory, new)[-1] == (
+        "removed", "stage", "GR.FUR..HHZ", len(stages) + 1, None
+    )
+
+
+def test_pole_changes(inventory):
+    new = copy.deepcopy(inventory)
+    poles = new[0][0][0].response.response_stages[0].poles
+    poles[0] = type(poles[0])(poles[0] * 2, number=poles[0].number)
+    assert changes(inventory, new) == [
+        ("changed", "stage", "GR.FUR..HHZ", 1, "poles")
+    ]
+    new = copy.deepcopy(inventory)
+    poles = new[0][0][0].response.response_stages[0].poles
+    poles[1].upper_uncertainty = 0.5
+    assert changes(inventory, new) == [
+        ("changed", "stage", "GR.FUR..HHZ", 1, "poles")
+    ]
+
+
+def test_added_and_removed(inventory):
+    new = copy.deepcopy(inventory)
+    removed = new[0].stations.pop(0)
+    new[1].stations.append(removed)
+    assert sorted(changes(inventory, new)) == [
+        ("added", "station", "BW.FUR", None, None),
+        ("removed", "station", "GR.FUR", None, None),
+    ]
+
+
+def response_nodes(index):
+    network = next(iter(index.values()))
+    station = next(iter(network["children"].values()))
+    return [chan["response"] for chan in station["children"].values()]
+
+
+def test_shared_response_is_hashed_once(inventory):
+    channels = inventory[0][0].channels
+    for chan in channels[1:]:
+        chan.response = channels[0].response
+    cache = {}
+    old = response_nodes(index_inventory(inventory, cache))
+    assert len({id(node) for node in old}) == 1
+    # A response the new side shares with the old one is hashed once too
+    response = channels[0].response
+    other = copy.deepcopy(inventory, {id(response): response})
+    new = response_nodes(index_inventory(other, cache))
+    assert new[0] is old[0]
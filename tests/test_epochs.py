@@ -0,0 +1,92 @@
+import pytest
+from obspy import UTCDateTime, read_inventory
+from obspy.core.inventory import Channel
+
+from SRM_core.epochs import EpochIndex, epoch_interval, overlapping_pairs
+
+T0 = UTCDateTime(2020, 1, 1)
+
+
+def channel(start, end=None, code="HHZ"):
+    return Channel(
+        code, "", 0.0, 0.0, 0.0, 0.0,
+        start_date=T0 + start if start is not None else None,
+        end_date=T0 + end if end is not None else None,
+    )
+
+
+def test_epoch_interval():
+    assert epoch_interval(channel(0, 10)) == (T0.timestamp, T0 + 10)
+    start, end = epoch_interval(channel(None))
+    assert (start, end) == (-float("inf"), float("inf"))
+    # An end before the start gives an empty epoch
+    assert epoch_interval(channel(10, 0)) == (T0 + 10, T0 + 10)
+
+
+def test_overlapping_pairs():
+    first, second, third = channel(0, 10), channel(10, 20), channel(5)
+    other = channel(0, code="HHN")
+    pairs = overlapping_pairs(
+        [first, second, third, other], lambda c: c.code
+    )
+    assert {(id(a), id(b)) for a, b in pairs} == {
+        (id(first), id(third)),
+        (id(third), id(second)),
+    }
+
+
+@pytest.fixture
+def index():
+    index = EpochIndex()
+    index.add_inventory("a.xml", read_inventory())
+    return index
+
+
+def labels(entries):
+    return sorted({e["label"] for e in entries})
+
+
+def test_active_at(index):
+    # The GR stations start in 2006 and 2007, BW.RJOB in 2001
+    early = index.active_at(UTCDateTime(2005, 1, 1).timestamp, {"station"})
+    assert labels(early) == ["BW.RJOB"]
+    late = index.active_at(UTCDateTime(2010, 1, 1).timestamp)
+    assert labels(late) == sorted(
+        {"BW", "GR", "BW.RJOB", "GR.FUR", "GR.WET"}
+        | {e["label"] for e in late if e["kind"] == "channel"}
+    )
+    # Across the change of two BW.RJOB epochs
+    change = index.overlapping(
+        UTCDateTime(2006, 12, 11).timestamp,
+        UTCDateTime(2006, 12, 14).timestamp,
+        {"station"},
+    )
+    assert [e["label"] for e in change] == ["BW.RJOB", "BW.RJOB"]
+
+
+def test_edits_and_removal(index):
+    inventory = read_inventory()
+    index.add_inventory("b.xml", inventory)
+    year = UTCDateTime(2010, 1, 1).timestamp
+    index.active_at(year)
+    wet = inventory[0][1]
+    wet.end_date = UTCDateTime(2009, 1, 1)
+    index.update(wet)
+    assert [e["file"] for e in index.active_at(year, {"station"})
+            if e["label"] == "GR.WET"] == ["a.xml"]
+    index.remove_inventory("a.xml")
+    assert labels(index.active_at(year, {"station"})) == [
+        "BW.RJOB", "GR.FUR"
+    ]
+
+
+def test_time_span():
+    index = EpochIndex()
+    assert index.time_span() is None
+    inventory = read_inventory()
+    index.add_inventory("a.xml", inventory)
+    start, end = index.time_span()
+    assert start == min(
+        sta.start_date.timestamp for net in inventory for sta in net
+    )
+    assert end > start
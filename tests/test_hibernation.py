@@ -0,0 +1,69 @@
+import pytest
+from obspy import read_inventory
+
+from SRM_core.residency import pack
+
+
+@pytest.fixture
+def hibernated(window, tmp_path):
+    # The example inventory, loaded and then hibernated like
+    # enforce_memory_budget() does
+    path = str(tmp_path / "example.xml")
+    inventory = read_inventory()
+    inventory.write(path, format="STATIONXML")
+    window.loaded_files[path] = inventory
+    window.manager_tab.add_file_to_tree(path, inventory)
+    window.manager_tab.hibernate_file(path, inventory)
+    window.loaded_files.hibernate(path, pack(inventory))
+    return path
+
+
+def test_search_finds_hibernated_file(window, hibernated):
+    entries = window.search_index.search("fur")
+    assert entries and all(e["path"] is None for e in entries)
+    assert {e["file"] for e in entries} == {hibernated}
+
+
+def test_refresh_keeps_hibernated_entries(window, hibernated):
+    before = window.search_index.search("fur")
+    window.manager_tab.refresh()
+    assert window.loaded_files.is_hibernated(hibernated)
+    after = window.search_index.search("fur")
+    assert [e["label"] for e in after] == [e["label"] for e in before]
+    # GR.FUR lies at 48.16 N, 11.28 E
+    near = window.spatial_index.within_radius(48.16, 11.28, 1.0)
+    assert "GR.FUR" in {e["label"] for e in near}
+
+
+def test_find_wakes_hibernated_file(window, hibernated):
+    window.manager_tab.refresh()
+    window.manager_tab.find_edit.setText("fur")
+    window.manager_tab.find_items()
+    assert not window.loaded_files.is_hibernated(hibernated)
+    selected = window.manager_tab.file_tree.selectedItems()
+    # The station and, through its code, its channels
+    assert selected and all(
+        "FUR" in item.text(0) or "FUR" in item.parent().text(0)
+        for item in selected
+    )
+
+
+def test_save_all_refreshes_once(window, hibernated, tmp_path, monkeypatch):
+    from PyQt5.QtWidgets import QMessageBox
+
+    for n in range(3):
+        path = str(tmp_path / f"copy{n}.xml")
+        window.loaded_files[path] = read_inventory()
+        window.manager_tab.add_file_to_tree(path, window.loaded_files[path])
+    refreshes = []
+    refresh = window.manager_tab.refresh
+    monkeypatch.setattr(
+        window.manager_tab, "refresh", lambda: refreshes.append(refresh())
+    )
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: None)
+    window.save_all_files()
+    assert len(refreshes) == 1
+    assert window.loaded_files.is_hibernated(hibernated)
+    assert {e["file"] for e in window.search_index.search("fur")} >= {
+        hibernated
+    }
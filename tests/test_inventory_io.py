@@ -0,0 +1,89 @@
+import gzip
+import os
+
+import obspy
+import pytest
+from obspy import read_inventory
+
+from SRM_core.inventory_io import (
+    is_inventory_file,
+    read_inventory_file,
+    read_inventory_files,
+    sniff_format,
+    split_suffix,
+)
+from SRM_core.stationxml import write_stationxml
+
+DATALESS = os.path.join(
+    os.path.dirname(obspy.__file__),
+    "io", "xseed", "tests", "data", "dataless.seed.BW_FURT",
+)
+COMPRESSIONS = ("", ".gz", ".zst")
+
+
+def compress(data, compression):
+    if compression == ".gz":
+        return gzip.compress(data)
+    if compression == ".zst":
+        zstandard = pytest.importorskip("zstandard")
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+def channels(inventory):
+    return sorted(inventory.get_contents()["channels"])
+
+
+def test_suffixes():
+    assert split_suffix("a.XML.gz") == (".xml", ".gz")
+    assert split_suffix("a.dataless") == (".dataless", "")
+    assert is_inventory_file("a.dataless.zst")
+    assert not is_inventory_file("a.mseed.gz")
+
+
+def test_sniff_format():
+    assert sniff_format(b"\xef\xbb\xbf\n  <?xml version") == "STATIONXML"
+    with open(DATALESS, "rb") as f:
+        assert sniff_format(f.read(64)) == "SEED"
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_stationxml_round_trip(tmp_path, compression):
+    if compression == ".zst":
+        pytest.importorskip("zstandard")
+    inventory = read_inventory()
+    path = str(tmp_path / f"a.xml{compression}")
+    write_stationxml(inventory, path)
+    assert channels(read_inventory_file(path)) == channels(inventory)
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_dataless_seed(tmp_path, compression):
+    # The SEED parser seeks back, which compressed streams cannot
+    with open(DATALESS, "rb") as f:
+        data = compress(f.read(), compression)
+    path = tmp_path / f"a.dataless{compression}"
+    path.write_bytes(data)
+    inventory = read_inventory_file(str(path))
+    assert channels(inventory) == channels(read_inventory(DATALESS))
+    assert inventory[0][0][0].response.response_stages
+
+
+@pytest.mark.parametrize("compression", (".gz", ".zst"))
+def test_dataless_seed_saved_as_stationxml(tmp_path, compression):
+    if compression == ".zst":
+        pytest.importorskip("zstandard")
+    inventory = read_inventory(DATALESS)
+    path = str(tmp_path / f"a.dataless{compression}")
+    write_stationxml(inventory, path)
+    assert channels(read_inventory_file(path)) == channels(inventory)
+
+
+def test_read_files_reports_errors(tmp_path):
+    good = str(tmp_path / "good.xml.gz")
+    write_stationxml(read_inventory(), good)
+    bad = tmp_path / "bad.xml.gz"
+    bad.write_bytes(b"not gzip")
+    inventories, errors = read_inventory_files([str(bad), good])
+    assert list(inventories) == [good]
+    assert [path for path, _ in errors] == [str(bad)]
@@ -0,0 +1,105 @@
+import copy
+
+import pytest
+from obspy import UTCDateTime, read_inventory
+
+from SRM_core.merge import build_merged_inventory, plan_merge
+
+
+@pytest.fixture
+def inventory():
+    return read_inventory()
+
+
+def station(inventory, code):
+    return next(
+        sta for net in inventory.networks for sta in net.stations
+        if sta.code == code
+    )
+
+
+def epochs(inventory, code):
+    return sorted(
+        (sta.start_date, sta.end_date, sta.latitude)
+        for net in inventory.networks for sta in net.stations
+        if sta.code == code
+    )
+
+
+def test_identical_inventories_merge_into_one(inventory):
+    plan = plan_merge([("a", inventory), ("b", copy.deepcopy(inventory))])
+    assert plan["conflicts"] == []
+    assert plan["duplicates"] == plan["total"] // 2
+    merged, overlaps = build_merged_inventory(plan)
+    assert overlaps == []
+    assert sorted(merged.get_contents()["channels"]) == sorted(
+        inventory.get_contents()["channels"]
+    )
+
+
+def test_station_epochs_are_kept_apart(inventory):
+    # FUR moved: the second file holds a later epoch at another place
+    moved = copy.deepcopy(inventory)
+    fur = station(moved, "FUR")
+    fur.start_date = UTCDateTime(2030, 1, 1)
+    fur.latitude = float(fur.latitude) + 1.0
+    for chan in fur.channels:
+        chan.start_date = fur.start_date
+    station(inventory, "FUR").end_date = UTCDateTime(2030, 1, 1)
+    plan = plan_merge([("a", inventory), ("b", moved)])
+    assert plan["conflicts"] == []
+    merged, overlaps = build_merged_inventory(plan)
+    assert overlaps == []
+    old = station(inventory, "FUR")
+    assert epochs(merged, "FUR") == [
+        (old.start_date, old.end_date, old.latitude),
+        (fur.start_date, None, fur.latitude),
+    ]
+    assert len(merged.select(station="FUR").get_contents()["channels"]) == (
+        2 * len(fur.channels)
+    )
+
+
+def test_overlapping_station_that_differs_is_a_conflict(inventory):
+    moved = copy.deepcopy(inventory)
+    moved_station = station(moved, "FUR")
+    moved_station.latitude = float(moved_station.latitude) + 1.0
+    plan = plan_merge([("a", inventory), ("b", moved)])
+    assert [c["id"] for c in plan["conflicts"]] == ["GR.FUR"]
+    # Channels ride with their station epoch, they are no conflicts
+    assert plan["duplicates"] == plan["total"] // 2 - len(
+        station(moved, "FUR").channels
+    )
+
+    merged, overlaps = build_merged_inventory(plan)
+    assert overlaps == []
+    assert epochs(merged, "FUR")[0][2] == station(inventory, "FUR").latitude
+
+    plan["conflicts"][0]["resolution"] = "use incoming"
+    merged, overlaps = build_merged_inventory(plan)
+    assert overlaps == []
+    assert epochs(merged, "FUR")[0][2] == station(moved, "FUR").latitude
+    assert len(merged.select(station="FUR").get_contents()["channels"]) == (
+        len(station(moved, "FUR").channels)
+    )
+
+
+def test_keep_both_is_reported(inventory):
+    changed = copy.deepcopy(inventory)
+    chan = station(changed, "FUR").channels[0]
+    chan.azimuth = (chan.azimuth or 0.0) + 1.0
+    plan = plan_merge([("a", inventory), ("b", changed)])
+    assert [c["id"] for c in plan["conflicts"]] == [
+        f"GR.FUR.{chan.location_code}.{chan.code}"
+    ]
+    plan["conflicts"][0]["resolution"] = "keep both"
+    merged, overlaps = build_merged_inventory(plan)
+    assert overlaps == [f"GR.FUR.{chan.location_code}.{chan.code}"]
+
+    moved = copy.deepcopy(inventory)
+    moved_station = station(moved, "WET")
+    moved_station.latitude = float(moved_station.latitude) + 1.0
+    plan = plan_merge([("a", inventory), ("b", moved)])
+    plan["conflicts"][0]["resolution"] = "keep both"
+    merged, overlaps = build_merged_inventory(plan)
+    assert overlaps == ["GR.WET"]
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from obspy import Stream, Trace, UTCDateTime
+
+from SRM_core.mseed import scan_mseed, scan_mseed_archive
+
+T0 = UTCDateTime(2020, 1, 1)
+
+
+def trace(start=0.0, npts=1000, channel="HHZ", rate=100.0):
+    return Trace(
+        np.arange(npts, dtype=np.int32),
+        header={
+            "network": "XX", "station": "AB1", "location": "00",
+            "channel": channel, "sampling_rate": rate,
+            "starttime": T0 + start,
+        },
+    )
+
+
+def only(summaries):
+    assert len(summaries) == 1
+    return summaries[0]
+
+
+@pytest.mark.parametrize("byteorder", [">", "<"])
+def test_scan_matches_obspy(tmp_path, byteorder):
+    path = str(tmp_path / "a.mseed")
+    Stream([trace()]).write(
+        path, format="MSEED", reclen=512, byteorder=byteorder
+    )
+    summary = only(scan_mseed(path))
+    assert (summary["network"], summary["station"], summary["channel"]) == (
+        "XX", "AB1", "HHZ"
+    )
+    assert summary["sample_rate"] == 100.0
+    assert summary["starttime"] == T0
+    assert summary["endtime"] == T0 + 9.99
+    assert summary["samples"] == 1000
+    assert summary["records"] > 1
+    assert (summary["gaps"], summary["overlaps"]) == (0, 0)
+
+
+def test_gaps_overlaps_and_streams(tmp_path):
+    path = str(tmp_path / "a.mseed")
+    Stream(
+        [trace(), trace(20.0), trace(25.0), trace(channel="HHN", rate=20.0)]
+    ).write(path, format="MSEED", reclen=512)
+    hhn, hhz = scan_mseed(path)
+    assert (hhn["channel"], hhn["sample_rate"]) == ("HHN", 20.0)
+    assert (hhz["gaps"], hhz["overlaps"]) == (1, 1)
+    assert hhz["endtime"] == T0 + 34.99
+
+
+def test_mixed_record_lengths(tmp_path):
+    # Scanned record by record
+    first, second = tmp_path / "a.mseed", tmp_path / "b.mseed"
+    Stream([trace()]).write(str(first), format="MSEED", reclen=512)
+    Stream([trace(10.0)]).write(str(second), format="MSEED", reclen=4096)
+    path = tmp_path / "c.mseed"
+    path.write_bytes(first.read_bytes() + second.read_bytes())
+    summary = only(scan_mseed(str(path)))
+    assert summary["samples"] == 2000
+    assert (summary["gaps"], summary["overlaps"]) == (0, 0)
+    assert summary["endtime"] == T0 + 19.99
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "a.mseed"
+    path.write_bytes(b"")
+    assert scan_mseed(str(path)) == []
+
+
+def test_sds_archive(tmp_path):
+    directory = tmp_path / "2020" / "XX" / "AB1" / "HHZ.D"
+    directory.mkdir(parents=True)
+    for day in range(3):
+        name = f"XX.AB1.00.HHZ.D.2020.{day + 1:03d}"
+        Stream([trace(day * 86400.0)]).write(
+            str(directory / name), format="MSEED"
+        )
+    (tmp_path / "broken.mseed").write_bytes(b"not a miniseed file")
+    scanned = []
+    rows, errors = scan_mseed_archive(
+        str(tmp_path), progress=lambda done, total: scanned.append(total)
+    )
+    # The middle day file is not read
+    assert scanned == [3, 3, 3]
+    row = only(rows)
+    assert row["starttime"] == T0
+    assert row["endtime"] == T0 + 2 * 86400 + 9.99
+    assert [path for path, _ in errors] == [str(tmp_path / "broken.mseed")]
@@ -0,0 +1,71 @@
+import copy
+import os
+
+from obspy import read_inventory
+
+from SRM_core.residency import (
+    LoadedFiles,
+    estimate_size,
+    measure,
+    pack,
+)
+from SRM_core.stationxml import write_stationxml
+
+
+def test_measure_samples_large_inventories():
+    inventory = read_inventory()
+    assert measure(inventory) == estimate_size(pack(inventory))
+    net = inventory[1]
+    net.stations = [copy.deepcopy(net[0]) for _ in range(50)]
+    sampled = measure(inventory, sample=8)
+    full = estimate_size(pack(inventory))
+    assert 0.5 * full < sampled < 2 * full
+
+
+def test_hibernate_and_wake(tmp_path):
+    files = LoadedFiles()
+    woken = []
+    files.on_wake = lambda path, inventory: woken.append(path)
+    inventory = read_inventory()
+    files["a.xml"] = inventory
+    files.hibernate("a.xml", pack(inventory))
+    assert files.is_hibernated("a.xml")
+    assert files.peek("a.xml") is None
+    assert files.resident() == []
+    cache_file = files.cache["a.xml"]
+
+    woken_inventory = files["a.xml"]
+    assert woken == ["a.xml"]
+    assert woken_inventory == inventory
+    assert not files.is_hibernated("a.xml")
+    assert not os.path.exists(cache_file)
+
+
+def test_invalidated_file_is_read_again(tmp_path):
+    path = str(tmp_path / "a.xml")
+    inventory = read_inventory()
+    write_stationxml(inventory, path)
+    files = LoadedFiles()
+    files[path] = inventory
+    files.hibernate(path, pack(inventory))
+    # Changed on disk while hibernated
+    changed = read_inventory()
+    changed[0].code = "XX"
+    write_stationxml(changed, path)
+    files.invalidate(path)
+    assert files[path][0].code == "XX"
+
+
+def test_rename_and_least_recently_used():
+    files = LoadedFiles()
+    files["a.xml"] = read_inventory()
+    files["b.xml"] = read_inventory()
+    files.hibernate("b.xml", pack(files["b.xml"]))
+    files.rename("b.xml", "c.xml")
+    assert list(files) == ["a.xml", "c.xml"]
+    assert files.is_hibernated("c.xml")
+    files["d.xml"] = read_inventory()
+    files["a.xml"]
+    assert files.least_recently_used() == ["d.xml", "a.xml"]
+    files.clear()
+    assert not files.cache
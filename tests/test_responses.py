@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from obspy import read_inventory
+
+from SRM_core.utils import apply_response_to_channels, detach_response
+
+
+def test_applied_response_is_shared_until_detached():
+    inventory = read_inventory()
+    channels = inventory[0][0].channels
+    response = read_inventory()[1][0][0].response
+    replaced = apply_response_to_channels(channels, response)
+    shared = channels[0].response
+    assert shared is not response
+    assert all(chan.response is shared for chan in channels)
+    assert [new for _, new in replaced] == [shared] * len(channels)
+
+    assert detach_response(channels[0], inventory)
+    assert channels[0].response is not shared
+    assert channels[0].response == shared
+    assert all(chan.response is shared for chan in channels[1:])
+    # A response of its own is not copied again
+    own = channels[0].response
+    assert not detach_response(channels[0], inventory)
+    assert channels[0].response is own
+
+
+def test_response_tab_edits_its_channel_only(window, tmp_path):
+    path = str(tmp_path / "example.xml")
+    inventory = read_inventory()
+    window.loaded_files[path] = inventory
+    window.manager_tab.add_file_to_tree(path, inventory)
+    channels = inventory[0][0].channels
+    apply_response_to_channels(channels, channels[0].response)
+    shared = channels[0].response
+
+    window.open_response_tab(
+        "GR.FUR..BHZ", shared, SimpleNamespace(filepath=path), channels[0]
+    )
+    tab = window.open_tabs[("response", "GR.FUR..BHZ")]
+    assert tab.response is channels[0].response
+    assert tab.response is not shared
+    tab.response.instrument_sensitivity.value *= 2
+    assert all(chan.response is shared for chan in channels[1:])
+    assert shared.instrument_sensitivity.value != (
+        tab.response.instrument_sensitivity.value
+    )
+    # Opening only copies, nothing is unsaved yet
+    assert path not in window.dirty_files
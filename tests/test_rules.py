@@ -0,0 +1,92 @@
+import pytest
+from obspy import read_inventory
+
+from SRM_core.rules import RuleEngine
+
+
+@pytest.fixture
+def engine():
+    engine = RuleEngine()
+    inventory = read_inventory()
+    engine.add_inventory("a.xml", inventory)
+    return engine, inventory
+
+
+def messages(engine, keys):
+    return [
+        issue["message"] for key in keys for issue in engine.issues_for(key)
+    ]
+
+
+def test_touch_reruns_only_dependent_rules(engine):
+    engine, inventory = engine
+    fur = inventory[0][0]
+    before = dict(engine.results)
+    fur.code = "TOOLONG"
+    changed = engine.touch(fur, fields=("code",))
+    assert messages(engine, changed) == [
+        "Station code must have 1-5 characters."
+    ]
+    # Rules not reading the code keep their results
+    assert all(
+        engine.results[key] is before[key]
+        for key in before
+        if key[0].fields is not None and "code" not in key[0].fields
+    )
+    fur.code = "FUR"
+    assert messages(engine, engine.touch(fur)) == []
+
+
+def test_counts_follow_edits(engine):
+    engine, inventory = engine
+    chan = inventory[0][0][0]
+    total, own = engine.counts["a.xml"], engine.counts[id(chan)]
+    chan.sample_rate = 0
+    changed = engine.touch(chan, fields=("sample_rate",))
+    # The rate mismatch goes away, the missing rate is reported instead
+    assert sorted(key[0].name for key in changed) == [
+        "decimated rate", "sample rate"
+    ]
+    assert messages(engine, changed) == ["Sample rate is missing."]
+    latitude = float(chan.latitude)
+    chan.latitude = latitude + 1.0
+    engine.touch(chan, fields=("latitude",))
+    assert engine.counts["a.xml"] == total + 1
+    assert engine.counts[id(chan)] == own + 1
+    chan.latitude = latitude
+    chan.sample_rate = 100.0
+    engine.touch(chan)
+    assert engine.counts["a.xml"] == total
+
+
+def test_replaced_response_is_checked(engine):
+    engine, inventory = engine
+    chan = inventory[0][0][0]
+    chan.response = None
+    changed = engine.touch(chan, fields=("response",))
+    assert "Channel has no response." in messages(engine, changed)
+    assert engine.files_of(chan) == {"a.xml"}
+
+
+def test_overlapping_epochs(engine):
+    engine, inventory = engine
+    net = inventory[0]
+    net.stations.append(net[0].copy())
+    engine.add_inventory("a.xml", inventory)
+    issues = [
+        issue for key in engine.problem_keys()
+        for issue in engine.issues_for(key)
+    ]
+    assert any(
+        issue["rule"] == "epoch overlap" and issue["label"] == "GR"
+        for issue in issues
+    )
+
+
+def test_remove_inventory(engine):
+    engine, inventory = engine
+    removed = engine.remove_inventory("a.xml")
+    assert removed
+    assert not engine.results
+    assert not engine.dependents
+    assert not engine.subjects
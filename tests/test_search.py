@@ -0,0 +1,57 @@
+import pytest
+from obspy import read_inventory
+
+from SRM_core.search import SearchIndex
+
+
+@pytest.fixture
+def inventory():
+    return read_inventory()
+
+
+@pytest.fixture
+def index(inventory):
+    index = SearchIndex()
+    index.add_inventory("a.xml", inventory)
+    return index
+
+
+def labels(entries):
+    return sorted(e["label"] for e in entries)
+
+
+def test_station_and_channel_codes(index):
+    assert labels(index.search("fur hhz")) == ["GR.FUR..HHZ"]
+    assert labels(index.search("gr fur", kinds=("station",))) == ["GR.FUR"]
+    assert labels(index.search("bw", kinds=("network",))) == ["BW"]
+
+
+def test_prefixes_and_wildcards(index):
+    assert labels(index.search("gr.fur..h")) == [
+        "GR.FUR..HHE", "GR.FUR..HHN", "GR.FUR..HHZ"
+    ]
+    assert labels(index.search("wet *z")) == [
+        "GR.WET..BHZ", "GR.WET..HHZ", "GR.WET..LHZ"
+    ]
+    assert index.search("fur xyz") == []
+
+
+def test_site_words_reach_channels(index):
+    assert "GR.FUR..LHZ" in labels(index.search("fuerstenfeldbruck lhz"))
+
+
+def test_renamed_station(index, inventory):
+    sta = inventory[0][0]
+    sta.code = "NEW"
+    index.update(sta)
+    assert labels(index.search("new hhz")) == ["GR.NEW..HHZ"]
+    assert index.search("fur hhz") == []
+
+
+def test_remove_and_hibernate(index):
+    index.hibernate("a.xml")
+    dormant = index.search("fur hhz")
+    assert labels(dormant) == ["GR.FUR..HHZ"]
+    assert dormant[0]["path"] is None
+    index.remove_inventory("a.xml")
+    assert index.search("fur") == []
@@ -0,0 +1,112 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from obspy import Inventory
+from obspy.core.inventory import Network, Station
+
+from SRM_core.spatial import SpatialIndex
+
+# Code -> (latitude, longitude); FJ1 and FJ2 lie on either side of the
+# antimeridian, 20 km apart, and TWN sits on FJ1
+STATIONS = {
+    "FJ1": (-17.0, 179.9),
+    "FJ2": (-17.0, -179.9),
+    "TWN": (-17.0, 179.9),
+    "GMT": (51.48, 0.0),
+    "HNL": (21.3, -157.9),
+}
+
+
+@pytest.fixture
+def index():
+    stations = [
+        Station(code, lat, lon, 0.0) for code, (lat, lon) in STATIONS.items()
+    ]
+    index = SpatialIndex()
+    index.add_inventory(
+        "a.xml", Inventory(networks=[Network("XX", stations=stations)])
+    )
+    return index
+
+
+def test_scipy_is_imported_lazily():
+    code = (
+        "import sys, SRM_core.spatial; "
+        "sys.exit('scipy' in sys.modules)"
+    )
+    root = Path(__file__).resolve().parent.parent
+    result = subprocess.run([sys.executable, "-c", code], cwd=root)
+    assert result.returncode == 0
+
+
+def labels(entries):
+    return sorted(e["label"] for e in entries)
+
+
+def test_radius_across_antimeridian(index):
+    near = index.within_radius(-17.0, 180.0, 50.0)
+    assert labels(near) == ["XX.FJ1", "XX.FJ2", "XX.TWN"]
+    assert all(e["distance_km"] < 15.0 for e in near)
+
+
+def test_nearest(index):
+    nearest = index.nearest(-17.0, -179.0, count=1)
+    assert labels(nearest) == ["XX.FJ2"]
+    assert labels(index.nearest(50.0, 1.0, count=1)) == ["XX.GMT"]
+
+
+def test_box_across_antimeridian(index):
+    # West of the east edge: the box spans the antimeridian
+    box = index.within_box(-20.0, 179.0, -10.0, -179.0)
+    assert labels(box) == ["XX.FJ1", "XX.FJ2", "XX.TWN"]
+    assert labels(index.within_box(-20.0, -179.0, -10.0, 179.0)) == []
+
+
+@pytest.mark.parametrize("offset", [0.0, 360.0, -360.0])
+def test_lasso_across_antimeridian(index, offset):
+    # Drawn around Fiji on any copy of the world, the lasso stays narrow
+    # and does not catch Hawaii or Greenwich
+    pytest.importorskip("matplotlib")
+    lasso = [
+        (-18.0, 179.0 + offset),
+        (-18.0, 181.0 + offset),
+        (-16.0, 181.0 + offset),
+        (-16.0, 179.0 + offset),
+    ]
+    assert labels(index.within_polygon(lasso)) == [
+        "XX.FJ1", "XX.FJ2", "XX.TWN"
+    ]
+
+
+def test_lasso_on_one_side(index):
+    pytest.importorskip("matplotlib")
+    lasso = [(-18.0, 179.0), (-18.0, 179.95), (-16.0, 179.95), (-16.0, 179.0)]
+    assert labels(index.within_polygon(lasso)) == ["XX.FJ1", "XX.TWN"]
+
+
+def test_colocated_across_antimeridian(index):
+    pairs = index.colocated_stations(km=25.0)
+    assert sorted(tuple(labels(pair)) for pair in pairs) == [
+        ("XX.FJ1", "XX.FJ2"),
+        ("XX.FJ1", "XX.TWN"),
+        ("XX.FJ2", "XX.TWN"),
+    ]
+
+
+def test_edits_and_hibernation(index):
+    fj2 = index.entries[next(
+        i for i, e in index.entries.items() if e["label"] == "XX.FJ2"
+    )]["path"][-1]
+    index.within_radius(0.0, 0.0, 1.0)
+    fj2.longitude = 10.0
+    index.update(fj2)
+    assert labels(index.within_radius(-17.0, 180.0, 50.0)) == [
+        "XX.FJ1", "XX.TWN"
+    ]
+    index.hibernate("a.xml")
+    dormant = index.within_radius(-17.0, 180.0, 50.0)
+    assert labels(dormant) == ["XX.FJ1", "XX.TWN"]
+    assert all(e["path"] is None for e in dormant)
+    assert index.colocated_stations(km=25.0) == []
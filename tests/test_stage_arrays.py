@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from obspy.core.inventory.response import (
+    CoefficientsTypeResponseStage,
+    FilterCoefficient,
+    FIRResponseStage,
+    ResponseListElement,
+    ResponseListResponseStage,
+)
+
+from SRM_core.stage_arrays import (
+    array_fields,
+    compress_fir,
+    detect_symmetry,
+    expand_fir,
+    parse_values,
+    set_stage_array,
+    stage_array,
+)
+
+
+def fir(coefficients):
+    return FIRResponseStage(
+        1, 1.0, 1.0, "V", "COUNTS", symmetry="NONE",
+        coefficients=coefficients,
+    )
+
+
+def test_array_fields():
+    stage = CoefficientsTypeResponseStage(
+        1, 1.0, 1.0, "V", "COUNTS", "DIGITAL",
+        numerator=[1.0, 2.0], denominator=[],
+    )
+    assert [attr for attr, _, _ in array_fields(stage)] == [
+        "numerator", "denominator"
+    ]
+    np.testing.assert_array_equal(
+        stage_array(stage, "numerator"), [[1.0], [2.0]]
+    )
+    assert stage_array(stage, "denominator").shape == (0, 1)
+
+
+def test_unchanged_values_keep_their_objects():
+    kept = FilterCoefficient(0.5)
+    kept.lower_uncertainty = 0.1
+    stage = fir([kept, 0.25])
+    set_stage_array(stage, "coefficients", np.array([[0.5], [0.75], [1.0]]))
+    assert stage.coefficients[0] is kept
+    assert [float(c) for c in stage.coefficients] == [0.5, 0.75, 1.0]
+
+
+def test_response_list():
+    stage = ResponseListResponseStage(
+        1, 1.0, 1.0, "V", "COUNTS",
+        response_list_elements=[ResponseListElement(1.0, 2.0, 3.0)],
+    )
+    first = stage.response_list_elements[0]
+    set_stage_array(
+        stage, "response_list_elements",
+        np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]),
+    )
+    assert stage.response_list_elements[0] is first
+    np.testing.assert_array_equal(
+        stage_array(stage, "response_list_elements")[1], [4.0, 5.0, 6.0]
+    )
+
+
+def test_parse_values():
+    text = "1, 2 3 # comment\n\n4;5\n"
+    np.testing.assert_array_equal(
+        parse_values(text, 1).ravel(), [1, 2, 3, 4, 5]
+    )
+    assert parse_values("1 2 3\n4 5 6", 3).shape == (2, 3)
+    with pytest.raises(ValueError, match="Line 2"):
+        parse_values("1 2 3\n4 5", 3)
+    with pytest.raises(ValueError, match="Line 1"):
+        parse_values("x", 1)
+
+
+@pytest.mark.parametrize(
+    "taps, symmetry",
+    [
+        ([1.0, 2.0, 2.0, 1.0], "EVEN"),
+        ([1.0, 2.0, 3.0, 2.0, 1.0], "ODD"),
+        ([1.0, 2.0, 3.0], "NONE"),
+    ],
+)
+def test_fir_symmetry_round_trip(taps, symmetry):
+    assert detect_symmetry(taps) == symmetry
+    stored = compress_fir(taps, symmetry)
+    np.testing.assert_array_equal(expand_fir(stored, symmetry), taps)
@@ -0,0 +1,92 @@
+import gzip
+import io
+
+import pytest
+from obspy import read_inventory
+
+from SRM_core.inventory_io import open_file, read_inventory_file
+from SRM_core.stationxml import LEVELS, write_stationxml
+
+
+@pytest.fixture
+def inventory():
+    # ObsPy's example: two networks, several stations and responses
+    return read_inventory()
+
+
+def expected(inventory, level):
+    buf = io.BytesIO()
+    inventory.write(buf, format="STATIONXML", level=level)
+    return buf.getvalue()
+
+
+def contents(inventory):
+    return {
+        key: sorted(value)
+        for key, value in inventory.get_contents().items()
+    }
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_same_bytes_as_obspy(tmp_path, inventory, level):
+    path = str(tmp_path / "out.xml")
+    write_stationxml(inventory, path, level=level)
+    with open(path, "rb") as f:
+        assert f.read() == expected(inventory, level)
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_read_back(tmp_path, inventory, level):
+    path = str(tmp_path / "out.xml")
+    write_stationxml(inventory, path, level=level)
+    written = expected(read_inventory_file(path), level)
+    assert written == expected(inventory, level)
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_gzip(tmp_path, inventory, level):
+    path = str(tmp_path / "out.xml.gz")
+    write_stationxml(inventory, path, level=level)
+    with gzip.open(path, "rb") as f:
+        assert f.read() == expected(inventory, level)
+    assert contents(read_inventory_file(path)) == contents(
+        read_inventory(io.BytesIO(expected(inventory, level)))
+    )
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_zstandard(tmp_path, inventory, level):
+    pytest.importorskip("zstandard")
+    path = str(tmp_path / "out.xml.zst")
+    write_stationxml(inventory, path, level=level)
+    with open_file(path) as f:
+        assert f.read() == expected(inventory, level)
+    assert contents(read_inventory_file(path)) == contents(
+        read_inventory(io.BytesIO(expected(inventory, level)))
+    )
+
+
+def test_stationxml_in_compressed_seed_path(tmp_path, inventory):
+    path = str(tmp_path / "out.dataless.gz")
+    write_stationxml(inventory, path)
+    assert contents(read_inventory_file(path)) == contents(inventory)
+
+
+def test_empty_network(tmp_path, inventory):
+    inventory.networks[0].stations = []
+    path = str(tmp_path / "out.xml")
+    write_stationxml(inventory, path)
+    with open(path, "rb") as f:
+        assert f.read() == expected(inventory, "response")
+
+
+def test_failed_write_keeps_file(tmp_path, inventory):
+    path = tmp_path / "out.xml"
+    path.write_bytes(b"old")
+    with pytest.raises(ValueError):
+        write_stationxml(inventory, str(path), level="sample")
+    inventory.networks[0].stations[0] = None
+    with pytest.raises(Exception):
+        write_stationxml(inventory, str(path))
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.xml"]